@@ -0,0 +1 @@
+"""Developer benchmarks; run modules with ``python -m benchmarks.<name>``."""
@@ -0,0 +1,221 @@
+"""Compare ``compute_hash`` reads with an mmap variant on the analysis hashing leg.
+
+Usage::
+
+    uv run python -m benchmarks.hashing --sizes-mb 1 16 64 256 --workers 1 4
+
+Each size gets its own synthetic file set under a temporary directory (or
+``--work-dir``). Files are hashed once to warm the page cache, then timed per
+algorithm, strategy, and worker count the way ``BackupAnalyzerImpl`` hashes new
+content (one ``compute_hash`` call per file, optionally on a thread pool).
+
+The ``mmap`` strategy exists only here, for comparison: backups always hash
+with ``read`` calls, since a mapped file that shrinks mid-hash raises SIGBUS.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import mmap
+import os
+import tempfile
+import time
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from backuper import config
+from backuper.utils.hashing import compute_hash
+
+_MB = 1024 * 1024
+STRATEGY_READ = "read"
+STRATEGY_MMAP = "mmap"
+STRATEGIES = (STRATEGY_READ, STRATEGY_MMAP)
+
+
+@dataclass(frozen=True)
+class HashingResult:
+    algorithm: str
+    strategy: str
+    workers: int
+    file_size: int
+    files: int
+    seconds: float
+
+    @property
+    def mb_per_second(self) -> float:
+        if self.seconds == 0:
+            return float("inf")
+        return self.file_size * self.files / _MB / self.seconds
+
+
+def write_files(directory: Path, *, size: int, count: int) -> list[Path]:
+    """Write ``count`` files of ``size`` pseudo-random bytes; reused when present."""
+    directory.mkdir(parents=True, exist_ok=True)
+    paths: list[Path] = []
+    for index in range(count):
+        path = directory / f"{size}-{index}.bin"
+        if not path.exists() or path.stat().st_size != size:
+            with open(path, "wb") as file:
+                remaining = size
+                while remaining:
+                    chunk = min(remaining, _MB)
+                    file.write(os.urandom(chunk))
+                    remaining -= chunk
+        paths.append(path)
+    return paths
+
+
+def compute_hash_mmap(path: Path, *, algorithm: str) -> str:
+    """The digest ``compute_hash`` returns, fed from a read-only memory map."""
+    if algorithm == config.HASH_ALGORITHM_SHA1:
+        hasher, limit = hashlib.sha1(), config.HASHING_BUFFER_SIZE
+    elif algorithm == config.HASH_ALGORITHM_BLAKE2B:
+        hasher, limit = hashlib.blake2b(digest_size=32), None
+    else:
+        raise ValueError(f"Unsupported hash algorithm {algorithm!r}")
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return hasher.hexdigest()
+        with (
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+            memoryview(mapped)[:limit] as view,
+        ):
+            hasher.update(view)
+    return hasher.hexdigest()
+
+
+def time_hashing(
+    paths: Sequence[Path], *, algorithm: str, strategy: str, workers: int
+) -> float:
+    def hash_one(path: Path) -> str:
+        if strategy == STRATEGY_MMAP:
+            return compute_hash_mmap(path, algorithm=algorithm)
+        return compute_hash(path, algorithm=algorithm)
+
+    started = time.perf_counter()
+    if workers == 1:
+        for path in paths:
+            hash_one(path)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(hash_one, paths))
+    return time.perf_counter() - started
+
+
+def run(
+    work_dir: Path,
+    *,
+    sizes: Sequence[int],
+    files_per_size: int,
+    algorithms: Sequence[str],
+    workers: Sequence[int],
+    repeat: int,
+) -> list[HashingResult]:
+    results: list[HashingResult] = []
+    for size in sizes:
+        paths = write_files(work_dir, size=size, count=files_per_size)
+        for algorithm in algorithms:
+            time_hashing(paths, algorithm=algorithm, strategy=STRATEGY_READ, workers=1)
+            for strategy in STRATEGIES:
+                for worker_count in workers:
+                    seconds = min(
+                        time_hashing(
+                            paths,
+                            algorithm=algorithm,
+                            strategy=strategy,
+                            workers=worker_count,
+                        )
+                        for _ in range(repeat)
+                    )
+                    results.append(
+                        HashingResult(
+                            algorithm=algorithm,
+                            strategy=strategy,
+                            workers=worker_count,
+                            file_size=size,
+                            files=len(paths),
+                            seconds=seconds,
+                        )
+                    )
+    return results
+
+
+def format_results(results: Sequence[HashingResult]) -> str:
+    lines = [
+        f"{'size':>10} {'algorithm':>9} {'strategy':>8} {'workers':>7} "
+        f"{'seconds':>9} {'MB/s':>9}"
+    ]
+    for result in results:
+        lines.append(
+            f"{result.file_size / _MB:>8.1f}MB {result.algorithm:>9} "
+            f"{result.strategy:>8} {result.workers:>7} "
+            f"{result.seconds:>9.4f} {result.mb_per_second:>9.1f}"
+        )
+    return "\n".join(lines)
+
+
+def _parse_args(argv: Sequence[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes-mb",
+        type=float,
+        nargs="+",
+        default=[1.0, 16.0, 64.0],
+        help="File sizes to benchmark, in MB (default: 1 16 64).",
+    )
+    parser.add_argument(
+        "--files", type=int, default=4, help="Files per size (default: 4)."
+    )
+    parser.add_argument(
+        "--algorithms",
+        nargs="+",
+        choices=config.HASH_ALGORITHMS,
+        default=list(config.HASH_ALGORITHMS),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[1],
+        help="Hash worker counts to compare (default: 1).",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Timed runs; best is reported."
+    )
+    parser.add_argument(
+        "--work-dir",
+        type=Path,
+        default=None,
+        help="Directory for synthetic files (default: a temporary directory).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = _parse_args(argv)
+    sizes = [int(size_mb * _MB) for size_mb in args.sizes_mb]
+
+    def run_in(work_dir: Path) -> list[HashingResult]:
+        return run(
+            work_dir,
+            sizes=sizes,
+            files_per_size=args.files,
+            algorithms=args.algorithms,
+            workers=args.workers,
+            repeat=args.repeat,
+        )
+
+    if args.work_dir is not None:
+        results = run_in(args.work_dir)
+    else:
+        with tempfile.TemporaryDirectory(prefix="backuper-bench-") as tmp:
+            results = run_in(Path(tmp))
+    print(format_results(results))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,415 @@
+"""End-to-end benchmark of the backup pipeline on a synthetic source tree.
+
+Usage::
+
+    uv run python -m benchmarks.pipeline --files 20000 --dup-ratio 0.2
+    uv run python -m benchmarks.pipeline --save-baseline bench-baseline.json
+    uv run python -m benchmarks.pipeline --baseline bench-baseline.json
+
+A deterministic tree (file count, size distribution, duplicate ratio, ignore
+density) is generated, then each scenario is timed with the production
+components the CLI wires: ``new_backup``, ``add_version`` after touching a
+fraction of the files, ``run_restore_flow``, and ``run_verify_integrity_flow``.
+Each scenario reports files/s, MB/s, and the process peak RSS observed when it
+finished (the peak only grows, so later scenarios include earlier ones).
+
+``--baseline`` compares files/s per scenario against a saved report and exits
+with status 1 when any scenario is slower by more than ``--tolerance``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import resource
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from backuper import config
+from backuper.commands import RestoreCommand, VerifyIntegrityCommand
+from backuper.components.backup_analyzer import BackupAnalyzerImpl
+from backuper.components.file_reader import LocalFileReader
+from backuper.components.filestore import LocalFileStore
+from backuper.components.path_ignore import GitIgnorePathFilter
+from backuper.components.reporter import NoOpAnalysisReporter
+from backuper.config import FilestoreConfig
+from backuper.controllers.backup import add_version, new_backup
+from backuper.controllers.restore import run_restore_flow
+from backuper.controllers.verify_integrity import run_verify_integrity_flow
+from backuper.entrypoints.wiring import create_backup_database
+
+_MB = 1_000_000
+SIZE_UNIFORM = "uniform"
+SIZE_LOGNORMAL = "lognormal"
+SIZE_DISTRIBUTIONS = (SIZE_UNIFORM, SIZE_LOGNORMAL)
+SCENARIO_NEW = "new"
+SCENARIO_UPDATE = "update"
+SCENARIO_RESTORE = "restore"
+SCENARIO_VERIFY = "verify"
+SCENARIOS = (SCENARIO_NEW, SCENARIO_UPDATE, SCENARIO_RESTORE, SCENARIO_VERIFY)
+_IGNORED_SUFFIX = ".tmp"
+_FILES_PER_DIRECTORY = 100
+
+
+@dataclass(frozen=True)
+class TreeSpec:
+    files: int = 2000
+    min_size: int = 1024
+    max_size: int = 256 * 1024
+    size_distribution: str = SIZE_LOGNORMAL
+    dup_ratio: float = 0.1
+    """Fraction of files whose contents repeat an earlier file."""
+    ignore_ratio: float = 0.05
+    """Fraction of files matched by the generated ``.gitignore``."""
+    update_ratio: float = 0.05
+    """Fraction of kept files rewritten before the update scenario."""
+    seed: int = 0
+
+
+@dataclass(frozen=True)
+class TreeSummary:
+    files: int
+    bytes: int
+    duplicates: int
+    ignored: int
+
+
+@dataclass(frozen=True)
+class ScenarioResult:
+    scenario: str
+    files: int
+    bytes: int
+    seconds: float
+    peak_rss_bytes: int
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.seconds if self.seconds else float("inf")
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.bytes / _MB / self.seconds if self.seconds else float("inf")
+
+
+@dataclass
+class PipelineReport:
+    spec: TreeSpec
+    tree: TreeSummary
+    results: list[ScenarioResult] = field(default_factory=list)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "spec": asdict(self.spec),
+            "tree": asdict(self.tree),
+            "results": [
+                {
+                    **asdict(result),
+                    "files_per_second": result.files_per_second,
+                    "mb_per_second": result.mb_per_second,
+                }
+                for result in self.results
+            ],
+        }
+
+
+def _file_size(rng: random.Random, spec: TreeSpec) -> int:
+    if spec.size_distribution == SIZE_UNIFORM:
+        return rng.randint(spec.min_size, spec.max_size)
+    # Log-normal centred on the geometric mean: many small files, a long tail.
+    mean = (spec.min_size * spec.max_size) ** 0.5
+    size = int(rng.lognormvariate(0.0, 1.0) * mean / 1.6487)  # e^(1/2)
+    return max(spec.min_size, min(spec.max_size, size))
+
+
+def _relative_file_path(index: int, *, ignored: bool) -> Path:
+    directory = Path(f"d{index // _FILES_PER_DIRECTORY:04d}")
+    if index % 7 == 0:
+        directory = directory / "nested"
+    suffix = _IGNORED_SUFFIX if ignored else ".bin"
+    return directory / f"f{index:06d}{suffix}"
+
+
+def generate_tree(root: Path, spec: TreeSpec) -> TreeSummary:
+    """Write a deterministic source tree under ``root`` for ``spec``."""
+    if spec.size_distribution not in SIZE_DISTRIBUTIONS:
+        raise ValueError(f"Unknown size distribution {spec.size_distribution!r}")
+    rng = random.Random(spec.seed)
+    root.mkdir(parents=True, exist_ok=True)
+    (root / ".gitignore").write_text(f"*{_IGNORED_SUFFIX}\n", encoding="utf-8")
+    written: list[bytes] = []
+    total_bytes = duplicates = ignored_files = 0
+    for index in range(spec.files):
+        ignored = rng.random() < spec.ignore_ratio
+        if written and rng.random() < spec.dup_ratio:
+            payload = rng.choice(written)
+            duplicates += 1
+        else:
+            payload = rng.randbytes(_file_size(rng, spec))
+            written.append(payload)
+        path = root / _relative_file_path(index, ignored=ignored)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(payload)
+        if ignored:
+            ignored_files += 1
+        else:
+            total_bytes += len(payload)
+    return TreeSummary(
+        files=spec.files - ignored_files,
+        bytes=total_bytes,
+        duplicates=duplicates,
+        ignored=ignored_files,
+    )
+
+
+def touch_tree(root: Path, spec: TreeSpec) -> int:
+    """Rewrite ``spec.update_ratio`` of the kept files with new content."""
+    rng = random.Random(spec.seed + 1)
+    kept = sorted(
+        path
+        for path in root.rglob("*")
+        if path.is_file() and path.suffix != _IGNORED_SUFFIX and path.name[0] != "."
+    )
+    changed = rng.sample(kept, k=int(len(kept) * spec.update_ratio))
+    for path in changed:
+        path.write_bytes(rng.randbytes(path.stat().st_size))
+    return len(changed)
+
+
+def peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes; macOS reports bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _filestore(backup_root: Path) -> LocalFileStore:
+    return LocalFileStore(
+        FilestoreConfig(backup_dir=str(backup_root), zip_enabled=config.ZIP_ENABLED)
+    )
+
+
+async def _backup(backup_root: Path, source: Path, version: str, *, new: bool) -> None:
+    with create_backup_database(backup_root, operation="write") as db:
+        flow = new_backup if new else add_version
+        await flow(
+            source,
+            version,
+            file_reader=LocalFileReader(path_filter=GitIgnorePathFilter()),
+            analyzer=BackupAnalyzerImpl(),
+            db=db,
+            filestore=_filestore(backup_root),
+            reporter=NoOpAnalysisReporter(),
+        )
+
+
+async def _restore(backup_root: Path, destination: Path, version: str) -> None:
+    with create_backup_database(backup_root, operation="read") as db:
+        await run_restore_flow(
+            RestoreCommand(
+                location=str(backup_root),
+                destination=str(destination),
+                version_name=version,
+            ),
+            db=db,
+            filestore=_filestore(backup_root),
+        )
+
+
+async def _verify(backup_root: Path) -> None:
+    with create_backup_database(backup_root, operation="read") as db:
+        errors = await run_verify_integrity_flow(
+            VerifyIntegrityCommand(location=str(backup_root)),
+            db=db,
+            filestore=_filestore(backup_root),
+        )
+    if errors:
+        raise RuntimeError(f"verify-integrity reported {len(errors)} errors")
+
+
+def _timed(
+    scenario: str, tree: TreeSummary, run_scenario: Callable[[], Awaitable[None]]
+) -> ScenarioResult:
+    started = time.perf_counter()
+    asyncio.run(run_scenario())
+    return ScenarioResult(
+        scenario=scenario,
+        files=tree.files,
+        bytes=tree.bytes,
+        seconds=time.perf_counter() - started,
+        peak_rss_bytes=peak_rss_bytes(),
+    )
+
+
+def run(
+    work_dir: Path,
+    spec: TreeSpec,
+    *,
+    scenarios: Sequence[str] = SCENARIOS,
+) -> PipelineReport:
+    """Generate the tree under ``work_dir`` and run ``scenarios`` in order.
+
+    ``update``, ``restore``, and ``verify`` need the backup made by ``new``, so
+    ``new`` always runs; it is only reported when requested.
+    """
+    source = work_dir / "source"
+    backup_root = work_dir / "backup"
+    report = PipelineReport(spec=spec, tree=generate_tree(source, spec))
+
+    new_result = _timed(
+        SCENARIO_NEW,
+        report.tree,
+        lambda: _backup(backup_root, source, "v1", new=True),
+    )
+    if SCENARIO_NEW in scenarios:
+        report.results.append(new_result)
+    latest = "v1"
+    if SCENARIO_UPDATE in scenarios:
+        touch_tree(source, spec)
+        latest = "v2"
+        report.results.append(
+            _timed(
+                SCENARIO_UPDATE,
+                report.tree,
+                lambda: _backup(backup_root, source, latest, new=False),
+            )
+        )
+    if SCENARIO_RESTORE in scenarios:
+        report.results.append(
+            _timed(
+                SCENARIO_RESTORE,
+                report.tree,
+                lambda: _restore(backup_root, work_dir / "restore", latest),
+            )
+        )
+    if SCENARIO_VERIFY in scenarios:
+        report.results.append(
+            _timed(SCENARIO_VERIFY, report.tree, lambda: _verify(backup_root))
+        )
+    return report
+
+
+def compare_to_baseline(
+    report: PipelineReport, baseline: dict[str, Any], *, tolerance: float
+) -> list[str]:
+    """Return one message per scenario whose files/s fell below the baseline."""
+    baseline_rates = {
+        str(result["scenario"]): float(result["files_per_second"])
+        for result in baseline.get("results", [])
+    }
+    regressions: list[str] = []
+    for result in report.results:
+        expected = baseline_rates.get(result.scenario)
+        if expected is None or expected <= 0:
+            continue
+        change = result.files_per_second / expected - 1.0
+        if change < -tolerance:
+            regressions.append(
+                f"{result.scenario}: {result.files_per_second:.1f} files/s is "
+                f"{-change:.1%} below baseline {expected:.1f} files/s"
+            )
+    return regressions
+
+
+def format_report(report: PipelineReport) -> str:
+    tree = report.tree
+    lines = [
+        f"tree: {tree.files} files, {tree.bytes / _MB:.1f} MB, "
+        f"{tree.duplicates} duplicates, {tree.ignored} ignored",
+        f"{'scenario':>8} {'seconds':>9} {'files/s':>10} {'MB/s':>8} {'peak RSS':>10}",
+    ]
+    for result in report.results:
+        lines.append(
+            f"{result.scenario:>8} {result.seconds:>9.3f} "
+            f"{result.files_per_second:>10.1f} {result.mb_per_second:>8.1f} "
+            f"{result.peak_rss_bytes / _MB:>8.1f}MB"
+        )
+    return "\n".join(lines)
+
+
+def _parse_args(argv: Sequence[str] | None) -> argparse.Namespace:
+    defaults = TreeSpec()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=defaults.files)
+    parser.add_argument("--min-size", type=int, default=defaults.min_size)
+    parser.add_argument("--max-size", type=int, default=defaults.max_size)
+    parser.add_argument(
+        "--size-distribution",
+        choices=SIZE_DISTRIBUTIONS,
+        default=defaults.size_distribution,
+    )
+    parser.add_argument("--dup-ratio", type=float, default=defaults.dup_ratio)
+    parser.add_argument("--ignore-ratio", type=float, default=defaults.ignore_ratio)
+    parser.add_argument("--update-ratio", type=float, default=defaults.update_ratio)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS)
+    )
+    parser.add_argument(
+        "--work-dir",
+        type=Path,
+        default=None,
+        help="Empty directory for the tree and backup (default: a temporary one).",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="Write the report as JSON for later --baseline comparisons.",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="Compare files/s per scenario against a saved report.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.10,
+        help="Allowed files/s drop versus the baseline (default: 0.10).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = _parse_args(argv)
+    spec = TreeSpec(
+        files=args.files,
+        min_size=args.min_size,
+        max_size=args.max_size,
+        size_distribution=args.size_distribution,
+        dup_ratio=args.dup_ratio,
+        ignore_ratio=args.ignore_ratio,
+        update_ratio=args.update_ratio,
+        seed=args.seed,
+    )
+    if args.work_dir is not None:
+        report = run(args.work_dir, spec, scenarios=args.scenarios)
+    else:
+        with tempfile.TemporaryDirectory(prefix="backuper-bench-") as tmp:
+            report = run(Path(tmp), spec, scenarios=args.scenarios)
+    print(format_report(report))
+    if args.save_baseline is not None:
+        args.save_baseline.write_text(
+            json.dumps(report.to_json(), indent=2), encoding="utf-8"
+        )
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare_to_baseline(report, baseline, tolerance=args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,385 @@
+"""Micro-benchmarks for ``SqliteBackupDatabase`` under each synchronous mode.
+
+Usage::
+
+    uv run python -m benchmarks.sqlite_db --versions 200 --files-per-version 50000
+    uv run python -m benchmarks.sqlite_db --modes normal full --checkpoints 10 100
+
+For every ``PRAGMA synchronous`` mode (what ``BACKUPER_SQLITE_SYNCHRONOUS``
+selects) a fresh manifest is grown version by version. Each version keeps most
+rows of the previous one and rewrites ``--churn`` of them with new content, like
+repeated ``update`` runs. Reported per mode:
+
+* ``add_file`` and batched ``add_files`` insert throughput (rows/s);
+* ``get_files_by_metadata`` / ``get_files_by_hash`` latency (mean, p50, p99)
+  for existing rows, measured when the table reaches each checkpoint;
+* ``list_files`` time to stream the latest version.
+
+200 versions of 50,000 files is 10M rows; the defaults are sized for a quick run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from uuid import UUID
+
+from backuper.components.sqlite_db import SqliteBackupDatabase, SqliteDb
+from backuper.config import MANIFEST_WRITE_BATCH_SIZE, SqliteDbConfig
+from backuper.models import BackedUpFileEntry, FileEntry
+
+SYNCHRONOUS_MODES = {"off": 0, "normal": 1, "full": 2, "extra": 3}
+_BACKUP_ID = UUID(int=0)
+
+
+@dataclass(frozen=True)
+class InsertResult:
+    mode: str
+    method: str
+    rows: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else float("inf")
+
+
+@dataclass(frozen=True)
+class LookupResult:
+    mode: str
+    query: str
+    table_rows: int
+    samples: int
+    mean_us: float
+    p50_us: float
+    p99_us: float
+
+
+@dataclass(frozen=True)
+class ListResult:
+    mode: str
+    table_rows: int
+    rows: int
+    seconds: float
+
+
+@dataclass
+class SqliteBenchmarkReport:
+    inserts: list[InsertResult]
+    lookups: list[LookupResult]
+    listings: list[ListResult]
+
+
+@dataclass(frozen=True)
+class _Row:
+    path: str
+    size: int
+    mtime: float
+    digest: str
+
+
+def _entry(row: _Row) -> BackedUpFileEntry:
+    relative_path = Path(row.path)
+    return BackedUpFileEntry(
+        source_file=FileEntry(
+            path=relative_path,
+            relative_path=relative_path,
+            size=row.size,
+            mtime=row.mtime,
+        ),
+        backup_id=_BACKUP_ID,
+        stored_location=f"{row.digest[:2]}/{row.digest}",
+        is_compressed=False,
+        hash=row.digest,
+    )
+
+
+def _initial_rows(files: int, rng: random.Random) -> list[_Row]:
+    return [
+        _Row(
+            path=f"d{index // 1000:05d}/f{index:08d}.bin",
+            size=rng.randint(1, 1 << 20),
+            mtime=1_600_000_000.0 + index,
+            digest=f"{rng.getrandbits(160):040x}",
+        )
+        for index in range(files)
+    ]
+
+
+def _churn(rows: list[_Row], churn: float, rng: random.Random) -> list[_Row]:
+    changed = set(rng.sample(range(len(rows)), k=int(len(rows) * churn)))
+    return [
+        _Row(
+            path=row.path,
+            size=row.size,
+            mtime=row.mtime + 1.0,
+            digest=f"{rng.getrandbits(160):040x}",
+        )
+        if index in changed
+        else row
+        for index, row in enumerate(rows)
+    ]
+
+
+async def _insert_version(
+    db: SqliteBackupDatabase, version: str, rows: Sequence[_Row], *, batched: bool
+) -> float:
+    await db.create_version(version)
+    started = time.perf_counter()
+    if batched:
+        for start in range(0, len(rows), MANIFEST_WRITE_BATCH_SIZE):
+            await db.add_files(
+                version,
+                [
+                    _entry(row)
+                    for row in rows[start : start + MANIFEST_WRITE_BATCH_SIZE]
+                ],
+            )
+    else:
+        for row in rows:
+            await db.add_file(version, _entry(row))
+    seconds = time.perf_counter() - started
+    await db.complete_version(version)
+    return seconds
+
+
+def _latency(
+    mode: str, query: str, table_rows: int, samples: list[float]
+) -> LookupResult:
+    micros = sorted(sample * 1_000_000 for sample in samples)
+    return LookupResult(
+        mode=mode,
+        query=query,
+        table_rows=table_rows,
+        samples=len(micros),
+        mean_us=statistics.fmean(micros),
+        p50_us=micros[len(micros) // 2],
+        p99_us=micros[min(len(micros) - 1, int(len(micros) * 0.99))],
+    )
+
+
+async def _measure_lookups(
+    db: SqliteBackupDatabase,
+    mode: str,
+    rows: list[_Row],
+    table_rows: int,
+    *,
+    samples: int,
+    rng: random.Random,
+) -> list[LookupResult]:
+    picked = [rng.choice(rows) for _ in range(samples)]
+    by_metadata: list[float] = []
+    by_hash: list[float] = []
+    for row in picked:
+        started = time.perf_counter()
+        await db.get_files_by_metadata(Path(row.path), row.mtime, row.size)
+        by_metadata.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        await db.get_files_by_hash(row.digest)
+        by_hash.append(time.perf_counter() - started)
+    return [
+        _latency(mode, "get_files_by_metadata", table_rows, by_metadata),
+        _latency(mode, "get_files_by_hash", table_rows, by_hash),
+    ]
+
+
+async def _run_mode(
+    work_dir: Path,
+    mode: str,
+    *,
+    versions: int,
+    files_per_version: int,
+    churn: float,
+    single_inserts: int,
+    checkpoints: Sequence[int],
+    samples: int,
+    seed: int,
+) -> SqliteBenchmarkReport:
+    rng = random.Random(seed)
+    report = SqliteBenchmarkReport(inserts=[], lookups=[], listings=[])
+    config = SqliteDbConfig(
+        backup_dir=str(work_dir / mode), sqlite_synchronous=SYNCHRONOUS_MODES[mode]
+    )
+    with SqliteDb(config) as sqlite_db:
+        db = SqliteBackupDatabase(sqlite_db)
+        rows = _initial_rows(files_per_version, rng)
+        single = rows[:single_inserts]
+        seconds = await _insert_version(db, "single", single, batched=False)
+        report.inserts.append(InsertResult(mode, "add_file", len(single), seconds))
+        table_rows = len(single)
+
+        batched_rows = 0
+        batched_seconds = 0.0
+        for index in range(versions):
+            if index:
+                rows = _churn(rows, churn, rng)
+            batched_seconds += await _insert_version(
+                db, f"v{index:05d}", rows, batched=True
+            )
+            batched_rows += len(rows)
+            table_rows += len(rows)
+            if index + 1 in checkpoints:
+                report.lookups.extend(
+                    await _measure_lookups(
+                        db, mode, rows, table_rows, samples=samples, rng=rng
+                    )
+                )
+        report.inserts.append(
+            InsertResult(mode, "add_files", batched_rows, batched_seconds)
+        )
+
+        latest = f"v{versions - 1:05d}"
+        started = time.perf_counter()
+        listed = 0
+        async for _ in db.list_files(latest):
+            listed += 1
+        report.listings.append(
+            ListResult(mode, table_rows, listed, time.perf_counter() - started)
+        )
+    return report
+
+
+def run(
+    work_dir: Path,
+    *,
+    modes: Sequence[str] = tuple(SYNCHRONOUS_MODES),
+    versions: int = 10,
+    files_per_version: int = 2000,
+    churn: float = 0.05,
+    single_inserts: int = 500,
+    checkpoints: Sequence[int] = (),
+    samples: int = 200,
+    seed: int = 0,
+) -> SqliteBenchmarkReport:
+    """Run every mode in its own manifest under ``work_dir``.
+
+    Lookups are measured after each version count in ``checkpoints`` (default:
+    after the first and the last version).
+    """
+    if versions < 1 or files_per_version < 1:
+        raise ValueError("versions and files_per_version must be at least 1")
+    checkpoint_set = set(checkpoints) or {1, versions}
+    combined = SqliteBenchmarkReport(inserts=[], lookups=[], listings=[])
+    for mode in modes:
+        report = asyncio.run(
+            _run_mode(
+                work_dir,
+                mode,
+                versions=versions,
+                files_per_version=files_per_version,
+                churn=churn,
+                single_inserts=min(single_inserts, files_per_version),
+                checkpoints=sorted(checkpoint_set),
+                samples=samples,
+                seed=seed,
+            )
+        )
+        combined.inserts.extend(report.inserts)
+        combined.lookups.extend(report.lookups)
+        combined.listings.extend(report.listings)
+    return combined
+
+
+def format_report(report: SqliteBenchmarkReport) -> str:
+    lines = [f"{'mode':>6} {'insert':>10} {'rows':>10} {'seconds':>9} {'rows/s':>10}"]
+    for insert in report.inserts:
+        lines.append(
+            f"{insert.mode:>6} {insert.method:>10} {insert.rows:>10} "
+            f"{insert.seconds:>9.3f} {insert.rows_per_second:>10.0f}"
+        )
+    lines.append("")
+    lines.append(
+        f"{'mode':>6} {'query':>22} {'table rows':>11} "
+        f"{'mean us':>9} {'p50 us':>9} {'p99 us':>9}"
+    )
+    for lookup in report.lookups:
+        lines.append(
+            f"{lookup.mode:>6} {lookup.query:>22} {lookup.table_rows:>11} "
+            f"{lookup.mean_us:>9.1f} {lookup.p50_us:>9.1f} {lookup.p99_us:>9.1f}"
+        )
+    lines.append("")
+    lines.append(
+        f"{'mode':>6} {'list_files rows':>15} {'table rows':>11} {'seconds':>9}"
+    )
+    for listing in report.listings:
+        lines.append(
+            f"{listing.mode:>6} {listing.rows:>15} {listing.table_rows:>11} "
+            f"{listing.seconds:>9.3f}"
+        )
+    return "\n".join(lines)
+
+
+def _parse_args(argv: Sequence[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=tuple(SYNCHRONOUS_MODES),
+        default=list(SYNCHRONOUS_MODES),
+    )
+    parser.add_argument("--versions", type=int, default=10)
+    parser.add_argument("--files-per-version", type=int, default=2000)
+    parser.add_argument(
+        "--churn",
+        type=float,
+        default=0.05,
+        help="Fraction of rows given new content in each version (default: 0.05).",
+    )
+    parser.add_argument(
+        "--single-inserts",
+        type=int,
+        default=500,
+        help="Rows inserted one add_file call at a time (default: 500).",
+    )
+    parser.add_argument(
+        "--checkpoints",
+        type=int,
+        nargs="+",
+        default=[],
+        help="Version counts after which lookups are timed (default: first and last).",
+    )
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--work-dir",
+        type=Path,
+        default=None,
+        help="Empty directory for the manifests (default: a temporary one).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = _parse_args(argv)
+
+    def run_in(work_dir: Path) -> SqliteBenchmarkReport:
+        return run(
+            work_dir,
+            modes=args.modes,
+            versions=args.versions,
+            files_per_version=args.files_per_version,
+            churn=args.churn,
+            single_inserts=args.single_inserts,
+            checkpoints=args.checkpoints,
+            samples=args.samples,
+            seed=args.seed,
+        )
+
+    if args.work_dir is not None:
+        report = run_in(args.work_dir)
+    else:
+        with tempfile.TemporaryDirectory(prefix="backuper-bench-") as tmp:
+            report = run_in(Path(tmp))
+    print(format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,6 +2,12 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from backuper.config import (
+    DEFAULT_COMPRESSION_CODEC,
+    DEFAULT_HASH_ALGORITHM,
+    PUT_CONCURRENCY,
+)
+
 
 @dataclass
 class NewCommand:
@@ -10,6 +16,20 @@ class NewCommand:
     location: str
     ignore_patterns: tuple[str, ...] = ()
     ignore_files: tuple[str, ...] = ()
+    hash_workers: int = 1
+    walk_workers: int = 1
+    walk_snapshot: bool = False
+    put_workers: int = PUT_CONCURRENCY
+    streaming: bool = False
+    hash_algorithm: str = DEFAULT_HASH_ALGORITHM
+    single_pass: bool = False
+    stats: bool = False
+    stats_json: bool = False
+    compression: str = DEFAULT_COMPRESSION_CODEC
+    compression_level: int | None = None
+    compression_probe: bool = False
+    pack_threshold: int = 0
+    inline_threshold: int = 0
 
 
 @dataclass
@@ -19,6 +39,22 @@ class UpdateCommand:
     location: str
     ignore_patterns: tuple[str, ...] = ()
     ignore_files: tuple[str, ...] = ()
+    hash_workers: int = 1
+    walk_workers: int = 1
+    walk_snapshot: bool = False
+    put_workers: int = PUT_CONCURRENCY
+    streaming: bool = False
+    hash_algorithm: str = DEFAULT_HASH_ALGORITHM
+    single_pass: bool = False
+    stats: bool = False
+    stats_json: bool = False
+    compression: str = DEFAULT_COMPRESSION_CODEC
+    compression_level: int | None = None
+    compression_probe: bool = False
+    pack_threshold: int = 0
+    inline_threshold: int = 0
+    preload_metadata: bool = False
+    preload_hashes: bool = False
 
 
 @dataclass
@@ -33,3 +69,4 @@ class RestoreCommand:
     location: str
     destination: str
     version_name: str
+    jobs: int = 1
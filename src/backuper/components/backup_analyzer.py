@@ -1,13 +1,48 @@
+import asyncio
+from collections import deque
 from collections.abc import AsyncGenerator, AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
+from backuper.config import DEFAULT_HASH_ALGORITHM, HASH_ALGORITHMS
 from backuper.models import AnalyzedFileEntry, FileEntry
 from backuper.ports import BackupAnalyzer, BackupDatabase
 from backuper.utils.hashing import compute_hash
+from backuper.utils.stats import (
+    COUNTER_HASH_HITS,
+    COUNTER_HASH_LOOKUPS,
+    COUNTER_HASHED_BYTES,
+    COUNTER_HASHED_FILES,
+    COUNTER_METADATA_HITS,
+    COUNTER_METADATA_LOOKUPS,
+    PHASE_DB_LOOKUP,
+    PHASE_HASH,
+    BackupStats,
+    increment,
+    measure,
+)
+
+# Entries analyzed ahead of the consumer per hash worker; bounds memory and open work.
+_IN_FLIGHT_PER_WORKER = 2
 
 
 class BackupAnalyzerImpl(BackupAnalyzer):
-    def __init__(self):
-        pass
+    def __init__(
+        self,
+        *,
+        hash_workers: int = 1,
+        hash_algorithm: str = DEFAULT_HASH_ALGORITHM,
+        single_pass: bool = False,
+        stats: BackupStats | None = None,
+    ) -> None:
+        if hash_workers < 1:
+            raise ValueError(f"hash_workers must be at least 1, got {hash_workers}")
+        if hash_algorithm not in HASH_ALGORITHMS:
+            raise ValueError(f"Unsupported hash algorithm {hash_algorithm!r}")
+        self._hash_workers = hash_workers
+        self._hash_algorithm = hash_algorithm
+        self._single_pass = single_pass
+        self._stats = stats
 
     async def analyze_stream(
         self, file_stream: AsyncIterator[FileEntry], db: BackupDatabase
@@ -16,45 +51,124 @@ class BackupAnalyzerImpl(BackupAnalyzer):
 
         When multiple stored rows match the same metadata or content hash, the
         first row in the list returned by the database is used.
+
+        With ``hash_workers > 1``, hashing runs on a thread pool (``hashlib``
+        releases the GIL) with at most ``hash_workers * 2`` entries in flight;
+        results are still yielded in input order.
+
+        New content is hashed with the configured ``hash_algorithm``; entries
+        matched by metadata keep the digest and algorithm of the stored row.
+
+        With ``single_pass``, files that miss the metadata match are not hashed
+        or looked up by content here: they are yielded with ``hash=None`` so the
+        file store hashes them while storing them, reading each source once.
         """
+        if self._hash_workers == 1:
+            async for file_entry in file_stream:
+                yield await self._analyze_entry(file_entry, db, executor=None)
+            return
 
-        async for file_entry in file_stream:
-            already_backed_up = False
-            backup_id = None
-            file_hash = None
-
-            # Skip directories - they don't need content analysis
-            if file_entry.is_directory:
-                yield AnalyzedFileEntry(
-                    source_file=file_entry,
-                    already_backed_up=False,
-                    backup_id=None,
-                    hash=None,
+        executor = ThreadPoolExecutor(
+            max_workers=self._hash_workers, thread_name_prefix="backuper-hash"
+        )
+        in_flight: deque[asyncio.Task[AnalyzedFileEntry]] = deque()
+        max_in_flight = self._hash_workers * _IN_FLIGHT_PER_WORKER
+        try:
+            async for file_entry in file_stream:
+                in_flight.append(
+                    asyncio.ensure_future(
+                        self._analyze_entry(file_entry, db, executor=executor)
+                    )
                 )
-                continue
+                if len(in_flight) >= max_in_flight:
+                    yield await in_flight.popleft()
+            while in_flight:
+                yield await in_flight.popleft()
+        finally:
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+            executor.shutdown(wait=True, cancel_futures=True)
 
-            # First check if there's a match based on path, size and mtime
+    async def _analyze_entry(
+        self,
+        file_entry: FileEntry,
+        db: BackupDatabase,
+        *,
+        executor: ThreadPoolExecutor | None,
+    ) -> AnalyzedFileEntry:
+        already_backed_up = False
+        backup_id = None
+        file_hash = None
+        hash_algorithm = None
+        stored_location = None
+        is_compressed = False
+        compression = None
+
+        # Skip directories - they don't need content analysis
+        if file_entry.is_directory:
+            return AnalyzedFileEntry(
+                source_file=file_entry,
+                already_backed_up=False,
+                backup_id=None,
+                hash=None,
+            )
+
+        # First check if there's a match based on path, size and mtime
+        increment(self._stats, COUNTER_METADATA_LOOKUPS)
+        with measure(self._stats, PHASE_DB_LOOKUP):
             stored_files = await db.get_files_by_metadata(
                 file_entry.relative_path, file_entry.mtime, file_entry.size
             )
+        if stored_files:
+            increment(self._stats, COUNTER_METADATA_HITS)
+            stored_file = stored_files[0]  # Use the first match
+            already_backed_up = True
+            backup_id = stored_file.backup_id
+            file_hash = stored_file.hash
+            hash_algorithm = stored_file.hash_algorithm
+            stored_location = stored_file.stored_location
+            is_compressed = stored_file.is_compressed
+            compression = stored_file.compression
+
+        if not already_backed_up and self._single_pass:
+            # Hashed and deduplicated by FileStore.put while it stores the file.
+            hash_algorithm = self._hash_algorithm
+        # If no match found, compute hash and check for content match
+        elif not already_backed_up:
+            hash_algorithm = self._hash_algorithm
+            hash_file = partial(self._hash_file, file_entry)
+            if executor is None:
+                file_hash = hash_file()
+            else:
+                loop = asyncio.get_running_loop()
+                file_hash = await loop.run_in_executor(executor, hash_file)
+            increment(self._stats, COUNTER_HASH_LOOKUPS)
+            with measure(self._stats, PHASE_DB_LOOKUP):
+                stored_files = await db.get_files_by_hash(file_hash, hash_algorithm)
             if stored_files:
+                increment(self._stats, COUNTER_HASH_HITS)
                 stored_file = stored_files[0]  # Use the first match
                 already_backed_up = True
                 backup_id = stored_file.backup_id
-                file_hash = stored_file.hash
-
-            # If no match found, compute hash and check for content match
-            if not already_backed_up:
-                file_hash = compute_hash(file_entry.path)
-                stored_files = await db.get_files_by_hash(file_hash)
-                if stored_files:
-                    stored_file = stored_files[0]  # Use the first match
-                    already_backed_up = True
-                    backup_id = stored_file.backup_id
-
-            yield AnalyzedFileEntry(
-                source_file=file_entry,
-                already_backed_up=already_backed_up,
-                backup_id=backup_id,
-                hash=file_hash,
-            )
+                stored_location = stored_file.stored_location
+                is_compressed = stored_file.is_compressed
+                compression = stored_file.compression
+
+        return AnalyzedFileEntry(
+            source_file=file_entry,
+            already_backed_up=already_backed_up,
+            backup_id=backup_id,
+            hash=file_hash,
+            hash_algorithm=hash_algorithm,
+            stored_location=stored_location,
+            is_compressed=is_compressed,
+            compression=compression,
+        )
+
+    def _hash_file(self, file_entry: FileEntry) -> str:
+        with measure(self._stats, PHASE_HASH):
+            file_hash = compute_hash(file_entry.path, algorithm=self._hash_algorithm)
+        increment(self._stats, COUNTER_HASHED_FILES)
+        increment(self._stats, COUNTER_HASHED_BYTES, file_entry.size)
+        return file_hash
@@ -0,0 +1,70 @@
+"""Per-extension compressibility learned from probe results.
+
+Each probe contributes its compressed/original ratio to a running mean keyed by
+lowercased file extension. Once an extension has enough samples and its mean is
+above the threshold, files with it are treated as incompressible without being
+probed. Compressible extensions keep being probed, since one mislabeled or
+encrypted file should not be compressed for nothing.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Mapping
+
+from backuper.config import COMPRESSION_LEARN_MIN_SAMPLES, COMPRESSION_PROBE_MAX_RATIO
+from backuper.models import CompressionRatio
+
+
+class ExtensionRatioTable:
+    """Thread-safe running mean of probe ratios per file extension."""
+
+    def __init__(
+        self,
+        ratios: Mapping[str, CompressionRatio] | None = None,
+        *,
+        min_samples: int = COMPRESSION_LEARN_MIN_SAMPLES,
+        max_ratio: float = COMPRESSION_PROBE_MAX_RATIO,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._ratios: dict[str, CompressionRatio] = dict(ratios or {})
+        self._min_samples = min_samples
+        self._max_ratio = max_ratio
+        self._changed = False
+
+    @property
+    def max_ratio(self) -> float:
+        return self._max_ratio
+
+    def seed(self, ratios: Mapping[str, CompressionRatio]) -> None:
+        """Replace the table with previously persisted ratios."""
+        with self._lock:
+            self._ratios = dict(ratios)
+            self._changed = False
+
+    def record(self, extension: str, ratio: float) -> None:
+        with self._lock:
+            known = self._ratios.get(extension)
+            if known is None:
+                self._ratios[extension] = CompressionRatio(samples=1, ratio=ratio)
+            else:
+                samples = known.samples + 1
+                self._ratios[extension] = CompressionRatio(
+                    samples=samples,
+                    ratio=known.ratio + (ratio - known.ratio) / samples,
+                )
+            self._changed = True
+
+    def known_incompressible(self, extension: str) -> bool:
+        with self._lock:
+            known = self._ratios.get(extension)
+        return (
+            known is not None
+            and known.samples >= self._min_samples
+            and known.ratio > self._max_ratio
+        )
+
+    def changed_ratios(self) -> dict[str, CompressionRatio]:
+        """Every ratio, or ``{}`` when nothing was recorded since :meth:`seed`."""
+        with self._lock:
+            return dict(self._ratios) if self._changed else {}
@@ -1,13 +1,39 @@
+import asyncio
 import logging
 import os
-from collections.abc import AsyncGenerator
+import stat
+import time
+from collections.abc import AsyncGenerator, Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 
 from backuper.models import FileEntry
 from backuper.ports import FileReader, PathFilter
+from backuper.utils.stats import (
+    COUNTER_SNAPSHOT_HITS,
+    COUNTER_SNAPSHOT_MISSES,
+    COUNTER_SOURCE_BYTES,
+    COUNTER_SOURCE_DIRECTORIES,
+    COUNTER_SOURCE_FILES,
+    PHASE_IGNORE,
+    PHASE_WALK,
+    BackupStats,
+    increment,
+)
 
 from .path_ignore import GitIgnorePathFilter
+from .walk_snapshot import DirectorySnapshotStore, SnapshotChild, SnapshotDirectory
+
+# Directories modified this close to being listed are not snapshotted: a later
+# change within the same mtime tick would otherwise go unnoticed.
+_SNAPSHOT_RACY_WINDOW_NS = 2_000_000_000
+
+# Listings submitted ahead of the walk, per worker. Each holds a directory's
+# children in memory until it is popped, so this bounds the walk's footprint.
+_PREFETCH_PER_WORKER = 2
 
 
 @dataclass
@@ -22,121 +48,381 @@ class WalkMetrics:
         return self.visited_directories + self.visited_files
 
 
+@dataclass(frozen=True)
+class _ListedEntry:
+    name: str
+    is_directory: bool
+    is_symlink: bool
+    stat: os.stat_result
+
+
+@dataclass(frozen=True)
+class _Listing:
+    entries: list[_ListedEntry]
+    snapshot: SnapshotDirectory | None
+    from_snapshot: bool = False
+
+
+def _list_directory(directory: Path) -> list[_ListedEntry] | None:
+    """List ``directory`` with one ``scandir`` pass and one ``stat`` per child.
+
+    ``stat`` follows symlinks, like ``os.path.getsize``/``getmtime``. Returns
+    None for unreadable directories, which the walk treats as empty (matching
+    ``os.walk`` without ``onerror``).
+    """
+    try:
+        scanner = os.scandir(directory)
+    except OSError:
+        return None
+    listed: list[_ListedEntry] = []
+    with scanner:
+        for entry in scanner:
+            try:
+                is_directory = entry.is_dir()
+            except OSError:
+                is_directory = False
+            listed.append(
+                _ListedEntry(
+                    name=entry.name,
+                    is_directory=is_directory,
+                    is_symlink=is_directory and entry.is_symlink(),
+                    stat=entry.stat(),
+                )
+            )
+    return listed
+
+
+def _stat_snapshot_children(
+    directory: Path, children: tuple[SnapshotChild, ...]
+) -> list[_ListedEntry] | None:
+    """``stat`` the snapshotted children of an unchanged directory.
+
+    Returns None when a child is gone or changed kind (for example a symlink
+    whose target was replaced), so the caller lists the directory again.
+    """
+    listed: list[_ListedEntry] = []
+    for child in children:
+        try:
+            child_stat = os.stat(directory / child.name)
+        except OSError:
+            return None
+        if stat.S_ISDIR(child_stat.st_mode) != child.is_directory:
+            return None
+        listed.append(
+            _ListedEntry(
+                name=child.name,
+                is_directory=child.is_directory,
+                is_symlink=child.is_symlink,
+                stat=child_stat,
+            )
+        )
+    return listed
+
+
+def _read_listing(
+    directory: Path,
+    directory_stat: os.stat_result | None,
+    previous: SnapshotDirectory | None,
+) -> _Listing:
+    if previous is not None and directory_stat is not None:
+        if previous.matches(directory_stat):
+            entries = _stat_snapshot_children(directory, previous.children)
+            if entries is not None:
+                return _Listing(entries=entries, snapshot=previous, from_snapshot=True)
+    listed_at_ns = time.time_ns()
+    scanned = _list_directory(directory)
+    if scanned is None:
+        return _Listing(entries=[], snapshot=None)
+    snapshot = None
+    if (
+        directory_stat is not None
+        and directory_stat.st_mtime_ns < listed_at_ns - _SNAPSHOT_RACY_WINDOW_NS
+    ):
+        snapshot = SnapshotDirectory(
+            inode=directory_stat.st_ino,
+            mtime_ns=directory_stat.st_mtime_ns,
+            children=tuple(
+                SnapshotChild(
+                    name=entry.name,
+                    is_directory=entry.is_directory,
+                    is_symlink=entry.is_symlink,
+                )
+                for entry in scanned
+            ),
+        )
+    return _Listing(entries=scanned, snapshot=snapshot)
+
+
+def _snapshot_key(relative_root: Path) -> str:
+    return relative_root.as_posix()
+
+
+def _stat_or_none(path: Path) -> os.stat_result | None:
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+class _WalkClock:
+    """Time spent inside the walk generator, split into listing and filtering.
+
+    The clock is suspended while the consumer holds a yielded entry, so the
+    totals exclude downstream work (hashing, storing).
+    """
+
+    def __init__(self) -> None:
+        self.active_seconds = 0.0
+        self.ignore_seconds = 0.0
+        self._resumed = time.perf_counter()
+
+    def suspend(self) -> None:
+        self.active_seconds += time.perf_counter() - self._resumed
+
+    def resume(self) -> None:
+        self._resumed = time.perf_counter()
+
+    @contextmanager
+    def ignore_evaluation(self) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.ignore_seconds += time.perf_counter() - started
+
+
+@dataclass
+class _PendingDirectory:
+    path: Path
+    relative_path: Path
+    read: Callable[[], _Listing]
+    future: Future[_Listing] | None = None
+
+
+def _prefetch(
+    executor: ThreadPoolExecutor,
+    pending: list[_PendingDirectory],
+    prefetched: int,
+    limit: int,
+) -> int:
+    """Submit listings from the top of ``pending`` until ``limit`` are in flight.
+
+    Returns the new number of submitted listings that have not been popped.
+    """
+    for directory in reversed(pending):
+        if prefetched >= limit:
+            break
+        if directory.future is None:
+            directory.future = executor.submit(directory.read)
+            prefetched += 1
+    return prefetched
+
+
 class LocalFileReader(FileReader):
     def __init__(
         self,
         path_filter: PathFilter | None = None,
         *,
         collect_walk_metrics: bool = False,
+        walk_workers: int = 1,
+        snapshot_store: DirectorySnapshotStore | None = None,
+        stats: BackupStats | None = None,
     ) -> None:
+        if walk_workers < 1:
+            raise ValueError(f"walk_workers must be at least 1, got {walk_workers}")
         self._path_filter = path_filter or GitIgnorePathFilter()
         self._logger = logging.getLogger(__name__)
         self._collect_walk_metrics = collect_walk_metrics
+        self._walk_workers = walk_workers
+        self._snapshot_store = snapshot_store
+        self._stats = stats
         self._last_walk_metrics: WalkMetrics | None = None
 
     async def read_directory(self, path: Path) -> AsyncGenerator[FileEntry, None]:
+        """Yield entries under ``path`` depth-first, like ``os.walk(topdown=True)``.
+
+        Each directory yields its subdirectories, then its files, in ``scandir``
+        order before the walk descends into the subdirectories that were not
+        pruned. Symlinked directories are yielded but not followed.
+
+        With ``walk_workers > 1``, directory listings (``scandir`` plus ``stat``)
+        of the next directories on the walk stack are prefetched on a thread
+        pool, at most ``walk_workers * 2`` ahead of the consumer. Path
+        filtering and the output order stay on the caller's thread, so results
+        are identical to the sequential walk.
+
+        With a ``snapshot_store``, directories whose inode and mtime match the
+        previous walk reuse its child names and only ``stat`` each child. The
+        snapshot is replaced once the walk has been fully consumed.
+
+        With ``stats``, time spent in the walk (excluding the consumer) is
+        recorded as listing and ignore-evaluation phases.
+        """
+        clock = _WalkClock()
         metrics = self._new_metrics()
         normalized_source_root = path.absolute()
-        for root, dirs, files in os.walk(path, followlinks=False):
-            root_path = Path(root)
-            normalized_walk_root = root_path.absolute()
-            self._path_filter.prepare_walk_directory(
-                normalized_walk_root, source_root=normalized_source_root
+        previous_snapshot = (
+            self._snapshot_store.load(normalized_source_root)
+            if self._snapshot_store is not None
+            else {}
+        )
+        current_snapshot: dict[str, SnapshotDirectory] = {}
+        executor = (
+            ThreadPoolExecutor(
+                max_workers=self._walk_workers, thread_name_prefix="backuper-walk"
             )
-            self._increment_metric(metrics, "visited_directories")
-            walkable_dirs: list[str] = []
-            for dir_name in dirs:
-                dir_entry = self._build_directory_entry(
-                    normalized_source_root=normalized_source_root,
-                    root_path=root_path,
-                    dir_name=dir_name,
-                )
-                skip_reason = self._path_filter.exclusion_reason(
-                    dir_entry, source_root=normalized_source_root
-                )
-                should_yield = skip_reason is None
-                should_prune = False
-                if skip_reason is not None:
-                    self._logger.info(
-                        "Skipping %s (%s)",
-                        dir_entry.relative_path,
-                        skip_reason,
+            if self._walk_workers > 1
+            else None
+        )
+        prefetch_limit = self._walk_workers * _PREFETCH_PER_WORKER
+        prefetched = 0
+        root_relative = Path(".")
+        pending: list[_PendingDirectory] = [
+            self._schedule(
+                path,
+                root_relative,
+                _stat_or_none(path) if self._snapshot_store is not None else None,
+                previous_snapshot,
+            )
+        ]
+        try:
+            while pending:
+                if executor is not None:
+                    prefetched = _prefetch(
+                        executor, pending, prefetched, prefetch_limit
                     )
-                    self._increment_metric(metrics, "skipped_entries")
-                    should_prune = self._path_filter.can_prune_subtree(
-                        dir_entry, source_root=normalized_source_root
+                directory = pending.pop()
+                if directory.future is not None:
+                    prefetched -= 1
+                listing = await self._listing(directory)
+                if self._snapshot_store is not None:
+                    increment(
+                        self._stats,
+                        COUNTER_SNAPSHOT_HITS
+                        if listing.from_snapshot
+                        else COUNTER_SNAPSHOT_MISSES,
+                    )
+                if listing.snapshot is not None:
+                    current_snapshot[_snapshot_key(directory.relative_path)] = (
+                        listing.snapshot
+                    )
+                root_path = directory.path
+                relative_root = directory.relative_path
+                with clock.ignore_evaluation():
+                    self._path_filter.prepare_walk_directory(
+                        root_path.absolute(), source_root=normalized_source_root
+                    )
+                self._increment_metric(metrics, "visited_directories")
+                walkable_dirs: list[tuple[Path, Path, os.stat_result]] = []
+                for listed in listing.entries:
+                    if not listed.is_directory:
+                        continue
+                    dir_entry = FileEntry(
+                        path=root_path / listed.name,
+                        relative_path=relative_root / listed.name,
+                        size=0,
+                        mtime=listed.stat.st_mtime,
+                        is_directory=True,
+                    )
+                    with clock.ignore_evaluation():
+                        skip_reason = self._path_filter.exclusion_reason(
+                            dir_entry, source_root=normalized_source_root
+                        )
+                    should_yield = skip_reason is None
+                    should_prune = False
+                    if skip_reason is not None:
+                        self._logger.info(
+                            "Skipping %s (%s)",
+                            dir_entry.relative_path,
+                            skip_reason,
+                        )
+                        self._increment_metric(metrics, "skipped_entries")
+                        with clock.ignore_evaluation():
+                            should_prune = self._path_filter.can_prune_subtree(
+                                dir_entry, source_root=normalized_source_root
+                            )
+                        if should_prune:
+                            self._increment_metric(metrics, "pruned_directories")
+                    if not should_prune and not listed.is_symlink:
+                        walkable_dirs.append(
+                            (dir_entry.path, dir_entry.relative_path, listed.stat)
+                        )
+                    if should_yield:
+                        increment(self._stats, COUNTER_SOURCE_DIRECTORIES)
+                        clock.suspend()
+                        yield dir_entry
+                        clock.resume()
+
+                # Push reversed so the stack pops children in walk order.
+                pending.extend(
+                    self._schedule(
+                        child_path, child_relative, child_stat, previous_snapshot
+                    )
+                    for child_path, child_relative, child_stat in reversed(
+                        walkable_dirs
                     )
-                    if should_prune:
-                        self._increment_metric(metrics, "pruned_directories")
-                if not should_prune:
-                    walkable_dirs.append(dir_name)
-                if should_yield:
-                    yield dir_entry
-
-            dirs[:] = walkable_dirs
-
-            for file in files:
-                self._increment_metric(metrics, "visited_files")
-                file_entry = self._build_file_entry(
-                    normalized_source_root=normalized_source_root,
-                    root_path=root_path,
-                    file_name=file,
-                )
-                file_skip_reason = self._path_filter.exclusion_reason(
-                    file_entry, source_root=normalized_source_root
                 )
-                if file_skip_reason is not None:
-                    self._logger.info(
-                        "Skipping %s (%s)",
-                        file_entry.relative_path,
-                        file_skip_reason,
+
+                for listed in listing.entries:
+                    if listed.is_directory:
+                        continue
+                    self._increment_metric(metrics, "visited_files")
+                    file_entry = FileEntry(
+                        path=root_path / listed.name,
+                        relative_path=relative_root / listed.name,
+                        size=listed.stat.st_size,
+                        mtime=listed.stat.st_mtime,
+                        is_directory=False,
                     )
-                    self._increment_metric(metrics, "skipped_entries")
-                    continue
-                yield file_entry
+                    with clock.ignore_evaluation():
+                        file_skip_reason = self._path_filter.exclusion_reason(
+                            file_entry, source_root=normalized_source_root
+                        )
+                    if file_skip_reason is not None:
+                        self._logger.info(
+                            "Skipping %s (%s)",
+                            file_entry.relative_path,
+                            file_skip_reason,
+                        )
+                        self._increment_metric(metrics, "skipped_entries")
+                        continue
+                    increment(self._stats, COUNTER_SOURCE_FILES)
+                    increment(self._stats, COUNTER_SOURCE_BYTES, file_entry.size)
+                    clock.suspend()
+                    yield file_entry
+                    clock.resume()
+        finally:
+            if executor is not None:
+                for directory in pending:
+                    if directory.future is not None:
+                        directory.future.cancel()
+                executor.shutdown(wait=True, cancel_futures=True)
+        if self._snapshot_store is not None:
+            self._snapshot_store.save(normalized_source_root, current_snapshot)
+        clock.suspend()
+        if self._stats is not None:
+            self._stats.add_time(
+                PHASE_WALK, clock.active_seconds - clock.ignore_seconds
+            )
+            self._stats.add_time(PHASE_IGNORE, clock.ignore_seconds)
         self._last_walk_metrics = metrics
 
-    def _build_directory_entry(
-        self,
-        *,
-        normalized_source_root: Path,
-        root_path: Path,
-        dir_name: str,
-    ) -> FileEntry:
-        dir_path = root_path / dir_name
-        return FileEntry(
-            path=dir_path,
-            relative_path=self._relative_to_source_root(
-                entry_path=dir_path, normalized_source_root=normalized_source_root
-            ),
-            size=0,
-            mtime=os.path.getmtime(dir_path),
-            is_directory=True,
-        )
-
-    def _build_file_entry(
-        self,
-        *,
-        normalized_source_root: Path,
-        root_path: Path,
-        file_name: str,
-    ) -> FileEntry:
-        file_path = root_path / file_name
-        return FileEntry(
-            path=file_path,
-            relative_path=self._relative_to_source_root(
-                entry_path=file_path, normalized_source_root=normalized_source_root
-            ),
-            size=os.path.getsize(file_path),
-            mtime=os.path.getmtime(file_path),
-            is_directory=False,
-        )
+    @staticmethod
+    def _schedule(
+        directory: Path,
+        relative_path: Path,
+        directory_stat: os.stat_result | None,
+        previous_snapshot: dict[str, SnapshotDirectory],
+    ) -> _PendingDirectory:
+        previous = previous_snapshot.get(_snapshot_key(relative_path))
+        read = partial(_read_listing, directory, directory_stat, previous)
+        return _PendingDirectory(path=directory, relative_path=relative_path, read=read)
 
-    def _relative_to_source_root(
-        self, *, entry_path: Path, normalized_source_root: Path
-    ) -> Path:
-        normalized_entry_path = entry_path.absolute()
-        return normalized_entry_path.relative_to(normalized_source_root)
+    @staticmethod
+    async def _listing(directory: _PendingDirectory) -> _Listing:
+        if directory.future is None:
+            return directory.read()
+        return await asyncio.wrap_future(directory.future)
 
     def get_last_walk_metrics(self) -> WalkMetrics | None:
         return self._last_walk_metrics
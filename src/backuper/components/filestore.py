@@ -1,63 +1,299 @@
 from __future__ import annotations
 
+import asyncio
+import io
 import os
 import pathlib
-import shutil
+import threading
+from collections import Counter
+from collections.abc import Mapping, Sequence
 from pathlib import Path
-from zipfile import ZipFile
+from typing import IO
+from uuid import uuid4
 
-from backuper.config import FilestoreConfig
-from backuper.models import PutResult
-from backuper.ports import FileStore
-from backuper.utils.hashing import compute_hash
-from backuper.utils.paths import hash_to_stored_location, normalize_path
-from backuper.utils.zip_payload import read_zip_payload_bytes
+from backuper.components.compressibility import ExtensionRatioTable
+from backuper.config import (
+    COMPRESSION_CODECS,
+    COMPRESSION_NONE,
+    PACKS_DIR,
+    FilestoreConfig,
+)
+from backuper.models import CompressionRatio, PackedBlob, PutRequest, PutResult
+from backuper.ports import FileStore, InlineBlobStore, PackIndex
+from backuper.utils.compression import (
+    compress_bytes,
+    compress_file,
+    compress_stream,
+    decompress_bytes,
+    estimate_compression_ratio,
+    open_decompressed,
+    read_decompressed,
+    resolve_compression,
+    validate_compression,
+)
+from backuper.utils.file_copy import COPY_STRATEGY_USERSPACE, copy_file, copy_stream
+from backuper.utils.hashing import HashingReader
+from backuper.utils.paths import (
+    hash_to_stored_location,
+    inline_location_hash,
+    inline_stored_location,
+    normalize_path,
+    pack_location_name,
+    pack_stored_location,
+)
 
 StoredLocation = str
 
 
 class LocalFileStore(FileStore):
-    def __init__(self, config: FilestoreConfig) -> None:
+    """Content-addressed blobs under ``<backup_dir>/<backup_data_dir>``.
+
+    Each blob is its own file, except that with ``pack_threshold`` set, files
+    smaller than it are appended to pack files under ``packs/`` instead and
+    located through ``pack_index``, and with ``inline_threshold`` set, files
+    smaller than that are kept whole in ``inline_store``. Reads go to the
+    storage named by the blob's ``stored_location``, so restore and verify find
+    such blobs whatever the current settings.
+    """
+
+    def __init__(
+        self,
+        config: FilestoreConfig,
+        *,
+        pack_index: PackIndex | None = None,
+        inline_store: InlineBlobStore | None = None,
+    ) -> None:
+        if config.put_concurrency < 1:
+            raise ValueError(
+                f"put_concurrency must be at least 1, got {config.put_concurrency}"
+            )
+        if config.pack_threshold < 0:
+            raise ValueError(
+                f"pack_threshold must not be negative, got {config.pack_threshold}"
+            )
+        if config.pack_threshold and pack_index is None:
+            raise ValueError("pack_threshold requires a pack_index")
+        if config.inline_threshold < 0:
+            raise ValueError(
+                f"inline_threshold must not be negative, got {config.inline_threshold}"
+            )
+        if config.inline_threshold and inline_store is None:
+            raise ValueError("inline_threshold requires an inline_store")
+        if config.pack_target_size < 1:
+            raise ValueError(
+                f"pack_target_size must be at least 1, got {config.pack_target_size}"
+            )
+        validate_compression(config.compression_codec, config.compression_level)
         self._config = config
         self._root_path = Path(self._config.backup_dir) / self._config.backup_data_dir
         self._root_path.mkdir(parents=True, exist_ok=True)
+        self._copy_strategy_counts: Counter[str] = Counter()
+        self._copy_strategy_lock = threading.Lock()
+        self._extension_ratios = ExtensionRatioTable()
+        self._pack_index = pack_index
+        self._inline_store = inline_store
+        self._packs_path = self._root_path / PACKS_DIR
+        # Appends, index updates, and sealing happen under one lock, in order.
+        self._pack_lock = threading.Lock()
+        self._current_pack: str | None = None
+        self._resumed_pack = False
+        # Appended since the last flush; committed to the index in one batch.
+        self._unindexed_blobs: dict[str, PackedBlob] = {}
+        self._full_packs: list[str] = []
+        # Inline contents not yet committed to ``inline_store``.
+        self._inline_lock = threading.Lock()
+        self._unstored_inline: dict[str, bytes] = {}
 
     def is_compression_eligible(
         self, origin_file: os.PathLike, size: int | None = None
     ) -> bool:
+        """Whether ``origin_file`` should be stored compressed.
+
+        With ``compression_probe`` the extension skip list is replaced by a
+        sample of the file (see :meth:`_probe_compressible`).
+        """
         ext = pathlib.Path(origin_file).suffix
         file_size = os.path.getsize(origin_file) if size is None else size
-        return (
+        if not (
             self._config.zip_enabled
-            and ext not in self._config.zip_skip_extensions
             and file_size > self._config.zip_min_filesize_in_bytes
-        )
+        ):
+            return False
+        if self._config.compression_probe:
+            return self._probe_compressible(origin_file, ext.lower())
+        return ext not in self._config.zip_skip_extensions
+
+    def _probe_compressible(self, origin_file: os.PathLike, extension: str) -> bool:
+        """Deflate a sample unless ``extension`` is already known to be incompressible."""
+        if self._extension_ratios.known_incompressible(extension):
+            return False
+        ratio = estimate_compression_ratio(origin_file)
+        self._extension_ratios.record(extension, ratio)
+        return ratio <= self._extension_ratios.max_ratio
+
+    def seed_compression_ratios(self, ratios: Mapping[str, CompressionRatio]) -> None:
+        self._extension_ratios.seed(ratios)
+
+    def learned_compression_ratios(self) -> dict[str, CompressionRatio]:
+        return self._extension_ratios.changed_ratios()
+
+    def copy_strategy_counts(self) -> dict[str, int]:
+        """Uncompressed blobs written so far, keyed by ``backuper.utils.file_copy`` strategy."""
+        with self._copy_strategy_lock:
+            return dict(self._copy_strategy_counts)
 
     def exists(self, stored_location: StoredLocation) -> bool:
+        inline_hash = inline_location_hash(stored_location)
+        if inline_hash is not None:
+            return self._find_inline(inline_hash) is not None
         return (self._root_path / stored_location).exists()
 
-    def blob_relative_path(self, file_hash: str, is_compressed: bool) -> str:
-        return str(hash_to_stored_location(file_hash, is_compressed))
+    def stored_blob_exists(
+        self, stored_location: StoredLocation, file_hash: str
+    ) -> bool:
+        """Like :meth:`exists`; a pack location must also index ``file_hash``.
+
+        The indexed entry has to lie within the pack file, so a truncated pack
+        or a missing index row is reported here rather than at restore.
+        """
+        pack_name = pack_location_name(stored_location)
+        if pack_name is None:
+            return self.exists(stored_location)
+        packed = self._find_packed(file_hash)
+        return (
+            packed is not None and packed.pack == pack_name and self._pack_holds(packed)
+        )
+
+    def blob_relative_path(
+        self, file_hash: str, is_compressed: bool, compression: str | None = None
+    ) -> str:
+        return str(hash_to_stored_location(file_hash, is_compressed, compression))
 
-    def blob_exists(self, file_hash: str, is_compressed: bool) -> bool:
-        return self.exists(self.blob_relative_path(file_hash, is_compressed))
+    def blob_exists(
+        self, file_hash: str, is_compressed: bool, compression: str | None = None
+    ) -> bool:
+        if not is_compressed and self._find_inline(file_hash) is not None:
+            return True
+        packed = self._find_packed(file_hash)
+        if packed is not None and packed.compression == resolve_compression(
+            is_compressed, compression
+        ):
+            if self._pack_holds(packed):
+                return True
+        return self.exists(
+            self.blob_relative_path(file_hash, is_compressed, compression)
+        )
 
-    def read_blob(self, file_hash: str, is_compressed: bool) -> bytes:
-        rel = self.blob_relative_path(file_hash, is_compressed)
+    def read_blob(
+        self,
+        file_hash: str,
+        is_compressed: bool,
+        compression: str | None = None,
+        *,
+        stored_location: StoredLocation | None = None,
+    ) -> bytes:
+        content = self._read_inline_or_packed(file_hash, stored_location)
+        if content is not None:
+            return content
+        rel = self.blob_relative_path(file_hash, is_compressed, compression)
         path = self._root_path / rel
         if is_compressed:
-            return read_zip_payload_bytes(path, file_hash)
+            return read_decompressed(
+                path,
+                codec=resolve_compression(is_compressed, compression),
+                file_hash=file_hash,
+            )
         return path.read_bytes()
 
+    def open_blob(
+        self,
+        file_hash: str,
+        is_compressed: bool,
+        compression: str | None = None,
+        *,
+        stored_location: StoredLocation | None = None,
+    ) -> IO[bytes]:
+        content = self._read_inline_or_packed(file_hash, stored_location)
+        if content is not None:
+            return io.BytesIO(content)
+        rel = self.blob_relative_path(file_hash, is_compressed, compression)
+        path = self._root_path / rel
+        if is_compressed:
+            return open_decompressed(
+                path,
+                codec=resolve_compression(is_compressed, compression),
+                file_hash=file_hash,
+            )
+        return path.open("rb")
+
+    def _read_inline_or_packed(
+        self, file_hash: str, stored_location: StoredLocation | None
+    ) -> bytes | None:
+        """Payload of an inline or packed blob; ``None`` for a blob in its own file.
+
+        With a ``stored_location`` only the storage it names is consulted, so
+        reads of blob files never query the manifest. Without one, the inline
+        store and the pack index are probed in turn.
+        """
+        if stored_location is None:
+            content = self._find_inline(file_hash)
+            if content is not None:
+                return content
+            packed = self._find_packed(file_hash)
+            return None if packed is None else self._read_packed(packed)
+        if inline_location_hash(stored_location) is not None:
+            content = self._find_inline(file_hash)
+            if content is None:
+                raise FileNotFoundError(f"Inline blob {file_hash} is not in the store")
+            return content
+        pack_name = pack_location_name(stored_location)
+        if pack_name is None:
+            return None
+        packed = self._find_packed(file_hash)
+        if packed is None or packed.pack != pack_name:
+            raise FileNotFoundError(f"Blob {file_hash} is not indexed in {pack_name}")
+        return self._read_packed(packed)
+
     def put(
         self,
         origin_file: os.PathLike[str],
         restore_path: Path,
         precomputed_hash: str | None = None,
+        hash_algorithm: str | None = None,
     ) -> PutResult:
-        file_hash = precomputed_hash or compute_hash(origin_file)
+        """Store ``origin_file``; without ``precomputed_hash`` it is read only once.
+
+        See :meth:`_put_hashing_while_staging` for the single-read path.
+        """
+        result = self._put(origin_file, restore_path, precomputed_hash, hash_algorithm)
+        self._flush_manifest_rows()
+        return result
+
+    def _put(
+        self,
+        origin_file: os.PathLike[str],
+        restore_path: Path,
+        precomputed_hash: str | None,
+        hash_algorithm: str | None,
+    ) -> PutResult:
+        """:meth:`put` without committing index or inline rows; see :meth:`put_many`."""
+        algorithm = hash_algorithm or self._config.hash_algorithm
+        if self._inline_store is not None and self._should_inline(origin_file):
+            return self._put_inline(
+                origin_file, restore_path, precomputed_hash, algorithm
+            )
+        if self._pack_index is not None and self._should_pack(origin_file):
+            return self._put_packed(
+                origin_file, restore_path, precomputed_hash, algorithm
+            )
+        if precomputed_hash is None:
+            return self._put_hashing_while_staging(origin_file, restore_path, algorithm)
+        file_hash = precomputed_hash
         is_compressed = self.is_compression_eligible(origin_file)
-        stored_location = str(hash_to_stored_location(file_hash, is_compressed))
+        compression = resolve_compression(is_compressed, self._config.compression_codec)
+        stored_location = str(
+            hash_to_stored_location(file_hash, is_compressed, compression)
+        )
         restore_path_normalized = normalize_path(str(restore_path))
 
         if self.exists(stored_location):
@@ -66,25 +302,338 @@ class LocalFileStore(FileStore):
                 hash=file_hash,
                 stored_location=stored_location,
                 is_compressed=is_compressed,
+                hash_algorithm=algorithm,
+                compression=compression,
             )
 
-        staged_blob_path = self._root_path / file_hash
-        if is_compressed:
-            with ZipFile(staged_blob_path, "x") as zip_archive:
-                zip_archive.write(origin_file, "part001")
-        else:
-            shutil.copyfile(origin_file, staged_blob_path)
+        # Unique per put so concurrent writers of the same hash never share a file.
+        staged_blob_path = self._root_path / f"{file_hash}.{uuid4().hex}.tmp"
+        try:
+            if is_compressed:
+                compress_file(
+                    origin_file,
+                    staged_blob_path,
+                    codec=compression,
+                    level=self._config.compression_level,
+                )
+            else:
+                self._count_copy_strategy(copy_file(origin_file, staged_blob_path))
 
-        content_address_path = self._root_path / stored_location
-        self._publish_staged_blob_if_absent(staged_blob_path, content_address_path)
+            content_address_path = self._root_path / stored_location
+            self._publish_staged_blob_if_absent(staged_blob_path, content_address_path)
+        except BaseException:
+            staged_blob_path.unlink(missing_ok=True)
+            raise
 
         return PutResult(
             restore_path=restore_path_normalized,
             hash=file_hash,
             stored_location=stored_location,
             is_compressed=is_compressed,
+            hash_algorithm=algorithm,
+            compression=compression,
         )
 
+    def _put_hashing_while_staging(
+        self, origin_file: os.PathLike[str], restore_path: Path, algorithm: str
+    ) -> PutResult:
+        """Copy or compress ``origin_file`` into staging while hashing it, then publish.
+
+        The content address is only known once the source has been read, so the
+        staged blob is discarded when a blob for the digest is already stored,
+        as a file of any layout (raw or any codec), inline, or in a pack; the
+        result then points at that blob.
+        Uncompressed copies go through userspace, since the bytes must be hashed.
+        """
+        is_compressed = self.is_compression_eligible(origin_file)
+        compression = resolve_compression(is_compressed, self._config.compression_codec)
+        staged_blob_path = self._root_path / f"staging.{uuid4().hex}.tmp"
+        try:
+            with open(origin_file, "rb") as source:
+                reader = HashingReader(source, algorithm=algorithm)
+                if is_compressed:
+                    compress_stream(
+                        reader,
+                        staged_blob_path,
+                        codec=compression,
+                        level=self._config.compression_level,
+                    )
+                else:
+                    with staged_blob_path.open("xb") as staged:
+                        copy_stream(reader, staged)
+                    self._count_copy_strategy(COPY_STRATEGY_USERSPACE)
+        except BaseException:
+            staged_blob_path.unlink(missing_ok=True)
+            raise
+        file_hash = reader.hexdigest()
+
+        existing = self._existing_blob_layout(file_hash, is_compressed, compression)
+        if existing is None:
+            stored_location = str(
+                hash_to_stored_location(file_hash, is_compressed, compression)
+            )
+            self._publish_staged_blob_if_absent(
+                staged_blob_path, self._root_path / stored_location
+            )
+        else:
+            os.remove(staged_blob_path)
+            stored_location, is_compressed, compression = existing
+
+        return PutResult(
+            restore_path=normalize_path(str(restore_path)),
+            hash=file_hash,
+            stored_location=stored_location,
+            is_compressed=is_compressed,
+            hash_algorithm=algorithm,
+            compression=compression,
+        )
+
+    def _should_inline(self, origin_file: os.PathLike[str]) -> bool:
+        threshold = self._config.inline_threshold
+        return threshold > 0 and os.path.getsize(origin_file) < threshold
+
+    def _put_inline(
+        self,
+        origin_file: os.PathLike[str],
+        restore_path: Path,
+        precomputed_hash: str | None,
+        algorithm: str,
+    ) -> PutResult:
+        """Queue a tiny file's bytes, uncompressed, for the inline store.
+
+        Deduplication is by digest: storing content that is already held is a
+        no-op. The result's ``stored_location`` marks the blob as inline.
+        """
+        assert self._inline_store is not None
+        with open(origin_file, "rb") as source:
+            if precomputed_hash is None:
+                reader = HashingReader(source, algorithm=algorithm)
+                content = reader.read()
+                file_hash = reader.hexdigest()
+            else:
+                content = source.read()
+                file_hash = precomputed_hash
+        with self._inline_lock:
+            self._unstored_inline.setdefault(file_hash, content)
+        return PutResult(
+            restore_path=normalize_path(str(restore_path)),
+            hash=file_hash,
+            stored_location=inline_stored_location(file_hash),
+            is_compressed=False,
+            hash_algorithm=algorithm,
+            compression=COMPRESSION_NONE,
+        )
+
+    def _find_inline(self, file_hash: str) -> bytes | None:
+        if self._inline_store is None:
+            return None
+        unstored = self._unstored_inline.get(file_hash)
+        if unstored is not None:
+            return unstored
+        return self._inline_store.get(file_hash)
+
+    def _should_pack(self, origin_file: os.PathLike[str]) -> bool:
+        threshold = self._config.pack_threshold
+        return threshold > 0 and os.path.getsize(origin_file) < threshold
+
+    def _put_packed(
+        self,
+        origin_file: os.PathLike[str],
+        restore_path: Path,
+        precomputed_hash: str | None,
+        algorithm: str,
+    ) -> PutResult:
+        """Append a small file to the open pack, unless its digest is already stored.
+
+        The file is read into memory once (hashing it too when no
+        ``precomputed_hash`` is given). Without a precomputed hash, an existing
+        blob with the same digest is reused as in
+        :meth:`_put_hashing_while_staging`.
+        """
+        assert self._pack_index is not None
+        with open(origin_file, "rb") as source:
+            if precomputed_hash is None:
+                reader = HashingReader(source, algorithm=algorithm)
+                data = reader.read()
+                file_hash = reader.hexdigest()
+            else:
+                data = source.read()
+                file_hash = precomputed_hash
+        restore_path_normalized = normalize_path(str(restore_path))
+
+        if precomputed_hash is None:
+            existing = self._existing_blob_layout(file_hash, False, COMPRESSION_NONE)
+            if existing is not None:
+                stored_location, is_compressed, compression = existing
+                return PutResult(
+                    restore_path=restore_path_normalized,
+                    hash=file_hash,
+                    stored_location=stored_location,
+                    is_compressed=is_compressed,
+                    hash_algorithm=algorithm,
+                    compression=compression,
+                )
+
+        is_compressed = self.is_compression_eligible(origin_file, len(data))
+        compression = resolve_compression(is_compressed, self._config.compression_codec)
+        if is_compressed:
+            data = compress_bytes(
+                data, codec=compression, level=self._config.compression_level
+            )
+        with self._pack_lock:
+            packed = self._find_packed(file_hash)
+            if packed is None:
+                packed = self._append_to_pack(file_hash, compression, data)
+        return PutResult(
+            restore_path=restore_path_normalized,
+            hash=file_hash,
+            stored_location=pack_stored_location(packed.pack),
+            is_compressed=packed.compression != COMPRESSION_NONE,
+            hash_algorithm=algorithm,
+            compression=packed.compression,
+        )
+
+    def _append_to_pack(
+        self, file_hash: str, compression: str, data: bytes
+    ) -> PackedBlob:
+        """Append ``data`` to the open pack; queue its index row and, once full, the seal.
+
+        Called with ``_pack_lock`` held. Bytes are written before the index row
+        is even queued, so a crash leaves at worst unreferenced bytes at the end
+        of a pack.
+        """
+        assert self._pack_index is not None
+        pack = self._open_pack()
+        with (self._packs_path / pack).open("ab") as pack_file:
+            offset = pack_file.tell()
+            pack_file.write(data)
+        packed = PackedBlob(
+            hash=file_hash,
+            compression=compression,
+            pack=pack,
+            offset=offset,
+            length=len(data),
+        )
+        self._unindexed_blobs[file_hash] = packed
+        if offset + len(data) >= self._config.pack_target_size:
+            self._full_packs.append(pack)
+            self._current_pack = None
+        return packed
+
+    def _flush_manifest_rows(self) -> None:
+        """Commit queued inline contents, then queued index rows and seals.
+
+        Each kind is written in one transaction.
+        """
+        if self._inline_store is not None:
+            with self._inline_lock:
+                if self._unstored_inline:
+                    self._inline_store.put_many(self._unstored_inline)
+                    self._unstored_inline.clear()
+        if self._pack_index is None:
+            return
+        with self._pack_lock:
+            if self._unindexed_blobs:
+                self._pack_index.add_many(list(self._unindexed_blobs.values()))
+                self._unindexed_blobs.clear()
+            for pack in self._full_packs:
+                self._pack_index.seal(pack)
+            self._full_packs.clear()
+
+    def _open_pack(self) -> str:
+        """Name of the pack to append to: the index's unsealed one, or a new one."""
+        assert self._pack_index is not None
+        if self._current_pack is None:
+            if not self._resumed_pack:
+                self._resumed_pack = True
+                self._current_pack = self._pack_index.unsealed_pack()
+            if self._current_pack is None:
+                self._current_pack = f"pack-{uuid4().hex}.pack"
+            self._packs_path.mkdir(parents=True, exist_ok=True)
+        return self._current_pack
+
+    def _find_packed(self, file_hash: str) -> PackedBlob | None:
+        if self._pack_index is None:
+            return None
+        unindexed = self._unindexed_blobs.get(file_hash)
+        if unindexed is not None:
+            return unindexed
+        return self._pack_index.find(file_hash)
+
+    def _pack_holds(self, packed: PackedBlob) -> bool:
+        """Whether the pack file is long enough to contain ``packed``."""
+        try:
+            pack_size = (self._packs_path / packed.pack).stat().st_size
+        except FileNotFoundError:
+            return False
+        return pack_size >= packed.offset + packed.length
+
+    def _read_packed(self, packed: PackedBlob) -> bytes:
+        pack_path = self._packs_path / packed.pack
+        with pack_path.open("rb") as pack_file:
+            pack_file.seek(packed.offset)
+            data = pack_file.read(packed.length)
+        if len(data) != packed.length:
+            raise ValueError(
+                f"{pack_path}: blob {packed.hash} at offset {packed.offset} is "
+                f"truncated ({len(data)} of {packed.length} bytes)"
+            )
+        return decompress_bytes(data, codec=packed.compression, file_hash=packed.hash)
+
+    def _existing_blob_layout(
+        self, file_hash: str, is_compressed: bool, compression: str
+    ) -> tuple[str, bool, str] | None:
+        """Location, compression flag, and codec of a stored blob for ``file_hash``.
+
+        The blob file layout this put would write is checked first, then the
+        other blob file layouts, the inline store, and the pack index.
+        """
+        layouts = [(is_compressed, compression), (False, COMPRESSION_NONE)]
+        layouts += [(True, codec) for codec in COMPRESSION_CODECS]
+        for layout_compressed, codec in layouts:
+            location = str(hash_to_stored_location(file_hash, layout_compressed, codec))
+            if self.exists(location):
+                return location, layout_compressed, codec
+        if self._find_inline(file_hash) is not None:
+            return inline_stored_location(file_hash), False, COMPRESSION_NONE
+        packed = self._find_packed(file_hash)
+        if packed is not None:
+            return (
+                pack_stored_location(packed.pack),
+                packed.compression != COMPRESSION_NONE,
+                packed.compression,
+            )
+        return None
+
+    def _count_copy_strategy(self, strategy: str) -> None:
+        with self._copy_strategy_lock:
+            self._copy_strategy_counts[strategy] += 1
+
+    async def put_many(self, requests: Sequence[PutRequest]) -> list[PutResult]:
+        """Run :meth:`put` on worker threads, at most ``put_concurrency`` at a time.
+
+        Inline contents and pack index rows for the whole batch are committed
+        before returning, so manifest rows written afterwards can reference them.
+        """
+        semaphore = asyncio.Semaphore(self._config.put_concurrency)
+
+        async def put_one(request: PutRequest) -> PutResult:
+            async with semaphore:
+                return await asyncio.to_thread(
+                    self._put,
+                    request.origin_file,
+                    request.restore_path,
+                    request.precomputed_hash,
+                    request.hash_algorithm,
+                )
+
+        try:
+            return list(
+                await asyncio.gather(*(put_one(request) for request in requests))
+            )
+        finally:
+            await asyncio.to_thread(self._flush_manifest_rows)
+
     def _publish_staged_blob_if_absent(
         self, staged_blob_path: Path, content_address_path: Path
     ) -> None:
@@ -99,6 +648,10 @@ class LocalFileStore(FileStore):
         # Publish staged content once under the content-addressed path.
         # If another writer already published the same hash, discard ours.
         if not content_address_path.exists():
-            os.rename(staged_blob_path, content_address_path)
+            try:
+                os.rename(staged_blob_path, content_address_path)
+            except FileExistsError:
+                # Lost a publish race on a platform where rename does not replace.
+                os.remove(staged_blob_path)
         else:
             os.remove(staged_blob_path)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import re
 from collections.abc import Sequence
 from dataclasses import dataclass
 from pathlib import Path
@@ -14,6 +15,9 @@ IGNORE_FILE_NAMES: tuple[str, str] = (".backupignore", ".gitignore")
 
 _USER_LAYER_LABEL = "user"
 
+_NAMED_GROUP = re.compile(r"\(\?P<[^>]+>")
+_UNSAFE_TO_COMBINE = re.compile(r"\(\?P=|\\[1-9]|\(\?[aiLmsux-]+\)")
+
 
 @dataclass(frozen=True)
 class IgnoreMatchResolution:
@@ -34,6 +38,52 @@ class _PatternLayer:
     label: str
 
 
+class _CompiledLayers:
+    """All patterns of a directory's layers, evaluated in one regex pass.
+
+    Alternatives are emitted from highest to lowest precedence, so the first one
+    that matches at the start of the path is the last matching rule in gitignore
+    order. Patterns that cannot be embedded in a combined regex (backreferences,
+    inline flags) keep the per-pattern loop for the whole directory.
+    """
+
+    def __init__(self, layers: tuple[_PatternLayer, ...]) -> None:
+        self._layers = layers
+        self._rules = tuple(
+            (bool(pattern.include), layer.label)
+            for layer in layers
+            for pattern in layer.patterns
+        )
+        self._regex = _combine_patterns(
+            tuple(pattern for layer in layers for pattern in layer.patterns)
+        )
+
+    @property
+    def layers(self) -> tuple[_PatternLayer, ...]:
+        return self._layers
+
+    def resolve(
+        self, *, relative_path: Path, is_directory: bool, source_root: Path
+    ) -> IgnoreMatchResolution:
+        if not self._rules:
+            return IgnoreMatchResolution(is_ignored=False, source_label=None)
+        if self._regex is None:
+            return _resolve_last_match(
+                relative_path=relative_path,
+                is_directory=is_directory,
+                layers=self._layers,
+                source_root=source_root,
+            )
+        relative_posix_path = _relative_posix_path(relative_path, source_root)
+        winner = _winning_rule(self._regex, relative_posix_path)
+        if is_directory:
+            winner = max(winner, _winning_rule(self._regex, f"{relative_posix_path}/"))
+        if winner < 0:
+            return IgnoreMatchResolution(is_ignored=False, source_label=None)
+        ignored, label = self._rules[winner]
+        return IgnoreMatchResolution(is_ignored=ignored, source_label=label)
+
+
 class NullPathFilter(PathFilter):
     def prepare_walk_directory(self, walk_root: Path, *, source_root: Path) -> None:
         return None
@@ -57,7 +107,7 @@ class GitIgnorePathFilter(PathFilter):
             label=_USER_LAYER_LABEL,
         )
         self._ignore_file_names = tuple(sorted(ignore_file_names))
-        self._directory_layers: dict[Path, tuple[_PatternLayer, ...]] = {}
+        self._directory_layers: dict[Path, _CompiledLayers] = {}
         self._ignore_file_pattern_cache: dict[
             Path, tuple[GitIgnoreSpecPattern, ...]
         ] = {}
@@ -65,7 +115,7 @@ class GitIgnorePathFilter(PathFilter):
     def prepare_walk_directory(self, walk_root: Path, *, source_root: Path) -> None:
         normalized_source_root = _normalize_path(source_root)
         normalized_walk_root = _normalize_path(walk_root)
-        self._layers_for_directory(
+        self._compiled_layers_for_directory(
             normalized_walk_root, source_root=normalized_source_root
         )
 
@@ -73,18 +123,15 @@ class GitIgnorePathFilter(PathFilter):
         self, entry: FileEntry, *, source_root: Path
     ) -> IgnoreMatchResolution:
         normalized_source_root = _normalize_path(source_root)
-        normalized_entry_path = _normalize_path(entry.path)
-        parent = normalized_entry_path.parent
-        layers = self._layers_for_directory(parent, source_root=normalized_source_root)
-        entry_relative_path = _entry_relative_path(
-            entry=entry,
-            normalized_entry_path=normalized_entry_path,
-            normalized_source_root=normalized_source_root,
+        entry_relative_path, parent = _entry_relative_path_and_parent(
+            entry=entry, normalized_source_root=normalized_source_root
+        )
+        compiled = self._compiled_layers_for_directory(
+            parent, source_root=normalized_source_root
         )
-        return _resolve_last_match(
+        return compiled.resolve(
             relative_path=entry_relative_path,
             is_directory=entry.is_directory,
-            layers=layers,
             source_root=normalized_source_root,
         )
 
@@ -109,45 +156,42 @@ class GitIgnorePathFilter(PathFilter):
             return False
 
         normalized_source_root = _normalize_path(source_root)
-        normalized_entry_path = _normalize_path(entry.path)
-        parent_layers = self._layers_for_directory(
-            normalized_entry_path.parent, source_root=normalized_source_root
+        entry_relative_path, parent = _entry_relative_path_and_parent(
+            entry=entry, normalized_source_root=normalized_source_root
         )
-        entry_relative_path = _entry_relative_path(
-            entry=entry,
-            normalized_entry_path=normalized_entry_path,
-            normalized_source_root=normalized_source_root,
+        parent_layers = self._compiled_layers_for_directory(
+            parent, source_root=normalized_source_root
         )
-        if not _resolve_last_match(
+        if not parent_layers.resolve(
             relative_path=entry_relative_path,
             is_directory=True,
-            layers=parent_layers,
             source_root=normalized_source_root,
         ).is_ignored:
             return False
         if _layers_may_reinclude_descendant(
-            layers=parent_layers,
+            layers=parent_layers.layers,
             directory_relative_path=entry_relative_path,
             source_root=normalized_source_root,
         ):
             return False
         return True
 
-    def _layers_for_directory(
+    def _compiled_layers_for_directory(
         self, walk_directory: Path, *, source_root: Path
-    ) -> tuple[_PatternLayer, ...]:
+    ) -> _CompiledLayers:
         """Build effective pattern layers for a walk directory.
 
-        Layer order is lowest to highest precedence:
-        user patterns, then ignore files discovered from source root down to the
-        walk directory (per-anchor filename order). The resulting tuple is cached.
+        Both paths must already be normalized (absolute). Layer order is lowest
+        to highest precedence: user patterns, then ignore files discovered from
+        source root down to the walk directory (per-anchor filename order). The
+        compiled result is cached per directory.
         """
-        normalized_source_root = _normalize_path(source_root)
-        normalized_walk_directory = _normalize_path(walk_directory)
-
-        if normalized_walk_directory in self._directory_layers:
-            return self._directory_layers[normalized_walk_directory]
+        cached = self._directory_layers.get(walk_directory)
+        if cached is not None:
+            return cached
 
+        normalized_source_root = source_root
+        normalized_walk_directory = walk_directory
         anchor_chain = _anchor_chain(
             source_root=normalized_source_root, walk_directory=normalized_walk_directory
         )
@@ -161,7 +205,7 @@ class GitIgnorePathFilter(PathFilter):
                         normalized_source_root
                     ).as_posix()
                     layers.append(_PatternLayer(patterns=patterns, label=rel_label))
-        built = tuple(layers)
+        built = _CompiledLayers(tuple(layers))
         self._directory_layers[normalized_walk_directory] = built
         return built
 
@@ -198,15 +242,24 @@ def _normalize_path(path: Path) -> Path:
     return path.absolute()
 
 
-def _entry_relative_path(
-    *,
-    entry: FileEntry,
-    normalized_entry_path: Path,
-    normalized_source_root: Path,
-) -> Path:
+def _entry_relative_path_and_parent(
+    *, entry: FileEntry, normalized_source_root: Path
+) -> tuple[Path, Path]:
+    """Return the entry path relative to the source root and its absolute parent.
+
+    Source-relative entries derive the parent from the already normalized root,
+    which avoids ``Path.absolute()`` (and its ``getcwd``) for every entry.
+    """
     if not entry.relative_path.is_absolute():
-        return entry.relative_path
-    return normalized_entry_path.relative_to(normalized_source_root)
+        return (
+            entry.relative_path,
+            normalized_source_root / entry.relative_path.parent,
+        )
+    normalized_entry_path = _normalize_path(entry.path)
+    return (
+        normalized_entry_path.relative_to(normalized_source_root),
+        normalized_entry_path.parent,
+    )
 
 
 def _compile_patterns(lines: Sequence[str]) -> tuple[GitIgnoreSpecPattern, ...]:
@@ -323,6 +376,49 @@ def _resolve_last_match(
     return IgnoreMatchResolution(is_ignored=bool(ignored), source_label=winning_label)
 
 
+def _combine_patterns(
+    patterns: tuple[GitIgnoreSpecPattern, ...],
+) -> re.Pattern[str] | None:
+    """Join pattern regexes into one alternation, highest precedence first.
+
+    Each alternative is a named group ``r<index>`` so ``Match.lastgroup`` names
+    the winning rule. Unanchored regexes get a lazy prefix so ``match`` behaves
+    like the ``search`` used by ``match_file``. Returns None when a pattern
+    cannot be combined safely.
+    """
+    alternatives: list[str] = []
+    for index in reversed(range(len(patterns))):
+        regex = patterns[index].regex
+        if not isinstance(regex, re.Pattern) or not isinstance(regex.pattern, str):
+            return None
+        if regex.flags != re.UNICODE or _UNSAFE_TO_COMBINE.search(regex.pattern):
+            return None
+        body = _NAMED_GROUP.sub("(?:", regex.pattern)
+        if not body.startswith("^"):
+            body = f"(?s:.*?)(?:{body})"
+        alternatives.append(f"(?P<r{index}>{body})")
+    if not alternatives:
+        return None
+    try:
+        return re.compile("|".join(alternatives))
+    except re.error:
+        return None
+
+
+def _winning_rule(regex: re.Pattern[str], relative_posix_path: str) -> int:
+    match = regex.match(relative_posix_path)
+    if match is None or match.lastgroup is None:
+        return -1
+    return int(match.lastgroup[1:])
+
+
+def _relative_posix_path(relative_path: Path, source_root: Path) -> str:
+    relative_posix_path = relative_path.as_posix()
+    if source_root == Path("."):
+        relative_posix_path = relative_posix_path.removeprefix("./")
+    return relative_posix_path
+
+
 def _pattern_matches_path(
     *,
     pattern: GitIgnoreSpecPattern,
@@ -331,9 +427,7 @@ def _pattern_matches_path(
     source_root: Path,
 ) -> bool:
     """Match a relative path; directories also try a trailing-slash variant."""
-    relative_posix_path = relative_path.as_posix()
-    if source_root == Path("."):
-        relative_posix_path = relative_posix_path.removeprefix("./")
+    relative_posix_path = _relative_posix_path(relative_path, source_root)
     if pattern.match_file(relative_posix_path):
         return True
     if is_directory:
@@ -17,6 +17,11 @@ class NoOpAnalysisReporter(AnalysisReporter):
     def report_file_progress(self, file_index: int, total_files: int) -> None:
         pass
 
+    def report_running_summary(
+        self, summary: BackupAnalysisSummary, files_processed: int
+    ) -> None:
+        pass
+
 
 class StdoutAnalysisReporter(AnalysisReporter):
     def report_analysis_start(self) -> None:
@@ -49,3 +54,11 @@ class StdoutAnalysisReporter(AnalysisReporter):
         if total_files == 0:
             return
         print(f"Processed {format((file_index / total_files), '.0%')} of files...")
+
+    def report_running_summary(
+        self, summary: BackupAnalysisSummary, files_processed: int
+    ) -> None:
+        print(
+            f"Processed {files_processed} of {summary.num_files} files analyzed "
+            f"so far ({summary.files_to_backup} to backup)..."
+        )
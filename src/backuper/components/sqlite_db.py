@@ -1,20 +1,32 @@
 from __future__ import annotations
 
 import sqlite3
+import threading
 import time
 import uuid
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Iterable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
 from pathlib import Path
+from types import TracebackType
+from typing import NamedTuple
 from uuid import UUID
 
-from backuper.config import SqliteDbConfig
+from backuper.config import (
+    COMPRESSION_NONE,
+    DEFAULT_HASH_ALGORITHM,
+    MANIFEST_LIST_PAGE_SIZE,
+    SqliteDbConfig,
+)
 from backuper.models import (
     BackedUpFileEntry,
+    CompressionRatio,
     FileEntry,
+    PackedBlob,
     VersionAlreadyExistsError,
     VersionNotFoundError,
 )
-from backuper.ports import BackupDatabase
+from backuper.ports import BackupDatabase, InlineBlobStore, PackIndex
+from backuper.utils.compression import resolve_compression
 
 SQLITE_BUSY_TIMEOUT_MS = 5000
 
@@ -38,17 +50,53 @@ SQL_SELECT_COMPLETED_VERSION_BY_NAME = (
     "SELECT name FROM versions WHERE name = ? AND state = ?"
 )
 SQL_SELECT_FILES_BY_VERSION = """
-SELECT restore_path, hash_digest, storage_location, compression, size, mtime
+SELECT restore_path, hash_algorithm, hash_digest, storage_location, compression,
+       size, mtime
 FROM version_files
 WHERE version_name = ?
 ORDER BY id ASC
 """
-SQL_SELECT_DIRECTORIES_BY_VERSION = """
-SELECT restore_path
+SQL_SELECT_FILES_PAGE_BY_VERSION = """
+SELECT id, restore_path, hash_algorithm, hash_digest, storage_location, compression,
+       size, mtime
+FROM version_files
+WHERE version_name = ? AND id > ?
+ORDER BY id ASC
+LIMIT ?
+"""
+SQL_SELECT_DIRECTORIES_PAGE_BY_VERSION = """
+SELECT id, restore_path
 FROM version_directories
-WHERE version_name = ?
+WHERE version_name = ? AND id > ?
 ORDER BY id ASC
+LIMIT ?
+"""
+SQL_SELECT_COMPRESSION_RATIOS = (
+    "SELECT extension, samples, ratio FROM compression_ratios ORDER BY extension"
+)
+SQL_UPSERT_COMPRESSION_RATIO = """
+INSERT INTO compression_ratios(extension, samples, ratio) VALUES (?, ?, ?)
+ON CONFLICT(extension) DO UPDATE SET samples = excluded.samples, ratio = excluded.ratio
+"""
+SQL_SELECT_PACKED_BLOB = """
+SELECT hash_digest, compression, pack_name, blob_offset, blob_length
+FROM packed_blobs
+WHERE hash_digest = ?
 """
+SQL_SELECT_UNSEALED_PACK = (
+    "SELECT name FROM packs WHERE sealed = 0 ORDER BY name DESC LIMIT 1"
+)
+SQL_INSERT_PACK = "INSERT OR IGNORE INTO packs(name, sealed) VALUES (?, 0)"
+SQL_INSERT_PACKED_BLOB = """
+INSERT OR IGNORE INTO packed_blobs(
+    hash_digest, compression, pack_name, blob_offset, blob_length
+) VALUES (?, ?, ?, ?, ?)
+"""
+SQL_SEAL_PACK = "UPDATE packs SET sealed = 1 WHERE name = ?"
+SQL_SELECT_INLINE_BLOB = "SELECT content FROM inline_blobs WHERE hash_digest = ?"
+SQL_INSERT_INLINE_BLOB = (
+    "INSERT OR IGNORE INTO inline_blobs(hash_digest, content) VALUES (?, ?)"
+)
 SQL_INSERT_VERSION = "INSERT INTO versions(name, state, created_at) VALUES (?, ?, ?)"
 SQL_INSERT_DIRECTORY = """
 INSERT INTO version_directories(version_name, restore_path)
@@ -67,16 +115,24 @@ INSERT INTO version_files(
 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
 """
 SQL_SELECT_FILES_BY_HASH = """
-SELECT vf.restore_path, vf.hash_digest, vf.storage_location, vf.compression,
-       vf.size, vf.mtime
+SELECT vf.restore_path, vf.hash_algorithm, vf.hash_digest, vf.storage_location,
+       vf.compression, vf.size, vf.mtime
 FROM version_files vf
 INNER JOIN versions v ON v.name = vf.version_name
 WHERE v.state = ? AND vf.hash_algorithm = ? AND vf.hash_digest = ?
 ORDER BY vf.id ASC
 """
+SQL_SELECT_COMPLETED_FILES = """
+SELECT vf.restore_path, vf.hash_algorithm, vf.hash_digest, vf.storage_location,
+       vf.compression, vf.size, vf.mtime
+FROM version_files vf
+INNER JOIN versions v ON v.name = vf.version_name
+WHERE v.state = ?
+ORDER BY vf.id ASC
+"""
 SQL_SELECT_FILES_BY_METADATA = """
-SELECT vf.restore_path, vf.hash_digest, vf.storage_location, vf.compression,
-       vf.size, vf.mtime
+SELECT vf.restore_path, vf.hash_algorithm, vf.hash_digest, vf.storage_location,
+       vf.compression, vf.size, vf.mtime
 FROM version_files vf
 INNER JOIN versions v ON v.name = vf.version_name
 WHERE v.state = ?
@@ -89,9 +145,14 @@ ORDER BY vf.id ASC
 
 
 class SqliteDb:
-    """SQLite bootstrapper for backup manifest storage."""
+    """SQLite bootstrapper and connection owner for backup manifest storage.
+
+    Adapter queries share one long-lived connection (see :meth:`connection`), so
+    PRAGMAs run once and sqlite3's per-connection statement cache is reused. Call
+    :meth:`close` (or use the instance as a context manager) to release it.
+    """
 
-    _SCHEMA_VERSION = 1
+    _SCHEMA_VERSION = 4
 
     def __init__(self, config: SqliteDbConfig) -> None:
         if not 0 <= config.sqlite_synchronous <= 3:
@@ -102,20 +163,57 @@ class SqliteDb:
         self.db_dir = Path(self._config.backup_dir) / self._config.backup_db_dir
         self.db_dir.mkdir(parents=True, exist_ok=True)
         self._db_path = self.db_dir / self._config.sqlite_filename
-        self._bootstrap()
+        self._connection: sqlite3.Connection | None = None
+        try:
+            self._bootstrap()
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self) -> SqliteDb:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
 
     @property
     def db_path(self) -> Path:
         return self._db_path
 
-    def connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self._db_path)
+    def connect(self, *, check_same_thread: bool = True) -> sqlite3.Connection:
+        """Open a new, caller-owned connection with the manifest PRAGMAs applied.
+
+        Pass ``check_same_thread=False`` only when the caller serializes use of
+        the connection across threads itself.
+        """
+        conn = sqlite3.connect(self._db_path, check_same_thread=check_same_thread)
         conn.row_factory = sqlite3.Row
         self._configure_connection(conn)
         return conn
 
+    def connection(self) -> sqlite3.Connection:
+        """Return the shared connection, opening it on first use or after :meth:`close`.
+
+        Use it as ``with db.connection() as conn:`` to scope one transaction; the
+        ``with`` block commits or rolls back but does not close the connection.
+        """
+        if self._connection is None:
+            self._connection = self.connect()
+        return self._connection
+
+    def close(self) -> None:
+        if self._connection is None:
+            return
+        self._connection.close()
+        self._connection = None
+
     def _bootstrap(self) -> None:
-        with self.connect() as conn:
+        with self.connection() as conn:
             version_row = conn.execute("PRAGMA user_version").fetchone()
             if version_row is None:
                 raise RuntimeError("Could not read PRAGMA user_version")
@@ -127,6 +225,13 @@ class SqliteDb:
                 )
             if current_version < 1:
                 self._migrate_to_v1(conn)
+            if current_version < 2:
+                self._migrate_to_v2(conn)
+            if current_version < 3:
+                self._migrate_to_v3(conn)
+            if current_version < 4:
+                self._migrate_to_v4(conn)
+            if current_version < self._SCHEMA_VERSION:
                 conn.execute(f"PRAGMA user_version={self._SCHEMA_VERSION}")
             conn.commit()
 
@@ -202,20 +307,181 @@ class SqliteDb:
             """
         )
 
+    def _migrate_to_v2(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS compression_ratios (
+                extension TEXT PRIMARY KEY,
+                samples INTEGER NOT NULL,
+                ratio REAL NOT NULL
+            )
+            """
+        )
+
+    def _migrate_to_v3(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS packs (
+                name TEXT PRIMARY KEY,
+                sealed INTEGER NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS packed_blobs (
+                hash_digest TEXT PRIMARY KEY,
+                compression TEXT NOT NULL,
+                pack_name TEXT NOT NULL REFERENCES packs(name),
+                blob_offset INTEGER NOT NULL,
+                blob_length INTEGER NOT NULL
+            )
+            """
+        )
+
+    def _migrate_to_v4(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS inline_blobs (
+                hash_digest TEXT PRIMARY KEY,
+                content BLOB NOT NULL
+            )
+            """
+        )
+
+
+class _WorkerThreadAdapter:
+    """Base for manifest adapters that file stores call from worker threads.
+
+    Each owns a separate connection, opened on first use, that a lock serializes;
+    every write commits at once.
+    """
+
+    def __init__(self, sqlite_db: SqliteDb) -> None:
+        self._sqlite_db = sqlite_db
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    @contextmanager
+    def _locked(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            if self._connection is None:
+                self._connection = self._sqlite_db.connect(check_same_thread=False)
+            yield self._connection
+
+
+class SqlitePackIndex(_WorkerThreadAdapter, PackIndex):
+    """Pack offsets in the manifest's ``packs`` and ``packed_blobs`` tables.
+
+    Each :meth:`add_many` and :meth:`seal` commits at once; callers add rows only
+    after writing their bytes, so the index never points at missing data.
+    """
+
+    def find(self, file_hash: str) -> PackedBlob | None:
+        with self._locked() as conn:
+            row = conn.execute(SQL_SELECT_PACKED_BLOB, (file_hash,)).fetchone()
+        if row is None:
+            return None
+        return PackedBlob(
+            hash=str(row["hash_digest"]),
+            compression=str(row["compression"]),
+            pack=str(row["pack_name"]),
+            offset=int(row["blob_offset"]),
+            length=int(row["blob_length"]),
+        )
+
+    def add_many(self, blobs: Sequence[PackedBlob]) -> None:
+        packs = dict.fromkeys(blob.pack for blob in blobs)
+        with self._locked() as conn, conn:
+            conn.executemany(SQL_INSERT_PACK, [(pack,) for pack in packs])
+            conn.executemany(
+                SQL_INSERT_PACKED_BLOB,
+                [
+                    (blob.hash, blob.compression, blob.pack, blob.offset, blob.length)
+                    for blob in blobs
+                ],
+            )
+
+    def unsealed_pack(self) -> str | None:
+        with self._locked() as conn:
+            row = conn.execute(SQL_SELECT_UNSEALED_PACK).fetchone()
+        return None if row is None else str(row["name"])
+
+    def seal(self, pack: str) -> None:
+        with self._locked() as conn, conn:
+            conn.execute(SQL_SEAL_PACK, (pack,))
+
+
+class SqliteInlineBlobStore(_WorkerThreadAdapter, InlineBlobStore):
+    """Tiny blob contents in the manifest's ``inline_blobs`` table.
+
+    Rows are committed before :meth:`put_many` returns, so manifest rows written
+    afterwards never reference content that is not stored yet.
+    """
+
+    def get(self, file_hash: str) -> bytes | None:
+        with self._locked() as conn:
+            row = conn.execute(SQL_SELECT_INLINE_BLOB, (file_hash,)).fetchone()
+        return None if row is None else bytes(row["content"])
+
+    def put_many(self, blobs: Mapping[str, bytes]) -> None:
+        with self._locked() as conn, conn:
+            conn.executemany(SQL_INSERT_INLINE_BLOB, blobs.items())
+
+
+class _IndexedFile(NamedTuple):
+    """One ``version_files`` row held by the in-memory metadata index."""
+
+    size: int
+    mtime: float
+    hash_algorithm: str
+    hash_digest: str
+    storage_location: str
+    compression: str
+
 
 class SqliteBackupDatabase(BackupDatabase):
-    _DEFAULT_HASH_ALGORITHM = "sha1"
-    _COMPRESSION_NONE = "none"
-    _COMPRESSION_ZIP = "zip"
     _VERSION_STATE_PENDING = "pending"
     _VERSION_STATE_COMPLETED = "completed"
     _MTIME_TOLERANCE_SECONDS = 0.001
 
-    def __init__(self, sqlite_db: SqliteDb) -> None:
+    def __init__(
+        self, sqlite_db: SqliteDb, *, list_page_size: int = MANIFEST_LIST_PAGE_SIZE
+    ) -> None:
+        if list_page_size < 1:
+            raise ValueError(f"list_page_size must be at least 1, got {list_page_size}")
         self._sqlite_db = sqlite_db
+        self._list_page_size = list_page_size
+        self._metadata_index: dict[str, _IndexedFile] | None = None
+        self._hash_index: dict[tuple[str, str], tuple[str, _IndexedFile]] | None = None
+        self._pack_index: SqlitePackIndex | None = None
+        self._inline_blob_store: SqliteInlineBlobStore | None = None
+
+    def close(self) -> None:
+        if self._pack_index is not None:
+            self._pack_index.close()
+        if self._inline_blob_store is not None:
+            self._inline_blob_store.close()
+        self._sqlite_db.close()
+
+    def inline_blob_store(self) -> SqliteInlineBlobStore:
+        if self._inline_blob_store is None:
+            self._inline_blob_store = SqliteInlineBlobStore(self._sqlite_db)
+        return self._inline_blob_store
+
+    def pack_index(self) -> SqlitePackIndex:
+        if self._pack_index is None:
+            self._pack_index = SqlitePackIndex(self._sqlite_db)
+        return self._pack_index
 
     async def list_versions(self) -> list[str]:
-        with self._sqlite_db.connect() as conn:
+        with self._sqlite_db.connection() as conn:
             rows = conn.execute(
                 SQL_SELECT_COMPLETED_VERSION_NAMES,
                 (self._VERSION_STATE_COMPLETED,),
@@ -223,7 +489,7 @@ class SqliteBackupDatabase(BackupDatabase):
         return [str(row["name"]) for row in rows]
 
     async def most_recent_version(self) -> str | None:
-        with self._sqlite_db.connect() as conn:
+        with self._sqlite_db.connection() as conn:
             row = conn.execute(
                 SQL_SELECT_MOST_RECENT_COMPLETED_VERSION,
                 (self._VERSION_STATE_COMPLETED,),
@@ -233,7 +499,7 @@ class SqliteBackupDatabase(BackupDatabase):
         return str(row["name"])
 
     async def get_version_by_name(self, name: str) -> str:
-        with self._sqlite_db.connect() as conn:
+        with self._sqlite_db.connection() as conn:
             row = conn.execute(
                 SQL_SELECT_COMPLETED_VERSION_BY_NAME,
                 (name, self._VERSION_STATE_COMPLETED),
@@ -243,7 +509,15 @@ class SqliteBackupDatabase(BackupDatabase):
         return str(row["name"])
 
     async def list_files(self, version: str) -> AsyncGenerator[FileEntry, None]:
-        with self._sqlite_db.connect() as conn:
+        """Yield the version's files, then its directories, in insertion order.
+
+        Rows are read in keyset pages (``id > last_id LIMIT page_size``) on the
+        ``(version_name, id)`` indexes. Each page is fetched and its cursor
+        finished before anything is yielded, so memory stays bounded by the page
+        size and no statement stays open on the shared connection while the
+        consumer awaits (which could otherwise interleave with writes on it).
+        """
+        with self._sqlite_db.connection() as conn:
             version_row = conn.execute(
                 "SELECT name FROM versions WHERE name = ? AND state = ?",
                 (version, self._VERSION_STATE_COMPLETED),
@@ -251,16 +525,9 @@ class SqliteBackupDatabase(BackupDatabase):
             if version_row is None:
                 raise VersionNotFoundError(version)
 
-            file_rows = conn.execute(
-                SQL_SELECT_FILES_BY_VERSION,
-                (version,),
-            ).fetchall()
-            dir_rows = conn.execute(
-                SQL_SELECT_DIRECTORIES_BY_VERSION,
-                (version,),
-            ).fetchall()
-
-        for row in file_rows:
+        async for row in self._iter_version_rows(
+            SQL_SELECT_FILES_PAGE_BY_VERSION, version
+        ):
             restore_path = Path(str(row["restore_path"]))
             yield FileEntry(
                 path=restore_path,
@@ -270,10 +537,14 @@ class SqliteBackupDatabase(BackupDatabase):
                 is_directory=False,
                 hash=str(row["hash_digest"]),
                 stored_location=str(row["storage_location"]),
-                is_compressed=str(row["compression"]) == self._COMPRESSION_ZIP,
+                is_compressed=str(row["compression"]) != COMPRESSION_NONE,
+                hash_algorithm=str(row["hash_algorithm"]),
+                compression=str(row["compression"]),
             )
 
-        for row in dir_rows:
+        async for row in self._iter_version_rows(
+            SQL_SELECT_DIRECTORIES_PAGE_BY_VERSION, version
+        ):
             restore_path = Path(str(row["restore_path"]))
             yield FileEntry(
                 path=restore_path,
@@ -283,8 +554,27 @@ class SqliteBackupDatabase(BackupDatabase):
                 is_directory=True,
             )
 
+    async def _iter_version_rows(
+        self, page_query: str, version: str
+    ) -> AsyncGenerator[sqlite3.Row, None]:
+        last_id = 0
+        while True:
+            with self._sqlite_db.connection() as conn:
+                cursor = conn.execute(
+                    page_query, (version, last_id, self._list_page_size)
+                )
+                try:
+                    rows = cursor.fetchmany(self._list_page_size)
+                finally:
+                    cursor.close()
+            for row in rows:
+                yield row
+            if len(rows) < self._list_page_size:
+                return
+            last_id = int(rows[-1]["id"])
+
     async def create_version(self, version: str) -> None:
-        with self._sqlite_db.connect() as conn:
+        with self._sqlite_db.connection() as conn:
             try:
                 conn.execute(
                     SQL_INSERT_VERSION,
@@ -295,7 +585,7 @@ class SqliteBackupDatabase(BackupDatabase):
             conn.commit()
 
     async def complete_version(self, version: str) -> None:
-        with self._sqlite_db.connect() as conn:
+        with self._sqlite_db.connection() as conn:
             completed_row = conn.execute(
                 "SELECT 1 FROM versions WHERE name = ? AND state = ?",
                 (version, self._VERSION_STATE_COMPLETED),
@@ -316,35 +606,53 @@ class SqliteBackupDatabase(BackupDatabase):
             )
             conn.commit()
 
+            if self._hash_index is not None:
+                # The version's blobs are now visible to hash lookups.
+                self._index_hash_rows(
+                    self._hash_index,
+                    conn.execute(SQL_SELECT_FILES_BY_VERSION, (version,)),
+                )
+
     async def add_file(self, version: str, entry: BackedUpFileEntry) -> None:
-        with self._sqlite_db.connect() as conn:
-            self._require_pending_version(conn, version)
+        await self.add_files(version, (entry,))
+
+    async def add_files(
+        self, version: str, entries: Sequence[BackedUpFileEntry]
+    ) -> None:
+        """Insert ``entries`` with one connection and one transaction."""
+        if not entries:
+            return
 
+        directory_rows: list[tuple[str, str]] = []
+        file_rows: list[tuple[str, str, str, str, str, str, int, float]] = []
+        for entry in entries:
             if entry.source_file.is_directory:
-                conn.execute(
-                    SQL_INSERT_DIRECTORY,
-                    (version, str(entry.source_file.relative_path)),
-                )
-                conn.commit()
-                return
+                directory_rows.append((version, str(entry.source_file.relative_path)))
+            else:
+                file_rows.append(self._file_row(version, entry))
 
-            conn.execute(
-                SQL_INSERT_FILE,
-                (
-                    version,
-                    str(entry.source_file.relative_path),
-                    self._DEFAULT_HASH_ALGORITHM,
-                    entry.hash,
-                    entry.stored_location,
-                    self._COMPRESSION_ZIP
-                    if entry.is_compressed
-                    else self._COMPRESSION_NONE,
-                    entry.source_file.size,
-                    entry.source_file.mtime,
-                ),
-            )
+        with self._sqlite_db.connection() as conn:
+            self._require_pending_version(conn, version)
+            if directory_rows:
+                conn.executemany(SQL_INSERT_DIRECTORY, directory_rows)
+            if file_rows:
+                conn.executemany(SQL_INSERT_FILE, file_rows)
             conn.commit()
 
+    def _file_row(
+        self, version: str, entry: BackedUpFileEntry
+    ) -> tuple[str, str, str, str, str, str, int, float]:
+        return (
+            version,
+            str(entry.source_file.relative_path),
+            entry.hash_algorithm,
+            entry.hash,
+            entry.stored_location,
+            resolve_compression(entry.is_compressed, entry.compression),
+            entry.source_file.size,
+            entry.source_file.mtime,
+        )
+
     def _require_pending_version(self, conn: sqlite3.Connection, version: str) -> None:
         pending_row = conn.execute(
             "SELECT 1 FROM versions WHERE name = ? AND state = ?",
@@ -362,24 +670,112 @@ class SqliteBackupDatabase(BackupDatabase):
 
         raise VersionNotFoundError(version)
 
-    async def get_files_by_hash(self, hash: str) -> list[BackedUpFileEntry]:
-        with self._sqlite_db.connect() as conn:
+    async def get_files_by_hash(
+        self, hash: str, hash_algorithm: str = DEFAULT_HASH_ALGORITHM
+    ) -> list[BackedUpFileEntry]:
+        if self._hash_index is not None:
+            indexed = self._hash_index.get((hash_algorithm, hash))
+            if indexed is None:
+                return []
+            restore_path, indexed_file = indexed
+            return [
+                self._indexed_to_backed_up_file_entry(Path(restore_path), indexed_file)
+            ]
+        with self._sqlite_db.connection() as conn:
             rows = conn.execute(
                 SQL_SELECT_FILES_BY_HASH,
                 (
                     self._VERSION_STATE_COMPLETED,
-                    self._DEFAULT_HASH_ALGORITHM,
+                    hash_algorithm,
                     hash,
                 ),
             ).fetchall()
         return [self._row_to_backed_up_file_entry(row) for row in rows]
 
+    async def preload_hash_index(self) -> None:
+        """Index every content hash in completed versions, keeping its first row.
+
+        Afterwards, :meth:`get_files_by_hash` is answered from memory: unknown
+        hashes return ``[]`` without a query and known ones return the earliest
+        matching row only. Versions completed through this instance are merged in.
+        """
+        index: dict[tuple[str, str], tuple[str, _IndexedFile]] = {}
+        with self._sqlite_db.connection() as conn:
+            self._index_hash_rows(
+                index,
+                conn.execute(
+                    SQL_SELECT_COMPLETED_FILES, (self._VERSION_STATE_COMPLETED,)
+                ),
+            )
+        self._hash_index = index
+
+    @classmethod
+    def _index_hash_rows(
+        cls,
+        index: dict[tuple[str, str], tuple[str, _IndexedFile]],
+        rows: Iterable[sqlite3.Row],
+    ) -> None:
+        for row in rows:
+            indexed = cls._indexed_file(row)
+            index.setdefault(
+                (indexed.hash_algorithm, indexed.hash_digest),
+                (str(row["restore_path"]), indexed),
+            )
+
+    async def preload_metadata_index(self) -> None:
+        """Index the most recent completed version's files by restore path.
+
+        Afterwards, :meth:`get_files_by_metadata` answers matches against that
+        version from memory and only queries SQLite on a miss, so results for
+        paths that changed or only exist in older versions are unaffected.
+        """
+        index: dict[str, _IndexedFile] = {}
+        version = await self.most_recent_version()
+        if version is not None:
+            with self._sqlite_db.connection() as conn:
+                for row in conn.execute(SQL_SELECT_FILES_BY_VERSION, (version,)):
+                    index.setdefault(str(row["restore_path"]), self._indexed_file(row))
+        self._metadata_index = index
+
+    async def load_compression_ratios(self) -> dict[str, CompressionRatio]:
+        with self._sqlite_db.connection() as conn:
+            rows = conn.execute(SQL_SELECT_COMPRESSION_RATIOS).fetchall()
+        return {
+            str(row["extension"]): CompressionRatio(
+                samples=int(row["samples"]), ratio=float(row["ratio"])
+            )
+            for row in rows
+        }
+
+    async def save_compression_ratios(
+        self, ratios: Mapping[str, CompressionRatio]
+    ) -> None:
+        if not ratios:
+            return
+        with self._sqlite_db.connection() as conn:
+            conn.executemany(
+                SQL_UPSERT_COMPRESSION_RATIO,
+                (
+                    (extension, ratio.samples, ratio.ratio)
+                    for extension, ratio in ratios.items()
+                ),
+            )
+            conn.commit()
+
     async def get_files_by_metadata(
         self, relative_path: Path, mtime: float, size: int
     ) -> list[BackedUpFileEntry]:
         lower_bound = mtime - self._MTIME_TOLERANCE_SECONDS
         upper_bound = mtime + self._MTIME_TOLERANCE_SECONDS
-        with self._sqlite_db.connect() as conn:
+        if self._metadata_index is not None:
+            indexed = self._metadata_index.get(str(relative_path))
+            if (
+                indexed is not None
+                and indexed.size == size
+                and lower_bound <= indexed.mtime <= upper_bound
+            ):
+                return [self._indexed_to_backed_up_file_entry(relative_path, indexed)]
+        with self._sqlite_db.connection() as conn:
             rows = conn.execute(
                 SQL_SELECT_FILES_BY_METADATA,
                 (
@@ -393,20 +789,39 @@ class SqliteBackupDatabase(BackupDatabase):
         return [self._row_to_backed_up_file_entry(row) for row in rows]
 
     def _row_to_backed_up_file_entry(self, row: sqlite3.Row) -> BackedUpFileEntry:
-        restore_path = Path(str(row["restore_path"]))
+        return self._indexed_to_backed_up_file_entry(
+            Path(str(row["restore_path"])), self._indexed_file(row)
+        )
+
+    @staticmethod
+    def _indexed_file(row: sqlite3.Row) -> _IndexedFile:
+        return _IndexedFile(
+            size=int(row["size"]),
+            mtime=float(row["mtime"]),
+            hash_algorithm=str(row["hash_algorithm"]),
+            hash_digest=str(row["hash_digest"]),
+            storage_location=str(row["storage_location"]),
+            compression=str(row["compression"]),
+        )
+
+    def _indexed_to_backed_up_file_entry(
+        self, restore_path: Path, indexed: _IndexedFile
+    ) -> BackedUpFileEntry:
         file_entry = FileEntry(
             path=restore_path,
             relative_path=restore_path,
-            size=int(row["size"]),
-            mtime=float(row["mtime"]),
+            size=indexed.size,
+            mtime=indexed.mtime,
             is_directory=False,
         )
         return BackedUpFileEntry(
             source_file=file_entry,
-            backup_id=self._generate_uuid_from_hash(str(row["hash_digest"])),
-            stored_location=str(row["storage_location"]),
-            is_compressed=str(row["compression"]) == self._COMPRESSION_ZIP,
-            hash=str(row["hash_digest"]),
+            backup_id=self._generate_uuid_from_hash(indexed.hash_digest),
+            stored_location=indexed.storage_location,
+            is_compressed=indexed.compression != COMPRESSION_NONE,
+            hash=indexed.hash_digest,
+            hash_algorithm=indexed.hash_algorithm,
+            compression=indexed.compression,
         )
 
     def _generate_uuid_from_hash(self, hash_value: str) -> UUID:
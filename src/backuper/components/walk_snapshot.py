@@ -0,0 +1,166 @@
+"""Persisted directory listings used to skip re-listing unchanged source directories.
+
+A directory's mtime changes whenever an entry is created, removed, or renamed in
+it, but not when a child file's contents change. The snapshot therefore records,
+per walked directory, its inode and ``st_mtime_ns`` alongside the names and kinds
+of its children. When both still match, the walker can reuse the child names and
+only ``stat`` each child for fresh size and mtime.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+from collections.abc import Mapping
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+
+_SNAPSHOT_FORMAT = "1"
+_KIND_FILE = "f"
+_KIND_DIRECTORY = "d"
+_KIND_SYMLINKED_DIRECTORY = "l"
+
+_SQL_CREATE_META = "CREATE TABLE meta(key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+_SQL_CREATE_DIRECTORIES = """
+CREATE TABLE directories(
+    path BLOB PRIMARY KEY,
+    inode INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    children TEXT NOT NULL
+)
+"""
+_SQL_SELECT_META = "SELECT key, value FROM meta"
+_SQL_SELECT_DIRECTORIES = "SELECT path, inode, mtime_ns, children FROM directories"
+_SQL_INSERT_META = "INSERT INTO meta(key, value) VALUES (?, ?)"
+_SQL_INSERT_DIRECTORY = """
+INSERT INTO directories(path, inode, mtime_ns, children) VALUES (?, ?, ?, ?)
+"""
+
+
+@dataclass(frozen=True)
+class SnapshotChild:
+    name: str
+    is_directory: bool
+    is_symlink: bool = False
+
+
+@dataclass(frozen=True)
+class SnapshotDirectory:
+    inode: int
+    mtime_ns: int
+    children: tuple[SnapshotChild, ...]
+
+    def matches(self, directory_stat: os.stat_result) -> bool:
+        return (
+            self.inode == directory_stat.st_ino
+            and self.mtime_ns == directory_stat.st_mtime_ns
+        )
+
+
+class DirectorySnapshotStore:
+    """Load and atomically replace the snapshot file for one source root.
+
+    Keys are source-relative POSIX paths (``"."`` for the root). A snapshot taken
+    from a different source root, or one that cannot be read, loads as empty so
+    the walk simply lists every directory again.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._logger = logging.getLogger(__name__)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def load(self, source_root: Path) -> dict[str, SnapshotDirectory]:
+        if not self._path.exists():
+            return {}
+        try:
+            with closing(sqlite3.connect(self._path)) as conn:
+                meta = dict(conn.execute(_SQL_SELECT_META).fetchall())
+                if meta.get("format") != _SNAPSHOT_FORMAT or meta.get(
+                    "source_root"
+                ) != str(source_root):
+                    return {}
+                return {
+                    os.fsdecode(path): SnapshotDirectory(
+                        inode=int(inode),
+                        mtime_ns=int(mtime_ns),
+                        children=_decode_children(children),
+                    )
+                    for path, inode, mtime_ns, children in conn.execute(
+                        _SQL_SELECT_DIRECTORIES
+                    )
+                }
+        except (sqlite3.Error, ValueError) as exc:
+            self._logger.warning(
+                "Ignoring unreadable walk snapshot %s: %s", self._path, exc
+            )
+            return {}
+
+    def save(
+        self, source_root: Path, directories: Mapping[str, SnapshotDirectory]
+    ) -> None:
+        """Replace the snapshot; failures are logged since it is only a cache."""
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        staging = self._path.with_name(f"{self._path.name}.tmp")
+        staging.unlink(missing_ok=True)
+        try:
+            with closing(sqlite3.connect(staging)) as conn:
+                conn.execute(_SQL_CREATE_META)
+                conn.execute(_SQL_CREATE_DIRECTORIES)
+                conn.executemany(
+                    _SQL_INSERT_META,
+                    (("format", _SNAPSHOT_FORMAT), ("source_root", str(source_root))),
+                )
+                conn.executemany(
+                    _SQL_INSERT_DIRECTORY,
+                    (
+                        (
+                            os.fsencode(path),
+                            directory.inode,
+                            directory.mtime_ns,
+                            _encode_children(directory.children),
+                        )
+                        for path, directory in directories.items()
+                    ),
+                )
+                conn.commit()
+            os.replace(staging, self._path)
+        except (OSError, sqlite3.Error, ValueError) as exc:
+            staging.unlink(missing_ok=True)
+            self._logger.warning(
+                "Could not write walk snapshot %s: %s", self._path, exc
+            )
+
+
+def _encode_children(children: tuple[SnapshotChild, ...]) -> str:
+    return json.dumps(
+        [[child.name, _child_kind(child)] for child in children],
+        separators=(",", ":"),
+    )
+
+
+def _child_kind(child: SnapshotChild) -> str:
+    if not child.is_directory:
+        return _KIND_FILE
+    return _KIND_SYMLINKED_DIRECTORY if child.is_symlink else _KIND_DIRECTORY
+
+
+def _decode_children(raw: str) -> tuple[SnapshotChild, ...]:
+    children = []
+    for name, kind in json.loads(raw):
+        if kind not in (_KIND_FILE, _KIND_DIRECTORY, _KIND_SYMLINKED_DIRECTORY):
+            raise ValueError(f"unknown snapshot entry kind {kind!r}")
+        children.append(
+            SnapshotChild(
+                name=str(name),
+                is_directory=kind != _KIND_FILE,
+                is_symlink=kind == _KIND_SYMLINKED_DIRECTORY,
+            )
+        )
+    return tuple(children)
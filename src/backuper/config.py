@@ -4,6 +4,38 @@ from dataclasses import dataclass, field
 ZIPFILE_EXT = ".zip"
 ZIP_ENABLED = True
 HASHING_BUFFER_SIZE = 52428800  # 50mb
+HASHING_CHUNK_SIZE = 1048576  # 1mb read buffer for full-file hash algorithms
+# Values recorded in version_files.hash_algorithm. "sha1" is the historical digest
+# of the first HASHING_BUFFER_SIZE bytes; "blake2b" is BLAKE2b-256 over the whole file.
+HASH_ALGORITHM_SHA1 = "sha1"
+HASH_ALGORITHM_BLAKE2B = "blake2b"
+HASH_ALGORITHMS = (HASH_ALGORITHM_SHA1, HASH_ALGORITHM_BLAKE2B)
+DEFAULT_HASH_ALGORITHM = HASH_ALGORITHM_SHA1
+COPY_BUFFER_SIZE = 1048576  # 1mb
+# Values recorded in version_files.compression. "zip" is a ZIP container with one
+# deflated member; "zlib", "lzma" and "bz2" are bare compressed streams.
+COMPRESSION_NONE = "none"
+COMPRESSION_ZIP = "zip"
+COMPRESSION_ZLIB = "zlib"
+COMPRESSION_LZMA = "lzma"
+COMPRESSION_BZ2 = "bz2"
+COMPRESSION_CODECS = (
+    COMPRESSION_ZIP,
+    COMPRESSION_ZLIB,
+    COMPRESSION_LZMA,
+    COMPRESSION_BZ2,
+)
+COMPRESSION_EXTENSIONS = {
+    COMPRESSION_ZIP: ZIPFILE_EXT,
+    COMPRESSION_ZLIB: ".zz",
+    COMPRESSION_LZMA: ".xz",
+    COMPRESSION_BZ2: ".bz2",
+}
+DEFAULT_COMPRESSION_CODEC = COMPRESSION_ZIP
+COMPRESSION_LEVELS = range(1, 10)  # deflate/zlib/bz2 levels and lzma presets
+COMPRESSION_PROBE_SAMPLE_SIZE = 65536  # bytes the compressibility probe deflates
+COMPRESSION_PROBE_MAX_RATIO = 0.9  # compress when the probe shrinks data at least this
+COMPRESSION_LEARN_MIN_SAMPLES = 8  # probes before an extension's mean ratio is trusted
 ZIP_SKIP_EXTENSIONS = {
     ".mp3",
     ".ogg",
@@ -32,6 +64,14 @@ ZIP_SKIP_EXTENSIONS = {
     ".tar.xz",
 }
 ZIP_MIN_FILESIZE_IN_BYTES = 1024  # 1KB
+MANIFEST_WRITE_BATCH_SIZE = 1000  # manifest rows per add_files transaction
+MANIFEST_LIST_PAGE_SIZE = 1000  # manifest rows per list_files keyset page
+BACKUP_STREAM_QUEUE_SIZE = 1000  # analyzed entries buffered in streaming backups
+PUT_CONCURRENCY = 4  # blobs written concurrently by FileStore.put_many
+INLINE_LOCATION_PREFIX = "inline:"  # storage_location of blobs kept in the manifest
+PACKS_DIR = "packs"  # under the backup data directory
+PACK_TARGET_SIZE = 67108864  # 64mb; a pack is sealed once it reaches this size
+WALK_SNAPSHOT_FILENAME = "walk_snapshot.sqlite3"  # next to the manifest database
 
 
 BACKUPER_SQLITE_SYNCHRONOUS_ENV = "BACKUPER_SQLITE_SYNCHRONOUS"
@@ -91,3 +131,11 @@ class FilestoreConfig:
     zip_enabled: bool = ZIP_ENABLED
     zip_min_filesize_in_bytes: int = ZIP_MIN_FILESIZE_IN_BYTES
     zip_skip_extensions: set[str] = field(default_factory=lambda: ZIP_SKIP_EXTENSIONS)
+    put_concurrency: int = PUT_CONCURRENCY
+    hash_algorithm: str = DEFAULT_HASH_ALGORITHM
+    compression_codec: str = DEFAULT_COMPRESSION_CODEC
+    compression_level: int | None = None  # None: the codec's own default
+    compression_probe: bool = False  # sample files instead of zip_skip_extensions
+    pack_threshold: int = 0  # files smaller than this go into pack files; 0: off
+    pack_target_size: int = PACK_TARGET_SIZE
+    inline_threshold: int = 0  # files smaller than this go into the manifest; 0: off
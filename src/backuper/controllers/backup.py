@@ -1,11 +1,19 @@
-from collections.abc import AsyncIterator
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator, Callable
 from pathlib import Path
 from uuid import uuid4
 
+from backuper.config import (
+    BACKUP_STREAM_QUEUE_SIZE,
+    DEFAULT_HASH_ALGORITHM,
+    MANIFEST_WRITE_BATCH_SIZE,
+)
 from backuper.models import (
     AnalyzedFileEntry,
     BackedUpFileEntry,
     BackupAnalysisSummaryAccumulator,
+    PutRequest,
     VersionAlreadyExistsError,
 )
 from backuper.ports import (
@@ -15,6 +23,20 @@ from backuper.ports import (
     FileReader,
     FileStore,
 )
+from backuper.utils.stats import (
+    COUNTER_BLOBS_PUT,
+    COUNTER_BYTES_PUT,
+    COUNTER_MANIFEST_ROWS,
+    PHASE_BLOB_PUT,
+    PHASE_DB_LOOKUP,
+    PHASE_MANIFEST_INSERT,
+    BackupStats,
+    increment,
+    measure,
+)
+
+# Streaming mode: one running summary per this many stored files.
+_RUNNING_SUMMARY_INTERVAL_FILES = 1000
 
 
 async def _iterate_analyzed_entries(
@@ -39,6 +61,9 @@ async def new_backup(
     db: BackupDatabase,
     filestore: FileStore,
     reporter: AnalysisReporter,
+    manifest_batch_size: int = MANIFEST_WRITE_BATCH_SIZE,
+    streaming: bool = False,
+    stats: BackupStats | None = None,
 ) -> None:
     versions = await db.list_versions()
     if version not in versions:
@@ -51,6 +76,9 @@ async def new_backup(
         db=db,
         filestore=filestore,
         reporter=reporter,
+        manifest_batch_size=manifest_batch_size,
+        streaming=streaming,
+        stats=stats,
     )
 
 
@@ -63,10 +91,19 @@ async def add_version(
     db: BackupDatabase,
     filestore: FileStore,
     reporter: AnalysisReporter,
+    manifest_batch_size: int = MANIFEST_WRITE_BATCH_SIZE,
+    streaming: bool = False,
+    preload_metadata: bool = False,
+    preload_hashes: bool = False,
+    stats: BackupStats | None = None,
 ) -> None:
     versions = await db.list_versions()
     if version in versions:
         raise VersionAlreadyExistsError(version)
+    if preload_metadata:
+        await db.preload_metadata_index()
+    if preload_hashes:
+        await db.preload_hash_index()
     await db.create_version(version)
     await _run_backup_stream(
         source,
@@ -76,6 +113,9 @@ async def add_version(
         db=db,
         filestore=filestore,
         reporter=reporter,
+        manifest_batch_size=manifest_batch_size,
+        streaming=streaming,
+        stats=stats,
     )
 
 
@@ -88,14 +128,64 @@ async def _run_backup_stream(
     db: BackupDatabase,
     filestore: FileStore,
     reporter: AnalysisReporter,
+    manifest_batch_size: int = MANIFEST_WRITE_BATCH_SIZE,
+    streaming: bool = False,
+    stats: BackupStats | None = None,
+) -> None:
+    if manifest_batch_size < 1:
+        raise ValueError(
+            f"manifest_batch_size must be at least 1, got {manifest_batch_size}"
+        )
+    filestore.seed_compression_ratios(await db.load_compression_ratios())
+    acc = BackupAnalysisSummaryAccumulator()
+    reporter.report_analysis_start()
+    if streaming:
+        await _run_streaming_backup(
+            source,
+            version,
+            acc,
+            file_reader=file_reader,
+            analyzer=analyzer,
+            db=db,
+            filestore=filestore,
+            reporter=reporter,
+            manifest_batch_size=manifest_batch_size,
+            stats=stats,
+        )
+    else:
+        await _run_buffered_backup(
+            source,
+            version,
+            acc,
+            file_reader=file_reader,
+            analyzer=analyzer,
+            db=db,
+            filestore=filestore,
+            reporter=reporter,
+            manifest_batch_size=manifest_batch_size,
+            stats=stats,
+        )
+    await db.complete_version(version)
+    await db.save_compression_ratios(filestore.learned_compression_ratios())
+
+
+async def _run_buffered_backup(
+    source: Path,
+    version: str,
+    acc: BackupAnalysisSummaryAccumulator,
+    *,
+    file_reader: FileReader,
+    analyzer: BackupAnalyzer,
+    db: BackupDatabase,
+    filestore: FileStore,
+    reporter: AnalysisReporter,
+    manifest_batch_size: int,
+    stats: BackupStats | None,
 ) -> None:
     # Stream analysis in walk order: accumulate counts and buffer entries, then
     # report_analysis_summary once before the backup leg. File progress uses
     # total_files == summary.num_files (0-based indices for non-directories).
-    acc = BackupAnalysisSummaryAccumulator()
     analyzed_in_order: list[AnalyzedFileEntry] = []
-    reporter.report_analysis_start()
-
     async for entry in _iterate_analyzed_entries(
         source, file_reader=file_reader, analyzer=analyzer, db=db
     ):
@@ -111,24 +201,188 @@ async def _run_backup_stream(
     # (which would report every file). Integer ceil: (n + 99) // 100.
     progress_step = max(1, (total_files + 99) // 100)
 
+    def on_file(file_idx: int) -> None:
+        if file_idx % progress_step == 0:
+            reporter.report_file_progress(file_idx, total_files)
+
+    await _store_entries(
+        _iterate_list(analyzed_in_order),
+        version,
+        db=db,
+        filestore=filestore,
+        manifest_batch_size=manifest_batch_size,
+        on_file=on_file,
+        stats=stats,
+    )
+
+
+async def _run_streaming_backup(
+    source: Path,
+    version: str,
+    acc: BackupAnalysisSummaryAccumulator,
+    *,
+    file_reader: FileReader,
+    analyzer: BackupAnalyzer,
+    db: BackupDatabase,
+    filestore: FileStore,
+    reporter: AnalysisReporter,
+    manifest_batch_size: int,
+    stats: BackupStats | None,
+) -> None:
+    # Analysis feeds a bounded queue that the backup leg drains concurrently, so
+    # memory stays flat and blob copies start before the walk finishes. The total
+    # file count is unknown until analysis ends, so progress is a running summary.
+    queue: asyncio.Queue[AnalyzedFileEntry | None] = asyncio.Queue(
+        maxsize=BACKUP_STREAM_QUEUE_SIZE
+    )
+
+    async def produce() -> None:
+        try:
+            async for entry in _iterate_analyzed_entries(
+                source, file_reader=file_reader, analyzer=analyzer, db=db
+            ):
+                acc.consume(entry)
+                reporter.report(entry)
+                await queue.put(entry)
+        except Exception:
+            await queue.put(None)
+            raise
+        reporter.report_analysis_summary(acc.to_summary(version))
+        await queue.put(None)
+
+    async def drain() -> AsyncIterator[AnalyzedFileEntry]:
+        while (entry := await queue.get()) is not None:
+            yield entry
+
+    def on_file(file_idx: int) -> None:
+        if file_idx % _RUNNING_SUMMARY_INTERVAL_FILES == 0:
+            reporter.report_running_summary(acc.to_summary(version), file_idx)
+
+    producer = asyncio.create_task(produce())
+    try:
+        await _store_entries(
+            drain(),
+            version,
+            db=db,
+            filestore=filestore,
+            manifest_batch_size=manifest_batch_size,
+            on_file=on_file,
+            stats=stats,
+        )
+        await producer
+    finally:
+        if not producer.done():
+            producer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await producer
+
+
+async def _iterate_list(
+    entries: list[AnalyzedFileEntry],
+) -> AsyncIterator[AnalyzedFileEntry]:
+    for entry in entries:
+        yield entry
+
+
+async def _store_entries(
+    entries: AsyncIterator[AnalyzedFileEntry],
+    version: str,
+    *,
+    db: BackupDatabase,
+    filestore: FileStore,
+    manifest_batch_size: int,
+    on_file: Callable[[int], None],
+    stats: BackupStats | None = None,
+) -> None:
+    """Store blobs and write manifest rows in walk order, one batch per transaction.
+
+    ``on_file`` receives the 0-based index of each non-directory entry when it
+    joins a batch.
+    """
     file_idx = 0
-    for entry in analyzed_in_order:
+    pending: list[AnalyzedFileEntry] = []
+    async for entry in entries:
         if not entry.source_file.is_directory:
-            if file_idx % progress_step == 0:
-                reporter.report_file_progress(file_idx, total_files)
+            on_file(file_idx)
             file_idx += 1
-        backup_entry = await _to_backed_up_entry(entry, db=db, filestore=filestore)
-        await db.add_file(version, backup_entry)
+        pending.append(entry)
+        if len(pending) >= manifest_batch_size:
+            await _write_batch(
+                pending, version, db=db, filestore=filestore, stats=stats
+            )
+            pending = []
+    if pending:
+        await _write_batch(pending, version, db=db, filestore=filestore, stats=stats)
 
-    await db.complete_version(version)
+
+async def _write_batch(
+    entries: list[AnalyzedFileEntry],
+    version: str,
+    *,
+    db: BackupDatabase,
+    filestore: FileStore,
+    stats: BackupStats | None,
+) -> None:
+    backed_up = await _to_backed_up_entries(
+        entries, db=db, filestore=filestore, stats=stats
+    )
+    with measure(stats, PHASE_MANIFEST_INSERT):
+        await db.add_files(version, backed_up)
+    increment(stats, COUNTER_MANIFEST_ROWS, len(backed_up))
+
+
+async def _to_backed_up_entries(
+    entries: list[AnalyzedFileEntry],
+    *,
+    db: BackupDatabase,
+    filestore: FileStore,
+    stats: BackupStats | None = None,
+) -> list[BackedUpFileEntry]:
+    """Resolve a batch in order; blobs that must be written go through one put_many."""
+    resolved = [
+        await _to_backed_up_entry(entry, db=db, stats=stats) for entry in entries
+    ]
+    to_put = [entry for entry, done in zip(entries, resolved) if done is None]
+    with measure(stats, PHASE_BLOB_PUT):
+        put_results = iter(
+            await filestore.put_many(
+                [
+                    PutRequest(
+                        origin_file=entry.source_file.path,
+                        restore_path=entry.source_file.relative_path,
+                        precomputed_hash=entry.hash,
+                        hash_algorithm=entry.hash_algorithm,
+                    )
+                    for entry in to_put
+                ]
+            )
+        )
+    increment(stats, COUNTER_BLOBS_PUT, len(to_put))
+    increment(stats, COUNTER_BYTES_PUT, sum(entry.source_file.size for entry in to_put))
+    backed_up: list[BackedUpFileEntry] = []
+    for entry, done in zip(entries, resolved):
+        if done is None:
+            stored = next(put_results)
+            done = BackedUpFileEntry(
+                source_file=entry.source_file,
+                backup_id=uuid4(),
+                stored_location=stored.stored_location,
+                is_compressed=stored.is_compressed,
+                hash=stored.hash,
+                hash_algorithm=stored.hash_algorithm,
+                compression=stored.compression,
+            )
+        backed_up.append(done)
+    return backed_up
 
 
 async def _to_backed_up_entry(
     entry: AnalyzedFileEntry,
     *,
     db: BackupDatabase,
-    filestore: FileStore,
-) -> BackedUpFileEntry:
+    stats: BackupStats | None = None,
+) -> BackedUpFileEntry | None:
+    """Manifest row for directories and known blobs; ``None`` when a put is needed."""
     source_file = entry.source_file
 
     if source_file.is_directory:
@@ -140,8 +394,28 @@ async def _to_backed_up_entry(
             hash="",
         )
 
+    if (
+        entry.already_backed_up
+        and entry.hash
+        and entry.stored_location
+        and entry.backup_id is not None
+    ):
+        return BackedUpFileEntry(
+            source_file=source_file,
+            backup_id=entry.backup_id,
+            stored_location=entry.stored_location,
+            is_compressed=entry.is_compressed,
+            hash=entry.hash,
+            hash_algorithm=entry.hash_algorithm or DEFAULT_HASH_ALGORITHM,
+            compression=entry.compression,
+        )
+
     if entry.already_backed_up and entry.hash:
-        matches = await db.get_files_by_hash(entry.hash)
+        # Analyzers that do not carry the matched blob: look it up.
+        with measure(stats, PHASE_DB_LOOKUP):
+            matches = await db.get_files_by_hash(
+                entry.hash, entry.hash_algorithm or DEFAULT_HASH_ALGORITHM
+            )
         if matches:
             matched = matches[0]
             return BackedUpFileEntry(
@@ -150,13 +424,8 @@ async def _to_backed_up_entry(
                 stored_location=matched.stored_location,
                 is_compressed=matched.is_compressed,
                 hash=matched.hash,
+                hash_algorithm=matched.hash_algorithm,
+                compression=matched.compression,
             )
 
-    stored = filestore.put(source_file.path, source_file.relative_path, entry.hash)
-    return BackedUpFileEntry(
-        source_file=source_file,
-        backup_id=uuid4(),
-        stored_location=stored.stored_location,
-        is_compressed=stored.is_compressed,
-        hash=stored.hash,
-    )
+    return None
@@ -1,14 +1,18 @@
+import asyncio
 import logging
-from collections.abc import Callable
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from backuper.commands import RestoreCommand
 from backuper.models import (
+    FileEntry,
     RestorePathError,
     RestoreVersionNotFoundError,
     VersionNotFoundError,
 )
 from backuper.ports import BackupDatabase, FileStore
+from backuper.utils.file_copy import copy_stream
 
 _logger = logging.getLogger(__name__)
 
@@ -27,6 +31,20 @@ def _resolved_path_under_destination(destination: Path, relative_path: Path) ->
     return candidate
 
 
+def _restore_file(filestore: FileStore, entry: FileEntry, restore_path: Path) -> None:
+    assert entry.hash is not None
+    with (
+        filestore.open_blob(
+            entry.hash,
+            is_compressed=entry.is_compressed,
+            compression=entry.compression,
+            stored_location=entry.stored_location,
+        ) as blob,
+        restore_path.open("wb") as restored,
+    ):
+        copy_stream(blob, restored)
+
+
 async def run_restore_flow(
     command: RestoreCommand,
     *,
@@ -34,6 +52,16 @@ async def run_restore_flow(
     filestore: FileStore,
     on_restore_file: Callable[[Path], None] | None = None,
 ) -> None:
+    """Restore ``command.version_name`` under ``command.destination``.
+
+    Manifest rows are streamed: each is validated as it arrives, its directory
+    is created on first use, and its contents are written by up to
+    ``command.jobs`` worker threads, so memory does not grow with the number of
+    files. ``on_restore_file`` is called in manifest order as each file is
+    scheduled.
+    """
+    if command.jobs < 1:
+        raise ValueError(f"jobs must be at least 1, got {command.jobs}")
     try:
         version_name = await db.get_version_by_name(command.version_name)
     except VersionNotFoundError as err:
@@ -41,32 +69,46 @@ async def run_restore_flow(
 
     destination = Path(command.destination)
     skipped_missing_hash = 0
+    created_directories: set[Path] = set()
 
-    async for entry in db.list_files(version_name):
-        restore_path = _resolved_path_under_destination(
-            destination, entry.relative_path
-        )
-        if entry.is_directory:
-            restore_path.mkdir(parents=True, exist_ok=True)
-            continue
-
-        file_hash = entry.hash
-        if not file_hash:
-            skipped_missing_hash += 1
-            _logger.warning(
-                "Skipping restore for %s: missing hash in version %s",
-                entry.relative_path,
-                version_name,
+    def make_directory(directory: Path) -> None:
+        if directory not in created_directories:
+            directory.mkdir(parents=True, exist_ok=True)
+            created_directories.add(directory)
+
+    async def files_to_restore() -> AsyncIterator[tuple[FileEntry, Path]]:
+        nonlocal skipped_missing_hash
+        async for entry in db.list_files(version_name):
+            restore_path = _resolved_path_under_destination(
+                destination, entry.relative_path
             )
-            continue
+            if entry.is_directory:
+                make_directory(restore_path)
+                continue
 
-        restore_path.parent.mkdir(parents=True, exist_ok=True)
+            if not entry.hash:
+                skipped_missing_hash += 1
+                _logger.warning(
+                    "Skipping restore for %s: missing hash in version %s",
+                    entry.relative_path,
+                    version_name,
+                )
+                continue
 
-        if on_restore_file is not None:
-            on_restore_file(entry.relative_path)
+            make_directory(restore_path.parent)
+            yield entry, restore_path
 
-        restore_path.write_bytes(
-            filestore.read_blob(file_hash, is_compressed=entry.is_compressed)
+    if command.jobs == 1:
+        async for entry, restore_path in files_to_restore():
+            if on_restore_file is not None:
+                on_restore_file(entry.relative_path)
+            _restore_file(filestore, entry, restore_path)
+    else:
+        await _restore_files_concurrently(
+            files_to_restore(),
+            filestore=filestore,
+            jobs=command.jobs,
+            on_restore_file=on_restore_file,
         )
 
     if skipped_missing_hash:
@@ -74,3 +116,44 @@ async def run_restore_flow(
             "Skipped %d file(s) with missing hash during restore",
             skipped_missing_hash,
         )
+
+
+async def _restore_files_concurrently(
+    files: AsyncIterator[tuple[FileEntry, Path]],
+    *,
+    filestore: FileStore,
+    jobs: int,
+    on_restore_file: Callable[[Path], None] | None,
+) -> None:
+    """Write ``files`` on ``jobs`` threads, pulling the next only when one is free."""
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(
+        max_workers=jobs, thread_name_prefix="backuper-restore"
+    )
+    in_flight: set[asyncio.Future[None]] = set()
+    try:
+        async for entry, restore_path in files:
+            if len(in_flight) >= jobs:
+                done, in_flight = await asyncio.wait(
+                    in_flight, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    future.result()
+            if on_restore_file is not None:
+                on_restore_file(entry.relative_path)
+            in_flight.add(
+                loop.run_in_executor(
+                    executor, _restore_file, filestore, entry, restore_path
+                )
+            )
+        while in_flight:
+            done, in_flight = await asyncio.wait(
+                in_flight, return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                future.result()
+    finally:
+        for future in in_flight:
+            future.cancel()
+        await asyncio.gather(*in_flight, return_exceptions=True)
+        executor.shutdown(wait=True, cancel_futures=True)
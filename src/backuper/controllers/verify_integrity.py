@@ -1,6 +1,7 @@
 from pathlib import Path
 
 from backuper.commands import VerifyIntegrityCommand
+from backuper.config import COMPRESSION_CODECS
 from backuper.models import VersionNotFoundError
 from backuper.ports import BackupDatabase, FileStore
 
@@ -18,17 +19,21 @@ async def _missing_stored_files(
         loc = file_entry.stored_location
         if not loc:
             continue
-        primary_ok = filestore.exists(loc)
-        hash_ok = False
         h = file_entry.hash
+        primary_ok = (
+            filestore.stored_blob_exists(loc, h) if h else filestore.exists(loc)
+        )
+        hash_ok = False
         if not primary_ok and h:
-            hash_ok = filestore.blob_exists(h, True) or filestore.blob_exists(h, False)
+            hash_ok = filestore.blob_exists(h, False) or any(
+                filestore.blob_exists(h, True, codec) for codec in COMPRESSION_CODECS
+            )
         blob_ok = primary_ok or hash_ok
         if not primary_ok and hash_ok:
             errors.append(
                 f"Manifest metadata mismatch for {file_entry.relative_path} in "
                 f"{version}: stored_location {loc!r} is missing or inconsistent, but "
-                f"blob for hash {h} exists under raw or zipped layout "
+                f"blob for hash {h} exists under raw or compressed layout "
                 f"(stored metadata does not match on-disk path or compression)"
             )
         elif not blob_ok:
@@ -2,6 +2,7 @@ import argparse
 from datetime import datetime
 
 import backuper.commands as c
+from backuper import config
 
 
 def _default_name() -> str:
@@ -70,6 +71,207 @@ def with_user_ignore_args(parser: argparse.ArgumentParser) -> None:
     )
 
 
+def _positive_int(raw: str) -> int:
+    try:
+        value = int(raw, 10)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"expected an integer, got {raw!r}") from exc
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def _compression_level(raw: str) -> int:
+    value = _positive_int(raw)
+    if value not in config.COMPRESSION_LEVELS:
+        raise argparse.ArgumentTypeError(f"must be between 1 and 9, got {value}")
+    return value
+
+
+def with_hash_workers_arg(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--hash-workers",
+        dest="hash_workers",
+        type=_positive_int,
+        default=1,
+        metavar="N",
+        help="Number of threads hashing source files concurrently.\n"
+        "Defaults to 1 (sequential hashing).",
+    )
+
+
+def with_walk_workers_arg(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--walk-workers",
+        dest="walk_workers",
+        type=_positive_int,
+        default=1,
+        metavar="N",
+        help="Number of threads listing source directories concurrently.\n"
+        "Defaults to 1 (sequential walk).",
+    )
+
+
+def with_walk_snapshot_arg(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--walk-snapshot",
+        action="store_true",
+        dest="walk_snapshot",
+        help="Remember each source directory's listing next to the manifest and\n"
+        "reuse it on the next run for directories whose mtime is unchanged.",
+    )
+
+
+def with_put_workers_arg(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--put-workers",
+        dest="put_workers",
+        type=_positive_int,
+        default=config.PUT_CONCURRENCY,
+        metavar="N",
+        help="Maximum number of files copied into the backup concurrently.\n"
+        f"Defaults to {config.PUT_CONCURRENCY}.",
+    )
+
+
+def with_hash_algorithm_arg(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--hash-algorithm",
+        dest="hash_algorithm",
+        choices=config.HASH_ALGORITHMS,
+        default=config.DEFAULT_HASH_ALGORITHM,
+        help="Content hash for newly stored files.\n"
+        f"'{config.HASH_ALGORITHM_SHA1}' (default) hashes the first 50 MB and matches "
+        f"older backups; '{config.HASH_ALGORITHM_BLAKE2B}' hashes whole files.",
+    )
+
+
+def with_single_pass_arg(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--single-pass",
+        action="store_true",
+        dest="single_pass",
+        help="Hash new files while copying them into the backup instead of in a\n"
+        "separate read first, so each new file is read once. Duplicates are\n"
+        "detected from the blobs already stored rather than the manifest.",
+    )
+
+
+def with_compression_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--compression",
+        dest="compression",
+        choices=config.COMPRESSION_CODECS,
+        default=config.DEFAULT_COMPRESSION_CODEC,
+        help="Codec for newly stored compressible files.\n"
+        f"'{config.COMPRESSION_ZIP}' (default) writes deflated ZIP archives readable "
+        f"by older versions; '{config.COMPRESSION_ZLIB}', '{config.COMPRESSION_LZMA}' "
+        f"and '{config.COMPRESSION_BZ2}' write bare compressed streams.",
+    )
+    parser.add_argument(
+        "--compression-level",
+        dest="compression_level",
+        type=_compression_level,
+        default=None,
+        metavar="1-9",
+        help="Compression level (lzma preset) for newly stored files.\n"
+        "Defaults to the codec's own default.",
+    )
+    parser.add_argument(
+        "--compression-probe",
+        action="store_true",
+        dest="compression_probe",
+        help="Compress a sample of each candidate file and store it compressed only\n"
+        "if the sample shrinks enough, instead of skipping by extension. Ratios\n"
+        "are learned per extension and kept in the manifest.",
+    )
+
+
+def with_pack_threshold_arg(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--pack-threshold",
+        dest="pack_threshold",
+        type=_positive_int,
+        default=0,
+        metavar="BYTES",
+        help="Append new files smaller than BYTES to shared pack files instead of\n"
+        "storing each as its own file. Off by default.",
+    )
+
+
+def with_inline_threshold_arg(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--inline-threshold",
+        dest="inline_threshold",
+        type=_positive_int,
+        default=0,
+        metavar="BYTES",
+        help="Store new files smaller than BYTES inside the manifest database\n"
+        "instead of as separate files. Off by default.",
+    )
+
+
+def with_streaming_arg(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        dest="streaming",
+        help="Store files while the source is still being analyzed.\n"
+        "Keeps memory flat on large trees; progress is reported as a running "
+        "summary instead of percentages.",
+    )
+
+
+def with_stats_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        dest="stats",
+        help="Print per-phase timings, counts, throughput and cache hit rates\n"
+        "when the backup finishes.",
+    )
+    parser.add_argument(
+        "--stats-json",
+        action="store_true",
+        dest="stats_json",
+        help="Print the same statistics as a single JSON object on stdout;\n"
+        "everything else printed during the run goes to stderr.",
+    )
+
+
+def with_jobs_arg(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        dest="jobs",
+        type=_positive_int,
+        default=1,
+        metavar="N",
+        help="Number of files restored concurrently.\n"
+        "Defaults to 1 (sequential restore).",
+    )
+
+
+def with_preload_metadata_arg(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--preload-metadata",
+        action="store_true",
+        dest="preload_metadata",
+        help="Load the latest version's file metadata into memory up front so\n"
+        "unchanged files are matched without a database query each.",
+    )
+
+
+def with_preload_hashes_arg(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--preload-hashes",
+        action="store_true",
+        dest="preload_hashes",
+        help="Load every stored content hash into memory up front so content\n"
+        "deduplication checks never query the database.",
+    )
+
+
 def with_verify_integrity_version_arg(parser: argparse.ArgumentParser):
     parser.add_argument(
         *VERSION_ARG_ALIASES,
@@ -98,12 +300,37 @@ def configure_new_parser(parser: argparse.ArgumentParser):
             location=ns.location,
             ignore_patterns=tuple(ns.ignore_patterns or ()),
             ignore_files=tuple(ns.ignore_files or ()),
+            hash_workers=ns.hash_workers,
+            walk_workers=ns.walk_workers,
+            walk_snapshot=ns.walk_snapshot,
+            put_workers=ns.put_workers,
+            streaming=ns.streaming,
+            hash_algorithm=ns.hash_algorithm,
+            single_pass=ns.single_pass,
+            stats=ns.stats,
+            stats_json=ns.stats_json,
+            compression=ns.compression,
+            compression_level=ns.compression_level,
+            compression_probe=ns.compression_probe,
+            pack_threshold=ns.pack_threshold,
+            inline_threshold=ns.inline_threshold,
         )
 
     with_source_arg(parser)
     with_location_arg(parser)
     with_version_arg(parser)
     with_user_ignore_args(parser)
+    with_hash_workers_arg(parser)
+    with_walk_workers_arg(parser)
+    with_walk_snapshot_arg(parser)
+    with_put_workers_arg(parser)
+    with_streaming_arg(parser)
+    with_hash_algorithm_arg(parser)
+    with_single_pass_arg(parser)
+    with_compression_args(parser)
+    with_pack_threshold_arg(parser)
+    with_inline_threshold_arg(parser)
+    with_stats_args(parser)
     parser.set_defaults(func=to_command)
 
 
@@ -115,12 +342,41 @@ def configure_update_parser(parser: argparse.ArgumentParser):
             location=ns.location,
             ignore_patterns=tuple(ns.ignore_patterns or ()),
             ignore_files=tuple(ns.ignore_files or ()),
+            hash_workers=ns.hash_workers,
+            walk_workers=ns.walk_workers,
+            walk_snapshot=ns.walk_snapshot,
+            put_workers=ns.put_workers,
+            streaming=ns.streaming,
+            hash_algorithm=ns.hash_algorithm,
+            single_pass=ns.single_pass,
+            stats=ns.stats,
+            stats_json=ns.stats_json,
+            compression=ns.compression,
+            compression_level=ns.compression_level,
+            compression_probe=ns.compression_probe,
+            pack_threshold=ns.pack_threshold,
+            inline_threshold=ns.inline_threshold,
+            preload_metadata=ns.preload_metadata,
+            preload_hashes=ns.preload_hashes,
         )
 
     with_source_arg(parser)
     with_location_arg(parser)
     with_version_arg(parser)
     with_user_ignore_args(parser)
+    with_hash_workers_arg(parser)
+    with_walk_workers_arg(parser)
+    with_walk_snapshot_arg(parser)
+    with_put_workers_arg(parser)
+    with_streaming_arg(parser)
+    with_hash_algorithm_arg(parser)
+    with_single_pass_arg(parser)
+    with_compression_args(parser)
+    with_pack_threshold_arg(parser)
+    with_inline_threshold_arg(parser)
+    with_stats_args(parser)
+    with_preload_metadata_arg(parser)
+    with_preload_hashes_arg(parser)
     parser.set_defaults(func=to_command)
 
 
@@ -150,11 +406,13 @@ def configure_restore_parser(parser: argparse.ArgumentParser):
             location=ns.location,
             destination=ns.destination,
             version_name=ns.version,
+            jobs=ns.jobs,
         )
 
     with_location_arg(parser)
     with_destination_arg(parser)
     with_restore_version_arg(parser)
+    with_jobs_arg(parser)
     parser.set_defaults(func=to_command)
 
 
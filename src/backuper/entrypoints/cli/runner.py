@@ -2,8 +2,13 @@ import asyncio
 import contextlib
 import json
 import os
+import sys
+import time
+from collections.abc import Iterator
 from contextlib import AbstractContextManager
+from dataclasses import asdict
 from pathlib import Path
+from typing import TextIO
 
 from backuper import config as implementation_config
 from backuper.commands import (
@@ -25,8 +30,11 @@ from backuper.entrypoints.cli.user_ignore_patterns import build_user_ignore_patt
 from backuper.entrypoints.wiring import (
     create_backup_database,
     create_destination_write_lock,
+    create_walk_snapshot_store,
 )
 from backuper.models import CliUsageError, DestinationLockContendedError
+from backuper.ports import InlineBlobStore, PackIndex
+from backuper.utils.stats import BackupStats, build_stats_report, format_stats_report
 
 _DESTINATION_LOCK_GUIDANCE = (
     "destination path {location} is already being modified by another active writer"
@@ -36,12 +44,33 @@ _DESTINATION_LOCK_FAILURE_GUIDANCE = (
 )
 
 
-def _local_filestore(backup_root: Path) -> LocalFileStore:
+def _local_filestore(
+    backup_root: Path,
+    *,
+    put_concurrency: int = implementation_config.PUT_CONCURRENCY,
+    hash_algorithm: str = implementation_config.DEFAULT_HASH_ALGORITHM,
+    compression: str = implementation_config.DEFAULT_COMPRESSION_CODEC,
+    compression_level: int | None = None,
+    compression_probe: bool = False,
+    pack_threshold: int = 0,
+    pack_index: PackIndex | None = None,
+    inline_threshold: int = 0,
+    inline_store: InlineBlobStore | None = None,
+) -> LocalFileStore:
     return LocalFileStore(
         FilestoreConfig(
             backup_dir=str(backup_root),
             zip_enabled=implementation_config.ZIP_ENABLED,
-        )
+            put_concurrency=put_concurrency,
+            hash_algorithm=hash_algorithm,
+            compression_codec=compression,
+            compression_level=compression_level,
+            compression_probe=compression_probe,
+            pack_threshold=pack_threshold,
+            inline_threshold=inline_threshold,
+        ),
+        pack_index=pack_index,
+        inline_store=inline_store,
     )
 
 
@@ -87,6 +116,68 @@ def _present_verify_integrity_stdout(errors: list[str], *, json_output: bool) ->
         print("No errors found!")
 
 
+def _backup_stats(command: NewCommand | UpdateCommand) -> BackupStats | None:
+    if command.stats or command.stats_json:
+        return BackupStats()
+    return None
+
+
+@contextlib.contextmanager
+def _stdout_for_stats_json(command: NewCommand | UpdateCommand) -> Iterator[TextIO]:
+    """Yield the stream the ``--stats-json`` report goes to.
+
+    With ``--stats-json``, everything else printed meanwhile goes to stderr, so
+    stdout carries only the JSON object.
+    """
+    stdout = sys.stdout
+    if not command.stats_json:
+        yield stdout
+        return
+    with contextlib.redirect_stdout(sys.stderr):
+        yield stdout
+
+
+def _present_backup_stats(
+    stats: BackupStats | None,
+    *,
+    command: NewCommand | UpdateCommand,
+    elapsed_seconds: float,
+    file_reader: LocalFileReader,
+    filestore: LocalFileStore,
+    json_stdout: TextIO,
+) -> None:
+    if stats is None:
+        return
+    walk_metrics = file_reader.get_last_walk_metrics()
+    report = build_stats_report(
+        stats,
+        elapsed_seconds=elapsed_seconds,
+        walk_metrics=asdict(walk_metrics) if walk_metrics is not None else None,
+        copy_strategies=filestore.copy_strategy_counts(),
+    )
+    if command.stats:
+        print(format_stats_report(report))
+    if command.stats_json:
+        print(json.dumps(report), file=json_stdout)
+
+
+def _local_file_reader(
+    command: NewCommand | UpdateCommand,
+    destination: Path,
+    user_patterns: tuple[str, ...],
+    stats: BackupStats | None,
+) -> LocalFileReader:
+    return LocalFileReader(
+        path_filter=GitIgnorePathFilter(user_patterns=user_patterns),
+        collect_walk_metrics=stats is not None,
+        walk_workers=command.walk_workers,
+        snapshot_store=(
+            create_walk_snapshot_store(destination) if command.walk_snapshot else None
+        ),
+        stats=stats,
+    )
+
+
 def run_new(command: NewCommand) -> None:
     source = Path(command.source)
     destination = Path(command.location)
@@ -114,20 +205,59 @@ def run_new(command: NewCommand) -> None:
                 destination.rmdir()
         raise
     try:
-        print(f"Creating new backup from {command.source} into {command.location}")
-        asyncio.run(
-            new_backup(
-                source,
-                command.version,
-                file_reader=LocalFileReader(
-                    path_filter=GitIgnorePathFilter(user_patterns=user_patterns)
-                ),
-                analyzer=BackupAnalyzerImpl(),
-                db=create_backup_database(destination, operation="write"),
-                filestore=_local_filestore(destination),
-                reporter=StdoutAnalysisReporter(),
+        with _stdout_for_stats_json(command) as json_stdout:
+            print(f"Creating new backup from {command.source} into {command.location}")
+            stats = _backup_stats(command)
+            file_reader = _local_file_reader(command, destination, user_patterns, stats)
+            started = time.perf_counter()
+            with create_backup_database(destination, operation="write") as db:
+                filestore = _local_filestore(
+                    destination,
+                    put_concurrency=command.put_workers,
+                    hash_algorithm=command.hash_algorithm,
+                    compression=command.compression,
+                    compression_level=command.compression_level,
+                    compression_probe=command.compression_probe,
+                    pack_threshold=command.pack_threshold,
+                    # Single-pass puts look up existing blobs in both stores.
+                    pack_index=(
+                        db.pack_index()
+                        if command.pack_threshold or command.single_pass
+                        else None
+                    ),
+                    inline_threshold=command.inline_threshold,
+                    inline_store=(
+                        db.inline_blob_store()
+                        if command.inline_threshold or command.single_pass
+                        else None
+                    ),
+                )
+                asyncio.run(
+                    new_backup(
+                        source,
+                        command.version,
+                        file_reader=file_reader,
+                        analyzer=BackupAnalyzerImpl(
+                            hash_workers=command.hash_workers,
+                            hash_algorithm=command.hash_algorithm,
+                            single_pass=command.single_pass,
+                            stats=stats,
+                        ),
+                        db=db,
+                        filestore=filestore,
+                        reporter=StdoutAnalysisReporter(),
+                        streaming=command.streaming,
+                        stats=stats,
+                    )
+                )
+            _present_backup_stats(
+                stats,
+                command=command,
+                elapsed_seconds=time.perf_counter() - started,
+                file_reader=file_reader,
+                filestore=filestore,
+                json_stdout=json_stdout,
             )
-        )
     except Exception:
         if destination_created and destination.exists():
             with contextlib.suppress(OSError):
@@ -151,22 +281,63 @@ def run_update(command: UpdateCommand) -> None:
     )
     lock_context = _acquire_destination_lock(destination, location=command.location)
     try:
-        print(
-            f"Updating backup at {command.location} with new version {command.version}"
-        )
-        asyncio.run(
-            add_version(
-                source,
-                command.version,
-                file_reader=LocalFileReader(
-                    path_filter=GitIgnorePathFilter(user_patterns=user_patterns)
-                ),
-                analyzer=BackupAnalyzerImpl(),
-                db=create_backup_database(destination, operation="write"),
-                filestore=_local_filestore(destination),
-                reporter=StdoutAnalysisReporter(),
+        with _stdout_for_stats_json(command) as json_stdout:
+            print(
+                f"Updating backup at {command.location} with new version {command.version}"
+            )
+            stats = _backup_stats(command)
+            file_reader = _local_file_reader(command, destination, user_patterns, stats)
+            started = time.perf_counter()
+            with create_backup_database(destination, operation="write") as db:
+                filestore = _local_filestore(
+                    destination,
+                    put_concurrency=command.put_workers,
+                    hash_algorithm=command.hash_algorithm,
+                    compression=command.compression,
+                    compression_level=command.compression_level,
+                    compression_probe=command.compression_probe,
+                    pack_threshold=command.pack_threshold,
+                    # Single-pass puts look up existing blobs in both stores.
+                    pack_index=(
+                        db.pack_index()
+                        if command.pack_threshold or command.single_pass
+                        else None
+                    ),
+                    inline_threshold=command.inline_threshold,
+                    inline_store=(
+                        db.inline_blob_store()
+                        if command.inline_threshold or command.single_pass
+                        else None
+                    ),
+                )
+                asyncio.run(
+                    add_version(
+                        source,
+                        command.version,
+                        file_reader=file_reader,
+                        analyzer=BackupAnalyzerImpl(
+                            hash_workers=command.hash_workers,
+                            hash_algorithm=command.hash_algorithm,
+                            single_pass=command.single_pass,
+                            stats=stats,
+                        ),
+                        db=db,
+                        filestore=filestore,
+                        reporter=StdoutAnalysisReporter(),
+                        streaming=command.streaming,
+                        preload_metadata=command.preload_metadata,
+                        preload_hashes=command.preload_hashes,
+                        stats=stats,
+                    )
+                )
+            _present_backup_stats(
+                stats,
+                command=command,
+                elapsed_seconds=time.perf_counter() - started,
+                file_reader=file_reader,
+                filestore=filestore,
+                json_stdout=json_stdout,
             )
-        )
     finally:
         _release_destination_lock(lock_context, location=command.location)
 
@@ -176,13 +347,18 @@ def run_verify_integrity(command: VerifyIntegrityCommand) -> list[str]:
     if not destination.exists():
         raise CliUsageError(f"destination path {command.location} does not exist")
 
-    errors = asyncio.run(
-        run_verify_integrity_flow(
-            command,
-            db=create_backup_database(destination, operation="read"),
-            filestore=_local_filestore(destination),
+    with create_backup_database(destination, operation="read") as db:
+        errors = asyncio.run(
+            run_verify_integrity_flow(
+                command,
+                db=db,
+                filestore=_local_filestore(
+                    destination,
+                    pack_index=db.pack_index(),
+                    inline_store=db.inline_blob_store(),
+                ),
+            )
         )
-    )
     _present_verify_integrity_stdout(errors, json_output=command.json_output)
 
     return errors
@@ -201,13 +377,18 @@ def run_restore(command: RestoreCommand) -> None:
                     "already exists and is not empty"
                 )
 
-    asyncio.run(
-        run_restore_flow(
-            command,
-            db=create_backup_database(source, operation="read"),
-            filestore=_local_filestore(source),
-            on_restore_file=lambda relative_path: print(
-                f"Restoring {relative_path} to {command.destination}"
-            ),
+    with create_backup_database(source, operation="read") as db:
+        asyncio.run(
+            run_restore_flow(
+                command,
+                db=db,
+                filestore=_local_filestore(
+                    source,
+                    pack_index=db.pack_index(),
+                    inline_store=db.inline_blob_store(),
+                ),
+                on_restore_file=lambda relative_path: print(
+                    f"Restoring {relative_path} to {command.destination}"
+                ),
+            )
         )
-    )
@@ -11,7 +11,8 @@ from backuper.components.sqlite_db import (
     SqliteDb,
     configure_sqlite_read_probe_connection,
 )
-from backuper.config import SqliteDbConfig, sqlite_db_config
+from backuper.components.walk_snapshot import DirectorySnapshotStore
+from backuper.config import WALK_SNAPSHOT_FILENAME, SqliteDbConfig, sqlite_db_config
 from backuper.models import CliUsageError
 from backuper.ports import BackupDatabase, DestinationWriteLock
 
@@ -96,5 +97,12 @@ def create_backup_database(
         raise CliUsageError(_SQLITE_BOOTSTRAP_GUIDANCE) from exc
 
 
+def create_walk_snapshot_store(backup_root: Path) -> DirectorySnapshotStore:
+    config = SqliteDbConfig(backup_dir=str(backup_root))
+    return DirectorySnapshotStore(
+        backup_root / config.backup_db_dir / WALK_SNAPSHOT_FILENAME
+    )
+
+
 def create_destination_write_lock() -> DestinationWriteLock:
     return LocalDestinationWriteLock()
@@ -4,6 +4,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from uuid import UUID
 
+from backuper.config import DEFAULT_HASH_ALGORITHM
+
 from .exceptions import (
     CliUsageError as CliUsageError,
 )
@@ -43,6 +45,8 @@ class FileEntry:
     hash: str | None = None
     is_compressed: bool = False
     stored_location: str | None = None
+    hash_algorithm: str | None = None
+    compression: str | None = None  # Codec of a compressed blob; None means "zip"
 
 
 @dataclass(frozen=True)
@@ -53,6 +57,12 @@ class AnalyzedFileEntry:
     hash: str | None = None
     already_backed_up: bool = False
     backup_id: UUID | None = None  # Will contain UUID if already backed up
+    hash_algorithm: str | None = None  # Algorithm that produced ``hash``
+    # Blob of the matched stored row when ``already_backed_up``; lets the backup
+    # leg write the manifest row without looking the hash up again.
+    stored_location: str | None = None
+    is_compressed: bool = False
+    compression: str | None = None
 
 
 @dataclass(frozen=True)
@@ -64,6 +74,8 @@ class BackedUpFileEntry:
     stored_location: str
     is_compressed: bool  # Whether the file is compressed
     hash: str
+    hash_algorithm: str = DEFAULT_HASH_ALGORITHM
+    compression: str | None = None  # Codec when compressed; None means "zip"
 
 
 @dataclass(frozen=True)
@@ -119,9 +131,43 @@ class BackupAnalysisSummaryAccumulator:
         )
 
 
+@dataclass(frozen=True)
+class CompressionRatio:
+    """Mean compressed/original size ratio from ``samples`` compressibility probes."""
+
+    samples: int
+    ratio: float
+
+
+@dataclass(frozen=True)
+class PackedBlob:
+    """Where a small blob lives inside an append-only pack file.
+
+    ``offset`` and ``length`` address the stored bytes in ``pack`` (a name under
+    the packs directory); they are compressed with ``compression`` unless it is
+    ``"none"``.
+    """
+
+    hash: str
+    compression: str
+    pack: str
+    offset: int
+    length: int
+
+
+@dataclass(frozen=True)
+class PutRequest:
+    origin_file: Path
+    restore_path: Path
+    precomputed_hash: str | None = None
+    hash_algorithm: str | None = None  # Defaults to the store's configured algorithm
+
+
 @dataclass(frozen=True)
 class PutResult:
     restore_path: str
     hash: str
     stored_location: str
     is_compressed: bool
+    hash_algorithm: str = DEFAULT_HASH_ALGORITHM
+    compression: str | None = None
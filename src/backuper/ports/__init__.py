@@ -1,16 +1,23 @@
 from __future__ import annotations
 
+import io
 import os
 from abc import ABC, abstractmethod
-from collections.abc import AsyncGenerator, AsyncIterator
+from collections.abc import AsyncGenerator, AsyncIterator, Mapping, Sequence
 from contextlib import AbstractContextManager
 from pathlib import Path
+from types import TracebackType
+from typing import IO, Self
 
+from backuper.config import DEFAULT_HASH_ALGORITHM
 from backuper.models import (
     AnalyzedFileEntry,
     BackedUpFileEntry,
     BackupAnalysisSummary,
+    CompressionRatio,
     FileEntry,
+    PackedBlob,
+    PutRequest,
     PutResult,
 )
 
@@ -60,6 +67,21 @@ class BackupAnalyzer(ABC):
 
 
 class BackupDatabase(ABC):
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release resources (e.g. open connections) held by the adapter."""
+        return None
+
     @abstractmethod
     async def list_versions(self) -> list[str]:
         """List all backup version names"""
@@ -98,16 +120,124 @@ class BackupDatabase(ABC):
         """Add a file entry to a specific backup version"""
         pass
 
+    async def add_files(
+        self, version: str, entries: Sequence[BackedUpFileEntry]
+    ) -> None:
+        """Add several entries to a version, preserving their order.
+
+        The default delegates to :meth:`add_file` once per entry; adapters may
+        override it to write the whole batch in a single transaction.
+        """
+        for entry in entries:
+            await self.add_file(version, entry)
+
     @abstractmethod
-    async def get_files_by_hash(self, hash: str) -> list[BackedUpFileEntry]:
-        """Get file entries by their hash value"""
+    async def get_files_by_hash(
+        self, hash: str, hash_algorithm: str = DEFAULT_HASH_ALGORITHM
+    ) -> list[BackedUpFileEntry]:
+        """Get file entries whose content digest under ``hash_algorithm`` is ``hash``"""
         pass
 
+    async def preload_hash_index(self) -> None:
+        """Optionally load the content hashes of completed versions into memory.
+
+        Adapters that support it answer later :meth:`get_files_by_hash` calls
+        without querying storage, returning at most the first matching entry.
+        The default does nothing.
+        """
+        return None
+
+    async def preload_metadata_index(self) -> None:
+        """Optionally load the most recent completed version's file metadata.
+
+        Adapters that support it answer later :meth:`get_files_by_metadata` hits
+        from memory instead of querying storage per file. The default does nothing.
+        """
+        return None
+
+    async def load_compression_ratios(self) -> dict[str, CompressionRatio]:
+        """Per-extension compressibility learned by earlier runs (default: none)."""
+        return {}
+
+    async def save_compression_ratios(
+        self, ratios: Mapping[str, CompressionRatio]
+    ) -> None:
+        """Persist ``ratios``, replacing stored rows for the same extensions.
+
+        The default does nothing, so learning only lasts for one run.
+        """
+        return None
+
+    def inline_blob_store(self) -> InlineBlobStore | None:
+        """Contents of tiny blobs kept inside this manifest.
+
+        ``None`` (the default) when the adapter cannot hold them.
+        """
+        return None
+
+    def pack_index(self) -> PackIndex | None:
+        """Index of blobs stored in pack files, kept with this manifest.
+
+        ``None`` (the default) when the adapter cannot hold one; file stores then
+        write and read every blob as its own file.
+        """
+        return None
+
     @abstractmethod
     async def get_files_by_metadata(
         self, relative_path: Path, mtime: float, size: int
     ) -> list[BackedUpFileEntry]:
-        """Get file entries by their metadata (relative path, mtime, and size)"""
+        """Get file entries by their metadata (relative path, mtime, and size).
+
+        Matches may come from any hash algorithm; each entry carries its own.
+        """
+        pass
+
+
+class PackIndex(ABC):
+    """Offsets of small blobs appended to pack files.
+
+    Methods are synchronous and must be safe to call from several threads, since
+    file stores write and read blobs on worker threads.
+    """
+
+    @abstractmethod
+    def find(self, file_hash: str) -> PackedBlob | None:
+        """The packed copy of the blob with digest ``file_hash``, if any."""
+        pass
+
+    @abstractmethod
+    def add_many(self, blobs: Sequence[PackedBlob]) -> None:
+        """Record ``blobs``, together, once their bytes are in their packs.
+
+        A new pack starts unsealed.
+        """
+        pass
+
+    @abstractmethod
+    def unsealed_pack(self) -> str | None:
+        """A pack that may still be appended to, or ``None`` to start a new one."""
+        pass
+
+    @abstractmethod
+    def seal(self, pack: str) -> None:
+        """Mark ``pack`` as full; nothing is appended to it afterwards."""
+        pass
+
+
+class InlineBlobStore(ABC):
+    """Whole contents of tiny blobs, keyed by content hash.
+
+    Like :class:`PackIndex`, methods are synchronous and thread-safe.
+    """
+
+    @abstractmethod
+    def get(self, file_hash: str) -> bytes | None:
+        pass
+
+    @abstractmethod
+    def put_many(self, blobs: Mapping[str, bytes]) -> None:
+        """Store each digest's content, together, unless that digest is already held."""
         pass
 
 
@@ -135,7 +265,11 @@ class AnalysisReporter(ABC):
 
     @abstractmethod
     def report_analysis_summary(self, summary: BackupAnalysisSummary) -> None:
-        """Exactly once per backup run: after the analysis leg, before file progress."""
+        """Exactly once per backup run: after the analysis leg, before file progress.
+
+        In streaming backups the backup leg overlaps analysis, so this arrives once
+        the walk finishes, possibly after some files were already stored.
+        """
 
     @abstractmethod
     def report_file_progress(self, file_index: int, total_files: int) -> None:
@@ -147,6 +281,16 @@ class AnalysisReporter(ABC):
         invocations.
         """
 
+    def report_running_summary(
+        self, summary: BackupAnalysisSummary, files_processed: int
+    ) -> None:
+        """Streaming-backup progress: counts analyzed so far and files stored so far.
+
+        Replaces :meth:`report_file_progress` when analysis and storage overlap and
+        the final file total is not yet known. Controllers throttle calls.
+        """
+        return None
+
 
 class FileStore(ABC):
     @abstractmethod
@@ -154,25 +298,107 @@ class FileStore(ABC):
         """Return True if the blob exists at this path under the backup data directory."""
         pass
 
+    def stored_blob_exists(self, stored_location: str, file_hash: str) -> bool:
+        """Return True if the blob for ``file_hash`` is intact at ``stored_location``.
+
+        The default only checks the location (:meth:`exists`); adapters whose
+        locations are shared by several blobs should also check ``file_hash``'s
+        entry there.
+        """
+        return self.exists(stored_location)
+
     @abstractmethod
-    def blob_relative_path(self, file_hash: str, is_compressed: bool) -> str:
-        """Path segments under the backup data directory for this content hash."""
+    def blob_relative_path(
+        self, file_hash: str, is_compressed: bool, compression: str | None = None
+    ) -> str:
+        """Path segments under the backup data directory for this content hash.
+
+        ``compression`` names the codec of a compressed blob (``None``: ``zip``).
+        """
         pass
 
     @abstractmethod
-    def blob_exists(self, file_hash: str, is_compressed: bool) -> bool:
+    def blob_exists(
+        self, file_hash: str, is_compressed: bool, compression: str | None = None
+    ) -> bool:
         pass
 
     @abstractmethod
-    def read_blob(self, file_hash: str, is_compressed: bool) -> bytes:
-        """Raw bytes for an uncompressed blob, or extracted payload for a zip blob."""
+    def read_blob(
+        self,
+        file_hash: str,
+        is_compressed: bool,
+        compression: str | None = None,
+        *,
+        stored_location: str | None = None,
+    ) -> bytes:
+        """Raw bytes for an uncompressed blob, or the decompressed payload.
+
+        ``stored_location`` is the manifest's location for the blob; adapters
+        use it to go straight to the right storage. ``None`` means the blob is
+        found by hash alone.
+        """
         pass
 
+    def open_blob(
+        self,
+        file_hash: str,
+        is_compressed: bool,
+        compression: str | None = None,
+        *,
+        stored_location: str | None = None,
+    ) -> IO[bytes]:
+        """Readable binary stream over the same payload :meth:`read_blob` returns.
+
+        Callers close the stream. The default wraps :meth:`read_blob` in memory;
+        adapters should override it to stream from storage.
+        """
+        return io.BytesIO(
+            self.read_blob(
+                file_hash, is_compressed, compression, stored_location=stored_location
+            )
+        )
+
     @abstractmethod
     def put(
         self,
         origin_file: os.PathLike[str],
         restore_path: Path,
         precomputed_hash: str | None = None,
+        hash_algorithm: str | None = None,
     ) -> PutResult:
+        """Store ``origin_file`` under its content address.
+
+        ``hash_algorithm`` names the algorithm of ``precomputed_hash`` (or the one
+        to compute with); ``None`` means the store's configured algorithm. Without
+        ``precomputed_hash``, adapters should hash the file while storing it and
+        reuse an already stored blob with the same digest.
+        """
         pass
+
+    def seed_compression_ratios(self, ratios: Mapping[str, CompressionRatio]) -> None:
+        """Start from per-extension ratios learned by earlier runs.
+
+        Stores that do not probe compressibility ignore them (the default).
+        """
+        return None
+
+    def learned_compression_ratios(self) -> dict[str, CompressionRatio]:
+        """Ratios to persist after a run; ``{}`` when nothing new was learned."""
+        return {}
+
+    async def put_many(self, requests: Sequence[PutRequest]) -> list[PutResult]:
+        """Store several files; results are in the same order as ``requests``.
+
+        The default calls :meth:`put` sequentially; adapters may run puts
+        concurrently as long as each blob is still published atomically.
+        """
+        return [
+            self.put(
+                request.origin_file,
+                request.restore_path,
+                request.precomputed_hash,
+                request.hash_algorithm,
+            )
+            for request in requests
+        ]
@@ -1,31 +1,73 @@
 """Shared pure helpers (paths, hashing); see AGENTS.md for layering."""
 
+from backuper.utils.compression import (
+    CompressedBlobError,
+    compress_bytes,
+    compress_file,
+    compress_stream,
+    decompress_bytes,
+    estimate_compression_ratio,
+    open_decompressed,
+    read_decompressed,
+    resolve_compression,
+    validate_compression,
+)
+from backuper.utils.file_copy import copy_file, copy_stream
 from backuper.utils.gitignore_lines import (
     gitignore_pattern_lines,
     gitignore_pattern_lines_from_text,
     iter_gitignore_pattern_lines,
 )
-from backuper.utils.hashing import compute_hash
+from backuper.utils.hashing import HashingReader, compute_hash
 from backuper.utils.paths import (
     hash_to_stored_location,
+    inline_location_hash,
+    inline_stored_location,
     normalize_path,
     relative_dir_from_hash,
 )
+from backuper.utils.stats import (
+    BackupStats,
+    build_stats_report,
+    format_stats_report,
+)
 from backuper.utils.zip_payload import (
+    ZIP_PAYLOAD_MEMBER,
     ZipPayloadError,
+    open_zip_payload,
     read_zip_payload_bytes,
     resolve_zip_payload_member_name,
 )
 
 __all__ = [
+    "CompressedBlobError",
+    "compress_bytes",
+    "compress_file",
+    "compress_stream",
+    "decompress_bytes",
+    "estimate_compression_ratio",
+    "open_decompressed",
+    "read_decompressed",
+    "resolve_compression",
+    "validate_compression",
+    "copy_file",
+    "copy_stream",
     "gitignore_pattern_lines",
     "gitignore_pattern_lines_from_text",
     "iter_gitignore_pattern_lines",
+    "HashingReader",
     "compute_hash",
     "hash_to_stored_location",
+    "inline_location_hash",
+    "inline_stored_location",
     "normalize_path",
     "relative_dir_from_hash",
+    "BackupStats",
+    "build_stats_report",
+    "format_stats_report",
+    "ZIP_PAYLOAD_MEMBER",
     "ZipPayloadError",
+    "open_zip_payload",
     "read_zip_payload_bytes",
     "resolve_zip_payload_member_name",
 ]
@@ -0,0 +1,213 @@
+"""Compressed blob codecs (stdlib only).
+
+``zip`` blobs are ZIP archives holding one deflated payload member (see
+:mod:`backuper.utils.zip_payload`; older blobs may be stored uncompressed inside
+the container). ``zlib`` blobs are a single zlib stream — deflate plus a 2-byte
+header and an Adler-32 trailer, with no ZIP local headers or central directory.
+``lzma`` blobs are ``.xz`` streams and ``bz2`` blobs are bzip2 streams.
+"""
+
+from __future__ import annotations
+
+import bz2
+import io
+import lzma
+import os
+import zlib
+from pathlib import Path
+from typing import IO, TYPE_CHECKING
+from zipfile import ZIP_DEFLATED, ZipFile
+
+from backuper.config import (
+    COMPRESSION_BZ2,
+    COMPRESSION_CODECS,
+    COMPRESSION_LEVELS,
+    COMPRESSION_LZMA,
+    COMPRESSION_NONE,
+    COMPRESSION_PROBE_SAMPLE_SIZE,
+    COMPRESSION_ZIP,
+    COMPRESSION_ZLIB,
+    COPY_BUFFER_SIZE,
+)
+from backuper.utils.file_copy import copy_stream
+from backuper.utils.zip_payload import (
+    ZIP_PAYLOAD_MEMBER,
+    open_zip_payload,
+    read_zip_payload_bytes,
+    resolve_zip_payload_member_name,
+)
+
+if TYPE_CHECKING:
+    from _typeshed import SupportsRead, WriteableBuffer
+
+
+class CompressedBlobError(ValueError):
+    """A compressed blob ended before its stream did."""
+
+
+def validate_compression(codec: str, level: int | None) -> None:
+    if codec not in COMPRESSION_CODECS:
+        raise ValueError(f"Unsupported compression codec {codec!r}")
+    if level is not None and level not in COMPRESSION_LEVELS:
+        raise ValueError(
+            f"compression level must be {COMPRESSION_LEVELS.start}–"
+            f"{COMPRESSION_LEVELS.stop - 1}, got {level}"
+        )
+
+
+def resolve_compression(is_compressed: bool, compression: str | None) -> str:
+    """Codec for a blob; compressed entries without one are legacy ``zip`` blobs."""
+    if not is_compressed:
+        return COMPRESSION_NONE
+    return compression or COMPRESSION_ZIP
+
+
+def estimate_compression_ratio(
+    path: os.PathLike[str], *, sample_size: int = COMPRESSION_PROBE_SAMPLE_SIZE
+) -> float:
+    """Compressed/original size of a sample of ``path`` under fast deflate.
+
+    Files larger than ``sample_size`` are sampled from their start and their
+    middle, half each, so a compressible header alone does not decide. Empty
+    files report ``1.0``.
+    """
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if size <= sample_size:
+            sample = file.read()
+        else:
+            half = sample_size // 2
+            head = file.read(half)
+            file.seek(size // 2)
+            sample = head + file.read(sample_size - half)
+    if not sample:
+        return 1.0
+    return len(zlib.compress(sample, 1)) / len(sample)
+
+
+def compress_file(
+    source: os.PathLike[str], destination: Path, *, codec: str, level: int | None
+) -> None:
+    """Write ``source`` to the new file ``destination`` with ``codec``."""
+    with open(source, "rb") as src:
+        compress_stream(src, destination, codec=codec, level=level)
+
+
+def compress_stream(
+    src: SupportsRead[bytes], destination: Path, *, codec: str, level: int | None
+) -> None:
+    """Read ``src`` to the end into the new file ``destination`` with ``codec``."""
+    if codec == COMPRESSION_ZIP:
+        with (
+            ZipFile(
+                destination, "x", compression=ZIP_DEFLATED, compresslevel=level
+            ) as archive,
+            archive.open(ZIP_PAYLOAD_MEMBER, "w", force_zip64=True) as member,
+        ):
+            copy_stream(src, member)
+    elif codec == COMPRESSION_ZLIB:
+        compressor = zlib.compressobj(
+            zlib.Z_DEFAULT_COMPRESSION if level is None else level
+        )
+        with destination.open("xb") as dst:
+            while chunk := src.read(COPY_BUFFER_SIZE):
+                dst.write(compressor.compress(chunk))
+            dst.write(compressor.flush())
+    elif codec == COMPRESSION_LZMA:
+        with lzma.open(destination, "xb", preset=level) as dst:
+            copy_stream(src, dst)
+    elif codec == COMPRESSION_BZ2:
+        with bz2.open(destination, "xb", compresslevel=level or 9) as dst:
+            copy_stream(src, dst)
+    else:
+        raise ValueError(f"Unsupported compression codec {codec!r}")
+
+
+def compress_bytes(data: bytes, *, codec: str, level: int | None) -> bytes:
+    """In-memory :func:`compress_stream`, for blobs small enough to hold whole."""
+    if codec == COMPRESSION_ZIP:
+        buffer = io.BytesIO()
+        with ZipFile(
+            buffer, "w", compression=ZIP_DEFLATED, compresslevel=level
+        ) as archive:
+            archive.writestr(ZIP_PAYLOAD_MEMBER, data)
+        return buffer.getvalue()
+    if codec == COMPRESSION_ZLIB:
+        return zlib.compress(
+            data, zlib.Z_DEFAULT_COMPRESSION if level is None else level
+        )
+    if codec == COMPRESSION_LZMA:
+        return lzma.compress(data, preset=level)
+    if codec == COMPRESSION_BZ2:
+        return bz2.compress(data, compresslevel=level or 9)
+    raise ValueError(f"Unsupported compression codec {codec!r}")
+
+
+def decompress_bytes(data: bytes, *, codec: str, file_hash: str) -> bytes:
+    """Payload of a ``codec`` blob held in memory (see :func:`compress_bytes`)."""
+    if codec == COMPRESSION_NONE:
+        return data
+    if codec == COMPRESSION_ZIP:
+        with ZipFile(io.BytesIO(data), "r") as archive:
+            return archive.read(resolve_zip_payload_member_name(archive, file_hash))
+    if codec == COMPRESSION_ZLIB:
+        return zlib.decompress(data)
+    if codec == COMPRESSION_LZMA:
+        return lzma.decompress(data)
+    if codec == COMPRESSION_BZ2:
+        return bz2.decompress(data)
+    raise ValueError(f"Unsupported compression codec {codec!r}")
+
+
+def open_decompressed(path: Path, *, codec: str, file_hash: str) -> IO[bytes]:
+    """Readable stream over the payload of the ``codec`` blob at ``path``."""
+    if codec == COMPRESSION_ZIP:
+        return open_zip_payload(path, file_hash)
+    if codec == COMPRESSION_ZLIB:
+        return io.BufferedReader(_ZlibReader(path.open("rb"), label=str(path)))
+    if codec == COMPRESSION_LZMA:
+        return lzma.open(path, "rb")
+    if codec == COMPRESSION_BZ2:
+        return bz2.open(path, "rb")
+    raise ValueError(f"Unsupported compression codec {codec!r}")
+
+
+def read_decompressed(path: Path, *, codec: str, file_hash: str) -> bytes:
+    if codec == COMPRESSION_ZIP:
+        return read_zip_payload_bytes(path, file_hash)
+    with open_decompressed(path, codec=codec, file_hash=file_hash) as payload:
+        return payload.read()
+
+
+class _ZlibReader(io.RawIOBase):
+    """Decompress a zlib stream incrementally; closing it closes ``raw``."""
+
+    def __init__(self, raw: IO[bytes], *, label: str) -> None:
+        self._raw = raw
+        self._label = label
+        self._decompressor = zlib.decompressobj()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: WriteableBuffer) -> int:
+        view = memoryview(buffer).cast("B")
+        if not len(view):
+            return 0
+        while True:
+            pending = self._decompressor.unconsumed_tail
+            if not pending:
+                if self._decompressor.eof:
+                    return 0
+                pending = self._raw.read(COPY_BUFFER_SIZE)
+                if not pending:
+                    raise CompressedBlobError(f"{self._label}: truncated zlib stream")
+            data = self._decompressor.decompress(pending, len(view))
+            if data:
+                view[: len(data)] = data
+                return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._raw.close()
+        super().close()
@@ -0,0 +1,124 @@
+"""Copy file contents with the cheapest mechanism the platform offers (stdlib only).
+
+Strategies are tried in order: reflink clone (``FICLONE``, btrfs/XFS and other
+copy-on-write filesystems), ``os.copy_file_range``, ``os.sendfile``, then a
+buffered userspace copy. A strategy that is unsupported for the given pair of
+files falls through to the next one; real I/O errors are raised.
+"""
+
+from __future__ import annotations
+
+import errno
+import os
+import shutil
+import sys
+from typing import IO, TYPE_CHECKING
+
+from backuper import config
+
+if TYPE_CHECKING:
+    from _typeshed import SupportsRead
+
+COPY_STRATEGY_REFLINK = "reflink"
+COPY_STRATEGY_COPY_FILE_RANGE = "copy_file_range"
+COPY_STRATEGY_SENDFILE = "sendfile"
+COPY_STRATEGY_USERSPACE = "userspace"
+
+_FICLONE = 0x40049409  # _IOW(0x94, 9, int) from linux/fs.h
+_KERNEL_COPY_CHUNK = 1 << 30  # 1 GiB per syscall
+
+_UNSUPPORTED_ERRNOS = frozenset(
+    {
+        errno.EBADF,
+        errno.EINVAL,
+        errno.ENOSYS,
+        errno.ENOTSUP,
+        errno.EOPNOTSUPP,
+        errno.ENOTTY,
+        errno.EXDEV,
+    }
+)
+
+if sys.platform.startswith("linux"):
+    import fcntl
+
+    def _reflink(src_fd: int, dst_fd: int) -> bool:
+        try:
+            fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+        except OSError as exc:
+            if exc.errno in _UNSUPPORTED_ERRNOS:
+                return False
+            raise
+        return True
+else:
+
+    def _reflink(src_fd: int, dst_fd: int) -> bool:
+        return False
+
+
+def _kernel_copy(src_fd: int, dst_fd: int, size: int, *, use_sendfile: bool) -> bool:
+    """Copy via ``copy_file_range`` or ``sendfile`` from the current offsets.
+
+    Returns False (having copied nothing) when the syscall is unavailable or
+    unsupported for these descriptors.
+    """
+    if use_sendfile:
+        sendfile = getattr(os, "sendfile", None)
+        if sendfile is None or not sys.platform.startswith("linux"):
+            return False
+
+        def copy_chunk() -> int:
+            return sendfile(dst_fd, src_fd, None, _KERNEL_COPY_CHUNK)
+    else:
+        copy_file_range = getattr(os, "copy_file_range", None)
+        if copy_file_range is None:
+            return False
+
+        def copy_chunk() -> int:
+            return copy_file_range(src_fd, dst_fd, _KERNEL_COPY_CHUNK)
+
+    copied = 0
+    while True:
+        try:
+            n = copy_chunk()
+        except OSError as exc:
+            if copied == 0 and exc.errno in _UNSUPPORTED_ERRNOS:
+                return False
+            raise
+        if n == 0:
+            # Some virtual filesystems report 0 without copying; let the caller
+            # fall back when nothing was transferred from a non-empty file.
+            return copied > 0 or size == 0
+        copied += n
+
+
+def copy_file(src: os.PathLike[str] | str, dst: os.PathLike[str] | str) -> str:
+    """Copy ``src`` contents into a new file ``dst`` and return the strategy used.
+
+    ``dst`` must not exist. Only contents are copied (like :func:`shutil.copyfile`).
+    """
+    with open(src, "rb") as fsrc, open(dst, "xb") as fdst:
+        src_fd = fsrc.fileno()
+        dst_fd = fdst.fileno()
+        size = os.fstat(src_fd).st_size
+        if _reflink(src_fd, dst_fd):
+            return COPY_STRATEGY_REFLINK
+        if _kernel_copy(src_fd, dst_fd, size, use_sendfile=False):
+            return COPY_STRATEGY_COPY_FILE_RANGE
+        if _kernel_copy(src_fd, dst_fd, size, use_sendfile=True):
+            return COPY_STRATEGY_SENDFILE
+        shutil.copyfileobj(fsrc, fdst, config.COPY_BUFFER_SIZE)
+        return COPY_STRATEGY_USERSPACE
+
+
+def copy_stream(
+    src: SupportsRead[bytes],
+    dst: IO[bytes],
+    buffer_size: int = config.COPY_BUFFER_SIZE,
+) -> int:
+    """Copy ``src`` to ``dst`` in ``buffer_size`` chunks and return the bytes copied."""
+    copied = 0
+    while chunk := src.read(buffer_size):
+        dst.write(chunk)
+        copied += len(chunk)
+    return copied
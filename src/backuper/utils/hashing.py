@@ -1,19 +1,96 @@
 import hashlib
+import io
 import os
+import threading
+from typing import IO, Protocol
 
 from backuper import config
 
+_chunk_buffers = threading.local()
+
+
+class _Hasher(Protocol):
+    def update(self, data: memoryview | bytes, /) -> None: ...
+
+    def hexdigest(self) -> str: ...
+
 
 def compute_hash(
-    file_path: os.PathLike, buffer_size: int = config.HASHING_BUFFER_SIZE
+    file_path: os.PathLike,
+    buffer_size: int = config.HASHING_BUFFER_SIZE,
+    *,
+    algorithm: str = config.DEFAULT_HASH_ALGORITHM,
 ) -> str:
-    # Tech debt: this hashes only the first `buffer_size` bytes, not the whole file.
-    # Full-file SHA-1 would be stronger for integrity, but would not match digests
-    # already stored in CSVs and blob paths for files larger than the buffer; fixing
-    # that requires a versioned hash algorithm and a data migration.
-    # Until then, keep this behavior identical to historical backups.
+    """Hex digest of ``file_path`` under ``algorithm`` (see ``config.HASH_ALGORITHMS``).
+
+    ``buffer_size`` only applies to the legacy ``sha1`` algorithm. Files are read
+    with ``read`` calls, never memory-mapped: a mapped file that shrinks while
+    it is hashed raises SIGBUS, and backups read live trees.
+    """
+    hasher, limit = _new_hasher(algorithm, buffer_size)
     with open(file_path, "rb") as file:
-        data = file.read(buffer_size)
-        sha1 = hashlib.sha1()
-        sha1.update(data)
-    return sha1.hexdigest()
+        if limit is None:
+            _update_in_chunks(hasher, file)
+        else:
+            hasher.update(file.read(limit))
+    return hasher.hexdigest()
+
+
+class HashingReader:
+    """Binary reader that hashes what passes through it, as :func:`compute_hash` would.
+
+    Wrap the source stream, read it to the end (for example while copying it
+    elsewhere), then call :meth:`hexdigest`; the digest equals
+    ``compute_hash(path, buffer_size, algorithm=algorithm)`` for the same bytes.
+    """
+
+    def __init__(
+        self,
+        raw: IO[bytes],
+        *,
+        algorithm: str = config.DEFAULT_HASH_ALGORITHM,
+        buffer_size: int = config.HASHING_BUFFER_SIZE,
+    ) -> None:
+        self._raw = raw
+        self._hasher, self._remaining = _new_hasher(algorithm, buffer_size)
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._raw.read(size)
+        if self._remaining is None:
+            self._hasher.update(data)
+        elif self._remaining:
+            hashed = data[: self._remaining]
+            self._hasher.update(hashed)
+            self._remaining -= len(hashed)
+        return data
+
+    def hexdigest(self) -> str:
+        return self._hasher.hexdigest()
+
+
+def _new_hasher(algorithm: str, buffer_size: int) -> tuple[_Hasher, int | None]:
+    """Hasher for ``algorithm`` and how many leading bytes it covers (``None``: all)."""
+    if algorithm == config.HASH_ALGORITHM_SHA1:
+        # Tech debt: this hashes only the first `buffer_size` bytes, not the whole
+        # file. It must stay identical to historical backups, whose digests are
+        # stored in manifests and blob paths; new backups can opt into a full-file
+        # algorithm.
+        return hashlib.sha1(), buffer_size
+    if algorithm == config.HASH_ALGORITHM_BLAKE2B:
+        return hashlib.blake2b(digest_size=32), None
+    raise ValueError(f"Unsupported hash algorithm {algorithm!r}")
+
+
+def _chunk_buffer() -> memoryview:
+    # One read buffer per hashing thread, reused across files.
+    buffer: memoryview | None = getattr(_chunk_buffers, "view", None)
+    if buffer is None or len(buffer) != config.HASHING_CHUNK_SIZE:
+        buffer = memoryview(bytearray(config.HASHING_CHUNK_SIZE))
+        _chunk_buffers.view = buffer
+    return buffer
+
+
+def _update_in_chunks(hasher: _Hasher, file: io.BufferedReader) -> None:
+    buffer = _chunk_buffer()
+    while read := file.readinto(buffer):
+        hasher.update(buffer[:read])
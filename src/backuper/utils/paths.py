@@ -2,7 +2,12 @@ from __future__ import annotations
 
 import os
 
-from backuper.config import ZIPFILE_EXT
+from backuper.config import (
+    COMPRESSION_EXTENSIONS,
+    COMPRESSION_ZIP,
+    INLINE_LOCATION_PREFIX,
+    PACKS_DIR,
+)
 
 
 def normalize_path(path: str) -> str:
@@ -13,6 +18,41 @@ def relative_dir_from_hash(filehash: str) -> str:
     return os.path.join(filehash[0], filehash[1], filehash[2], filehash[3])
 
 
-def hash_to_stored_location(filehash: str, is_compressed: bool) -> str:
-    final_name = f"{filehash}{ZIPFILE_EXT}" if is_compressed else filehash
+def hash_to_stored_location(
+    filehash: str, is_compressed: bool, compression: str | None = None
+) -> str:
+    """Blob path for ``filehash``; compressed blobs get their codec's extension.
+
+    ``compression`` defaults to ``zip`` for compressed blobs.
+    """
+    if is_compressed:
+        extension = COMPRESSION_EXTENSIONS[compression or COMPRESSION_ZIP]
+        final_name = f"{filehash}{extension}"
+    else:
+        final_name = filehash
     return os.path.join(relative_dir_from_hash(filehash), final_name)
+
+
+def inline_stored_location(filehash: str) -> str:
+    """``storage_location`` of a blob held inline in the manifest database."""
+    return f"{INLINE_LOCATION_PREFIX}{filehash}"
+
+
+def inline_location_hash(stored_location: str) -> str | None:
+    """Digest named by an inline ``stored_location``; ``None`` for blob paths."""
+    if not stored_location.startswith(INLINE_LOCATION_PREFIX):
+        return None
+    return stored_location.removeprefix(INLINE_LOCATION_PREFIX)
+
+
+def pack_stored_location(pack_name: str) -> str:
+    """``storage_location`` of a blob appended to the pack file ``pack_name``."""
+    return os.path.join(PACKS_DIR, pack_name)
+
+
+def pack_location_name(stored_location: str) -> str | None:
+    """Pack file named by a packed ``stored_location``; ``None`` otherwise."""
+    directory, _, pack_name = normalize_path(stored_location).partition("/")
+    if directory != PACKS_DIR or not pack_name:
+        return None
+    return pack_name
@@ -0,0 +1,181 @@
+"""Opt-in per-phase timings and counters for ``new`` / ``update`` runs.
+
+Components and controllers record into one shared :class:`BackupStats` when one
+is passed in; :func:`build_stats_report` turns it into a JSON-friendly report.
+Hashing time is summed across hash workers (busy time); every other phase is
+wall-clock time spent in that phase by the backup flow.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter, defaultdict
+from collections.abc import Iterator, Mapping
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from typing import Any
+
+PHASE_WALK = "walk"
+PHASE_IGNORE = "ignore"
+PHASE_HASH = "hash"
+PHASE_DB_LOOKUP = "db_lookup"
+PHASE_BLOB_PUT = "blob_put"
+PHASE_MANIFEST_INSERT = "manifest_insert"
+PHASES = (
+    PHASE_WALK,
+    PHASE_IGNORE,
+    PHASE_HASH,
+    PHASE_DB_LOOKUP,
+    PHASE_BLOB_PUT,
+    PHASE_MANIFEST_INSERT,
+)
+
+COUNTER_SOURCE_FILES = "source_files"
+COUNTER_SOURCE_BYTES = "source_bytes"
+COUNTER_SOURCE_DIRECTORIES = "source_directories"
+COUNTER_SNAPSHOT_HITS = "walk_snapshot_hits"
+COUNTER_SNAPSHOT_MISSES = "walk_snapshot_misses"
+COUNTER_HASHED_FILES = "hashed_files"
+COUNTER_HASHED_BYTES = "hashed_bytes"
+COUNTER_METADATA_LOOKUPS = "metadata_lookups"
+COUNTER_METADATA_HITS = "metadata_hits"
+COUNTER_HASH_LOOKUPS = "hash_lookups"
+COUNTER_HASH_HITS = "hash_hits"
+COUNTER_BLOBS_PUT = "blobs_put"
+COUNTER_BYTES_PUT = "bytes_put"
+COUNTER_MANIFEST_ROWS = "manifest_rows"
+
+_MB = 1_000_000
+
+
+class BackupStats:
+    """Thread-safe accumulator of phase seconds and named counters."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._seconds: defaultdict[str, float] = defaultdict(float)
+        self._counters: Counter[str] = Counter()
+
+    def add_time(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            self._seconds[phase] += seconds
+
+    def increment(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[counter] += amount
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(phase, time.perf_counter() - started)
+
+    def phase_seconds(self) -> dict[str, float]:
+        with self._lock:
+            return {phase: self._seconds.get(phase, 0.0) for phase in PHASES}
+
+    def counters(self) -> dict[str, int]:
+        with self._lock:
+            return dict(sorted(self._counters.items()))
+
+
+def measure(stats: BackupStats | None, phase: str) -> AbstractContextManager[None]:
+    """``stats.measure(phase)``, or a no-op context when stats are disabled."""
+    if stats is None:
+        return nullcontext()
+    return stats.measure(phase)
+
+
+def increment(stats: BackupStats | None, counter: str, amount: int = 1) -> None:
+    if stats is not None:
+        stats.increment(counter, amount)
+
+
+def build_stats_report(
+    stats: BackupStats,
+    *,
+    elapsed_seconds: float,
+    walk_metrics: Mapping[str, int] | None = None,
+    copy_strategies: Mapping[str, int] | None = None,
+) -> dict[str, Any]:
+    """Assemble timings, counts, throughput, and hit rates into one mapping.
+
+    Rates and throughputs are ``None`` when their denominator is zero.
+    """
+    seconds = stats.phase_seconds()
+    counts = stats.counters()
+    return {
+        "elapsed_seconds": elapsed_seconds,
+        "phase_seconds": seconds,
+        "counts": counts,
+        "walk": dict(walk_metrics) if walk_metrics is not None else None,
+        "throughput": {
+            "files_per_second": _ratio(
+                counts.get(COUNTER_SOURCE_FILES, 0), elapsed_seconds
+            ),
+            "source_mb_per_second": _ratio(
+                counts.get(COUNTER_SOURCE_BYTES, 0) / _MB, elapsed_seconds
+            ),
+            "hash_mb_per_second": _ratio(
+                counts.get(COUNTER_HASHED_BYTES, 0) / _MB, seconds[PHASE_HASH]
+            ),
+            "put_mb_per_second": _ratio(
+                counts.get(COUNTER_BYTES_PUT, 0) / _MB, seconds[PHASE_BLOB_PUT]
+            ),
+        },
+        "cache_hit_rates": {
+            "metadata": _ratio(
+                counts.get(COUNTER_METADATA_HITS, 0),
+                counts.get(COUNTER_METADATA_LOOKUPS, 0),
+            ),
+            "content_hash": _ratio(
+                counts.get(COUNTER_HASH_HITS, 0), counts.get(COUNTER_HASH_LOOKUPS, 0)
+            ),
+            "walk_snapshot": _ratio(
+                counts.get(COUNTER_SNAPSHOT_HITS, 0),
+                counts.get(COUNTER_SNAPSHOT_HITS, 0)
+                + counts.get(COUNTER_SNAPSHOT_MISSES, 0),
+            ),
+        },
+        "copy_strategies": dict(copy_strategies or {}),
+    }
+
+
+def format_stats_report(report: Mapping[str, Any]) -> str:
+    """Render :func:`build_stats_report` output as aligned plain text."""
+    title = "+++++ BACKUP STATS +++++"
+    lines = [title, f"Elapsed: {report['elapsed_seconds']:.3f} s"]
+    lines.append("Phase seconds (hash is summed across workers):")
+    lines.extend(_rows(report["phase_seconds"], lambda v: f"{v:.3f}"))
+    lines.append("Counts:")
+    lines.extend(_rows(report["counts"], str))
+    if report.get("walk"):
+        lines.append("Walk:")
+        lines.extend(_rows(report["walk"], str))
+    lines.append("Throughput:")
+    lines.extend(_rows(report["throughput"], lambda v: f"{v:.2f}"))
+    lines.append("Cache hit rates:")
+    lines.extend(_rows(report["cache_hit_rates"], lambda v: format(v, ".1%")))
+    if report.get("copy_strategies"):
+        lines.append("Copy strategies:")
+        lines.extend(_rows(report["copy_strategies"], str))
+    lines.append("+" * len(title))
+    return "\n".join(lines)
+
+
+def _rows(values: Mapping[str, Any], render: Any) -> list[str]:
+    if not values:
+        return ["  (none)"]
+    width = max(len(name) for name in values)
+    return [
+        f"  {name.ljust(width)}  {'n/a' if value is None else render(value)}"
+        for name, value in values.items()
+    ]
+
+
+def _ratio(numerator: float, denominator: float) -> float | None:
+    if denominator <= 0:
+        return None
+    return numerator / denominator
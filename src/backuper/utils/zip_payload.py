@@ -8,10 +8,13 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path, PurePosixPath
+from typing import IO
 from zipfile import ZipFile, ZipInfo
 
 logger = logging.getLogger(__name__)
 
+ZIP_PAYLOAD_MEMBER = "part001"
+
 
 class ZipPayloadError(ValueError):
     """ZIP archive does not contain exactly one identifiable payload member."""
@@ -48,7 +51,9 @@ def resolve_zip_payload_member_name(
     label = str(zip_path) if zip_path is not None else "<zip>"
 
     part001 = [
-        info for info in members if _normalized_basename(info.filename) == "part001"
+        info
+        for info in members
+        if _normalized_basename(info.filename) == ZIP_PAYLOAD_MEMBER
     ]
     if len(part001) > 1:
         names = sorted({info.filename for info in members})
@@ -95,3 +100,17 @@ def read_zip_payload_bytes(path: Path, file_hash: str) -> bytes:
     with ZipFile(path, "r") as zf:
         member = resolve_zip_payload_member_name(zf, file_hash, zip_path=path)
         return zf.read(member)
+
+
+def open_zip_payload(path: Path, file_hash: str) -> IO[bytes]:
+    """Open ``path`` as a ZIP and return a readable stream over the resolved payload.
+
+    The archive file stays open until the returned stream is closed.
+    """
+    zf = ZipFile(path, "r")
+    try:
+        member = resolve_zip_payload_member_name(zf, file_hash, zip_path=path)
+        return zf.open(member)
+    finally:
+        # The member stream holds its own reference to the underlying file.
+        zf.close()
@@ -1,6 +1,7 @@
 from collections.abc import AsyncGenerator
 from pathlib import Path
 
+from backuper.config import DEFAULT_HASH_ALGORITHM
 from backuper.models import BackedUpFileEntry, FileEntry
 from backuper.ports import BackupDatabase
 
@@ -46,8 +47,14 @@ class MockBackupDatabase(BackupDatabase):
         # Not used in tests
         pass
 
-    async def get_files_by_hash(self, hash: str) -> list[BackedUpFileEntry]:
-        return self.files_by_hash.get(hash, [])
+    async def get_files_by_hash(
+        self, hash: str, hash_algorithm: str = DEFAULT_HASH_ALGORITHM
+    ) -> list[BackedUpFileEntry]:
+        return [
+            entry
+            for entry in self.files_by_hash.get(hash, [])
+            if entry.hash_algorithm == hash_algorithm
+        ]
 
     async def get_files_by_metadata(
         self, relative_path: Path, mtime: float, size: int
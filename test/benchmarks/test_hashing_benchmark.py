@@ -0,0 +1,53 @@
+from pathlib import Path
+
+import pytest
+from backuper import config
+from backuper.utils.hashing import compute_hash
+from benchmarks import hashing
+
+
+def test_hashing_benchmark_reports_every_combination(tmp_path: Path) -> None:
+    results = hashing.run(
+        tmp_path,
+        sizes=[1024, 4096],
+        files_per_size=2,
+        algorithms=config.HASH_ALGORITHMS,
+        workers=[1, 2],
+        repeat=1,
+    )
+
+    assert len(results) == 2 * len(config.HASH_ALGORITHMS) * 2 * 2
+    assert {result.strategy for result in results} == set(hashing.STRATEGIES)
+    assert all(result.files == 2 for result in results)
+    assert "MB/s" in hashing.format_results(results)
+
+
+def test_hashing_benchmark_main_runs_in_work_dir(tmp_path: Path, capsys) -> None:
+    assert (
+        hashing.main(
+            [
+                "--sizes-mb",
+                "0.01",
+                "--files",
+                "1",
+                "--repeat",
+                "1",
+                "--work-dir",
+                str(tmp_path),
+            ]
+        )
+        == 0
+    )
+    assert "sha1" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("algorithm", config.HASH_ALGORITHMS)
+@pytest.mark.parametrize("size", [0, 1000, 1 << 20])
+def test_hashing_benchmark_mmap_variant_matches_compute_hash(
+    tmp_path: Path, algorithm: str, size: int
+) -> None:
+    (path,) = hashing.write_files(tmp_path, size=size, count=1)
+
+    assert hashing.compute_hash_mmap(path, algorithm=algorithm) == compute_hash(
+        path, algorithm=algorithm
+    )
@@ -0,0 +1,64 @@
+import json
+from pathlib import Path
+
+from benchmarks import pipeline
+
+
+def _tiny_spec() -> pipeline.TreeSpec:
+    return pipeline.TreeSpec(
+        files=40,
+        min_size=16,
+        max_size=2048,
+        dup_ratio=0.25,
+        ignore_ratio=0.2,
+        update_ratio=0.25,
+        seed=7,
+    )
+
+
+def test_generate_tree_is_deterministic(tmp_path: Path) -> None:
+    first = pipeline.generate_tree(tmp_path / "a", _tiny_spec())
+    second = pipeline.generate_tree(tmp_path / "b", _tiny_spec())
+
+    assert first == second
+    assert first.files + first.ignored == 40
+    assert first.duplicates > 0
+    assert first.ignored > 0
+    assert sorted(
+        p.relative_to(tmp_path / "a") for p in (tmp_path / "a").rglob("*")
+    ) == (sorted(p.relative_to(tmp_path / "b") for p in (tmp_path / "b").rglob("*")))
+
+
+def test_pipeline_runs_every_scenario(tmp_path: Path) -> None:
+    report = pipeline.run(tmp_path, _tiny_spec())
+
+    assert [result.scenario for result in report.results] == list(pipeline.SCENARIOS)
+    assert all(result.files == report.tree.files for result in report.results)
+    assert all(result.peak_rss_bytes > 0 for result in report.results)
+    restored = tmp_path / "restore"
+    assert sum(1 for path in restored.rglob("*") if path.is_file()) == (
+        report.tree.files + 1  # the generated .gitignore is backed up too
+    )
+    assert "files/s" in pipeline.format_report(report)
+
+
+def test_compare_to_baseline_flags_slower_scenarios(tmp_path: Path) -> None:
+    report = pipeline.run(tmp_path, _tiny_spec(), scenarios=[pipeline.SCENARIO_NEW])
+    baseline = report.to_json()
+    assert pipeline.compare_to_baseline(report, baseline, tolerance=0.1) == []
+
+    baseline["results"][0]["files_per_second"] *= 10
+    [message] = pipeline.compare_to_baseline(report, baseline, tolerance=0.1)
+    assert message.startswith("new:")
+
+
+def test_pipeline_main_saves_and_compares_baseline(tmp_path: Path, capsys) -> None:
+    baseline = tmp_path / "baseline.json"
+    args = ["--files", "10", "--max-size", "1024", "--scenarios", "new", "verify"]
+
+    assert pipeline.main([*args, "--save-baseline", str(baseline)]) == 0
+    saved = json.loads(baseline.read_text(encoding="utf-8"))
+    assert [result["scenario"] for result in saved["results"]] == ["new", "verify"]
+
+    assert pipeline.main([*args, "--baseline", str(baseline), "--tolerance", "10"]) == 0
+    assert "verify" in capsys.readouterr().out
@@ -0,0 +1,52 @@
+from pathlib import Path
+
+from benchmarks import sqlite_db
+
+
+def test_sqlite_benchmark_reports_each_mode(tmp_path: Path) -> None:
+    report = sqlite_db.run(
+        tmp_path,
+        modes=["off", "full"],
+        versions=3,
+        files_per_version=50,
+        single_inserts=10,
+        checkpoints=[1, 3],
+        samples=5,
+    )
+
+    assert [(r.mode, r.method, r.rows) for r in report.inserts] == [
+        ("off", "add_file", 10),
+        ("off", "add_files", 150),
+        ("full", "add_file", 10),
+        ("full", "add_files", 150),
+    ]
+    assert {(r.mode, r.query, r.table_rows) for r in report.lookups} == {
+        (mode, query, rows)
+        for mode in ("off", "full")
+        for query in ("get_files_by_metadata", "get_files_by_hash")
+        for rows in (60, 160)
+    }
+    assert all(r.samples == 5 and r.p99_us >= r.p50_us > 0 for r in report.lookups)
+    assert [(r.mode, r.rows) for r in report.listings] == [("off", 50), ("full", 50)]
+    assert "list_files" in sqlite_db.format_report(report)
+
+
+def test_sqlite_benchmark_main_runs_in_work_dir(tmp_path: Path, capsys) -> None:
+    assert (
+        sqlite_db.main(
+            [
+                "--modes",
+                "normal",
+                "--versions",
+                "2",
+                "--files-per-version",
+                "20",
+                "--samples",
+                "3",
+                "--work-dir",
+                str(tmp_path),
+            ]
+        )
+        == 0
+    )
+    assert "get_files_by_hash" in capsys.readouterr().out
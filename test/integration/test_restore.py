@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import filecmp
+import os
+import sqlite3
 from pathlib import Path
 
 import pytest
@@ -187,3 +189,105 @@ def test_run_restore_second_version_after_update(tmp_path: Path) -> None:
         )
     )
     assert (dest / "file.txt").read_text(encoding="utf-8") == "v2-payload"
+
+
+def test_run_restore_mixes_compression_codecs_across_versions(tmp_path: Path) -> None:
+    backup = tmp_path / "backup"
+    source = tmp_path / "src"
+    dest = tmp_path / "out"
+    source.mkdir()
+    (source / "kept.txt").write_text("kept line\n" * 500, encoding="utf-8")
+    run_new(
+        NewCommand(
+            version="v1",
+            source=str(source),
+            location=str(backup),
+            compression="lzma",
+        )
+    )
+    (source / "added.txt").write_text("added line\n" * 500, encoding="utf-8")
+    run_update(
+        UpdateCommand(
+            version="v2",
+            source=str(source),
+            location=str(backup),
+            compression="zlib",
+            compression_level=9,
+        )
+    )
+
+    run_restore(
+        RestoreCommand(location=str(backup), destination=str(dest), version_name="v2")
+    )
+
+    assert sorted(p.suffix for p in (backup / "data").rglob("*") if p.is_file()) == [
+        ".xz",
+        ".zz",
+    ]
+    for name in ("kept.txt", "added.txt"):
+        assert (dest / name).read_bytes() == (source / name).read_bytes()
+
+
+def test_run_restore_reads_packed_small_files(tmp_path: Path) -> None:
+    backup = tmp_path / "backup"
+    source = tmp_path / "src"
+    dest = tmp_path / "out"
+    (source / "conf").mkdir(parents=True)
+    (source / "conf" / "a.cfg").write_text("a = 1\n", encoding="utf-8")
+    (source / "conf" / "b.cfg").write_text("b = 2\n" * 400, encoding="utf-8")
+    (source / "big.bin").write_bytes(os.urandom(8192))
+    run_new(
+        NewCommand(
+            version="v1", source=str(source), location=str(backup), pack_threshold=4096
+        )
+    )
+    (source / "conf" / "c.cfg").write_text("c = 3\n", encoding="utf-8")
+    run_update(
+        UpdateCommand(
+            version="v2", source=str(source), location=str(backup), pack_threshold=4096
+        )
+    )
+
+    run_restore(
+        RestoreCommand(location=str(backup), destination=str(dest), version_name="v2")
+    )
+
+    stored = [p for p in (backup / "data").rglob("*") if p.is_file()]
+    assert len([p for p in stored if p.parent.name == "packs"]) == 1
+    assert len(stored) == 2  # the shared pack and the one large blob
+    assert filecmp.dircmp(source, dest).diff_files == []
+    for name in ("conf/a.cfg", "conf/b.cfg", "conf/c.cfg", "big.bin"):
+        assert (dest / name).read_bytes() == (source / name).read_bytes()
+
+
+def test_run_restore_reads_inline_tiny_files_from_manifest(tmp_path: Path) -> None:
+    backup = tmp_path / "backup"
+    source = tmp_path / "src"
+    dest = tmp_path / "out"
+    source.mkdir()
+    (source / ".bashrc").write_text("alias ll='ls -l'\n", encoding="utf-8")
+    (source / "copy.rc").write_text("alias ll='ls -l'\n", encoding="utf-8")
+    (source / "big.bin").write_bytes(os.urandom(4096))
+    run_new(
+        NewCommand(
+            version="v1",
+            source=str(source),
+            location=str(backup),
+            inline_threshold=256,
+        )
+    )
+
+    run_restore(
+        RestoreCommand(location=str(backup), destination=str(dest), version_name="v1")
+    )
+
+    assert len([p for p in (backup / "data").rglob("*") if p.is_file()]) == 1
+    with sqlite3.connect(backup / "db" / "manifest.sqlite3") as conn:
+        locations = sorted(
+            row[0] for row in conn.execute("SELECT storage_location FROM version_files")
+        )
+        inline_rows = conn.execute("SELECT COUNT(*) FROM inline_blobs").fetchone()[0]
+    assert [loc.startswith("inline:") for loc in locations].count(True) == 2
+    assert inline_rows == 1
+    for name in (".bashrc", "copy.rc", "big.bin"):
+        assert (dest / name).read_bytes() == (source / name).read_bytes()
@@ -213,3 +213,89 @@ def test_run_verify_integrity_all_versions_aggregates_missing_blobs(
     assert " in v1" in implementation_stdout
     assert " in v2" in implementation_stdout
     assert all(error.startswith("Missing hash ") for error in implementation_errors)
+
+
+def test_run_verify_integrity_checks_packed_blobs(tmp_path: Path) -> None:
+    backup = tmp_path / "backup"
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "a.cfg").write_text("a = 1\n", encoding="utf-8")
+    (source / "b.cfg").write_text("b = 2\n", encoding="utf-8")
+    run_new(
+        NewCommand(
+            version="v1", source=str(source), location=str(backup), pack_threshold=1024
+        )
+    )
+    row = _first_file_row(backup, "v1")
+    assert str(row["storage_location"]).startswith("packs/")
+
+    assert run_verify_integrity(VerifyIntegrityCommand(location=str(backup))) == []
+
+    (backup / "data" / row["storage_location"]).unlink()
+    errors = run_verify_integrity(VerifyIntegrityCommand(location=str(backup)))
+
+    assert len(errors) == 2
+    assert all(error.startswith("Missing hash ") for error in errors)
+
+
+def test_run_verify_integrity_checks_inline_blobs(tmp_path: Path) -> None:
+    backup = tmp_path / "backup"
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / ".gitconfig").write_text("[user]\n", encoding="utf-8")
+    run_new(
+        NewCommand(
+            version="v1", source=str(source), location=str(backup), inline_threshold=64
+        )
+    )
+    assert str(_first_file_row(backup, "v1")["storage_location"]).startswith("inline:")
+
+    assert run_verify_integrity(VerifyIntegrityCommand(location=str(backup))) == []
+
+    with sqlite3.connect(_manifest_sqlite(backup)) as conn:
+        conn.execute("DELETE FROM inline_blobs")
+        conn.commit()
+    errors = run_verify_integrity(VerifyIntegrityCommand(location=str(backup)))
+
+    assert len(errors) == 1
+    assert errors[0].startswith("Missing hash ")
+
+
+def test_run_verify_integrity_checks_packed_blob_bounds(tmp_path: Path) -> None:
+    backup = tmp_path / "backup"
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "a.cfg").write_text("a = 1\n", encoding="utf-8")
+    run_new(
+        NewCommand(
+            version="v1", source=str(source), location=str(backup), pack_threshold=1024
+        )
+    )
+    pack_path = backup / "data" / _first_file_row(backup, "v1")["storage_location"]
+
+    with pack_path.open("r+b") as pack_file:
+        pack_file.truncate(pack_path.stat().st_size - 1)
+    errors = run_verify_integrity(VerifyIntegrityCommand(location=str(backup)))
+
+    assert len(errors) == 1
+    assert errors[0].startswith("Missing hash ")
+
+
+def test_run_verify_integrity_reports_missing_pack_index_row(tmp_path: Path) -> None:
+    backup = tmp_path / "backup"
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "a.cfg").write_text("a = 1\n", encoding="utf-8")
+    run_new(
+        NewCommand(
+            version="v1", source=str(source), location=str(backup), pack_threshold=1024
+        )
+    )
+
+    with sqlite3.connect(_manifest_sqlite(backup)) as conn:
+        conn.execute("DELETE FROM packed_blobs")
+        conn.commit()
+    errors = run_verify_integrity(VerifyIntegrityCommand(location=str(backup)))
+
+    assert len(errors) == 1
+    assert errors[0].startswith("Missing hash ")
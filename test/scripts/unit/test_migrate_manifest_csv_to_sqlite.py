@@ -154,7 +154,7 @@ def test_main_apply_writes_live_sqlite_manifest(
     with sqlite3.connect(live_db) as conn:
         user_version = conn.execute("PRAGMA user_version").fetchone()
         assert user_version is not None
-        assert int(user_version[0]) == 1
+        assert int(user_version[0]) == 4
         versions = conn.execute(
             "SELECT name, state FROM versions ORDER BY name ASC"
         ).fetchall()
@@ -1,7 +1,9 @@
+import hashlib
 from pathlib import Path
 from uuid import UUID
 
 import pytest
+from backuper import config
 from backuper.components.backup_analyzer import BackupAnalyzerImpl
 from backuper.models import BackedUpFileEntry, FileEntry
 from test.aux.mock_backup_database import MockBackupDatabase
@@ -179,6 +181,8 @@ async def test_analyze_stream_metadata_tie_uses_first_match():
     assert results[0].already_backed_up is True
     assert results[0].backup_id == first_id
     assert results[0].hash == "aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa"
+    assert results[0].stored_location == "/stored/a"
+    assert results[0].is_compressed is False
 
 
 @pytest.mark.asyncio
@@ -224,3 +228,205 @@ async def test_analyze_stream_hash_tie_uses_first_match():
     assert results[0].already_backed_up is True
     assert results[0].backup_id == first_id
     assert results[0].hash == known_hash
+    assert results[0].stored_location == "/stored/x"
+
+
+@pytest.mark.asyncio
+async def test_analyze_stream_with_hash_workers_preserves_input_order(
+    tmp_path: Path,
+) -> None:
+    file_entries: list[FileEntry] = []
+    for i in range(25):
+        path = tmp_path / f"f{i:02d}.bin"
+        path.write_bytes(f"payload-{i}".encode() * (i + 1))
+        file_entries.append(
+            FileEntry(
+                path=path,
+                relative_path=Path(path.name),
+                size=path.stat().st_size,
+                mtime=1.0,
+                is_directory=False,
+            )
+        )
+    file_entries.insert(
+        10,
+        FileEntry(
+            path=tmp_path,
+            relative_path=Path("dir"),
+            size=0,
+            mtime=0.0,
+            is_directory=True,
+        ),
+    )
+
+    sequential = [
+        entry
+        async for entry in BackupAnalyzerImpl().analyze_stream(
+            async_iter(file_entries), MockBackupDatabase()
+        )
+    ]
+    parallel = [
+        entry
+        async for entry in BackupAnalyzerImpl(hash_workers=4).analyze_stream(
+            async_iter(file_entries), MockBackupDatabase()
+        )
+    ]
+
+    assert parallel == sequential
+    assert [e.source_file for e in parallel] == file_entries
+
+
+@pytest.mark.asyncio
+async def test_analyze_stream_with_hash_workers_propagates_hash_errors(
+    tmp_path: Path,
+) -> None:
+    missing = FileEntry(
+        path=tmp_path / "missing.bin",
+        relative_path=Path("missing.bin"),
+        size=1,
+        mtime=1.0,
+        is_directory=False,
+    )
+    analyzer = BackupAnalyzerImpl(hash_workers=2)
+
+    with pytest.raises(FileNotFoundError):
+        async for _ in analyzer.analyze_stream(
+            async_iter([missing]), MockBackupDatabase()
+        ):
+            pass
+
+
+def test_backup_analyzer_rejects_non_positive_hash_workers() -> None:
+    with pytest.raises(ValueError, match="hash_workers"):
+        BackupAnalyzerImpl(hash_workers=0)
+
+
+@pytest.mark.asyncio
+async def test_analyze_stream_hashes_new_content_with_configured_algorithm(
+    tmp_path: Path,
+) -> None:
+    path = tmp_path / "doc.txt"
+    path.write_bytes(b"content")
+    file_entry = FileEntry(
+        path=path,
+        relative_path=Path("doc.txt"),
+        size=7,
+        mtime=1.0,
+        is_directory=False,
+    )
+    blake_hash = hashlib.blake2b(b"content", digest_size=32).hexdigest()
+    stored_id = UUID("cccccccc-cccc-cccc-cccc-cccccccccccc")
+    mock_db = MockBackupDatabase(
+        files_by_hash={
+            blake_hash: [
+                BackedUpFileEntry(
+                    source_file=file_entry,
+                    backup_id=stored_id,
+                    stored_location="/stored/blake",
+                    is_compressed=False,
+                    hash=blake_hash,
+                    hash_algorithm=config.HASH_ALGORITHM_BLAKE2B,
+                )
+            ]
+        },
+    )
+
+    sha1_result = [
+        entry
+        async for entry in BackupAnalyzerImpl().analyze_stream(
+            async_iter([file_entry]), mock_db
+        )
+    ]
+    blake_result = [
+        entry
+        async for entry in BackupAnalyzerImpl(
+            hash_algorithm=config.HASH_ALGORITHM_BLAKE2B
+        ).analyze_stream(async_iter([file_entry]), mock_db)
+    ]
+
+    assert sha1_result[0].already_backed_up is False
+    assert sha1_result[0].hash_algorithm == config.HASH_ALGORITHM_SHA1
+    assert blake_result[0].already_backed_up is True
+    assert blake_result[0].backup_id == stored_id
+    assert blake_result[0].hash == blake_hash
+    assert blake_result[0].hash_algorithm == config.HASH_ALGORITHM_BLAKE2B
+
+
+@pytest.mark.asyncio
+async def test_analyze_stream_metadata_match_keeps_stored_algorithm() -> None:
+    file_entry = FileEntry(
+        path=Path("unused"),
+        relative_path=Path("doc.txt"),
+        size=7,
+        mtime=1.0,
+        is_directory=False,
+    )
+    mock_db = MockBackupDatabase(
+        files_by_metadata={
+            ("doc.txt", 7, 1.0): BackedUpFileEntry(
+                source_file=file_entry,
+                backup_id=UUID("dddddddd-dddd-dddd-dddd-dddddddddddd"),
+                stored_location="/stored/sha1",
+                is_compressed=False,
+                hash="a" * 40,
+            )
+        },
+    )
+    analyzer = BackupAnalyzerImpl(hash_algorithm=config.HASH_ALGORITHM_BLAKE2B)
+
+    results = [
+        entry
+        async for entry in analyzer.analyze_stream(async_iter([file_entry]), mock_db)
+    ]
+
+    assert results[0].already_backed_up is True
+    assert results[0].hash == "a" * 40
+    assert results[0].hash_algorithm == config.HASH_ALGORITHM_SHA1
+
+
+def test_backup_analyzer_rejects_unknown_hash_algorithm() -> None:
+    with pytest.raises(ValueError, match="Unsupported hash algorithm"):
+        BackupAnalyzerImpl(hash_algorithm="md5")
+
+
+@pytest.mark.asyncio
+async def test_analyze_stream_single_pass_defers_hashing_of_new_content(
+    tmp_path: Path,
+) -> None:
+    new_file = FileEntry(
+        path=tmp_path / "missing-on-purpose.txt",
+        relative_path=Path("new.txt"),
+        size=7,
+        mtime=1.0,
+    )
+    known_file = FileEntry(
+        path=Path("unused"), relative_path=Path("doc.txt"), size=7, mtime=1.0
+    )
+    mock_db = MockBackupDatabase(
+        files_by_metadata={
+            ("doc.txt", 7, 1.0): BackedUpFileEntry(
+                source_file=known_file,
+                backup_id=UUID("eeeeeeee-eeee-eeee-eeee-eeeeeeeeeeee"),
+                stored_location="/stored/doc",
+                is_compressed=False,
+                hash="b" * 40,
+            )
+        },
+    )
+    analyzer = BackupAnalyzerImpl(
+        hash_algorithm=config.HASH_ALGORITHM_BLAKE2B, single_pass=True
+    )
+
+    new_result, known_result = [
+        entry
+        async for entry in analyzer.analyze_stream(
+            async_iter([new_file, known_file]), mock_db
+        )
+    ]
+
+    # The new file is never opened: its path does not even exist.
+    assert new_result.already_backed_up is False
+    assert new_result.hash is None
+    assert new_result.hash_algorithm == config.HASH_ALGORITHM_BLAKE2B
+    assert known_result.already_backed_up is True
+    assert known_result.hash == "b" * 40
@@ -0,0 +1,36 @@
+from backuper.components.compressibility import ExtensionRatioTable
+from backuper.models import CompressionRatio
+
+
+def test_extension_ratio_table_learns_running_mean() -> None:
+    table = ExtensionRatioTable(min_samples=2, max_ratio=0.9)
+
+    table.record(".bin", 1.0)
+    assert not table.known_incompressible(".bin")
+    table.record(".bin", 0.96)
+
+    assert table.known_incompressible(".bin")
+    assert table.changed_ratios() == {".bin": CompressionRatio(samples=2, ratio=0.98)}
+
+
+def test_extension_ratio_table_keeps_compressible_extensions_probed() -> None:
+    table = ExtensionRatioTable(
+        {".txt": CompressionRatio(samples=50, ratio=0.3)}, min_samples=2
+    )
+
+    assert not table.known_incompressible(".txt")
+    assert not table.known_incompressible(".unknown")
+
+
+def test_extension_ratio_table_reports_changes_only_after_seed() -> None:
+    table = ExtensionRatioTable()
+    table.seed({".jpg": CompressionRatio(samples=10, ratio=1.0)})
+
+    assert table.changed_ratios() == {}
+    assert table.known_incompressible(".jpg")
+
+    table.record(".txt", 0.2)
+    assert table.changed_ratios() == {
+        ".jpg": CompressionRatio(samples=10, ratio=1.0),
+        ".txt": CompressionRatio(samples=1, ratio=0.2),
+    }
@@ -1,10 +1,15 @@
+import os
+import time
 from pathlib import Path
 
+import backuper.components.file_reader as file_reader_module
 import pytest
 from backuper.components.file_reader import LocalFileReader
 from backuper.components.path_ignore import GitIgnorePathFilter
+from backuper.components.walk_snapshot import DirectorySnapshotStore
 from backuper.models import FileEntry
 from backuper.ports import PathFilter
+from backuper.utils.stats import BackupStats
 
 
 @pytest.mark.asyncio
@@ -255,3 +260,199 @@ async def test_local_file_reader_passes_normalized_roots_to_filter(
     assert all(
         source_root == normalized_root for source_root in path_filter.source_roots
     )
+
+
+def _build_nested_tree(root: Path) -> None:
+    (root / ".gitignore").write_text("*.log\nbuild/\n", encoding="utf-8")
+    for top in ("alpha", "beta", "gamma"):
+        for sub in ("one", "two"):
+            directory = root / top / sub
+            directory.mkdir(parents=True)
+            (directory / "data.txt").write_text(f"{top}/{sub}", encoding="utf-8")
+            (directory / "noise.log").write_text("noise", encoding="utf-8")
+        (root / top / "build").mkdir()
+        (root / top / "build" / "out.bin").write_bytes(b"\x00")
+    (root / "beta" / ".gitignore").write_text("!keep.log\n", encoding="utf-8")
+    (root / "beta" / "keep.log").write_text("keep", encoding="utf-8")
+    (root / "top.txt").write_text("top", encoding="utf-8")
+
+
+async def _walk(reader: LocalFileReader, root: Path) -> list[FileEntry]:
+    return [entry async for entry in reader.read_directory(root)]
+
+
+@pytest.mark.asyncio
+async def test_local_file_reader_parallel_walk_matches_sequential_order(
+    tmp_path: Path,
+) -> None:
+    _build_nested_tree(tmp_path)
+
+    sequential = await _walk(LocalFileReader(), tmp_path)
+    parallel = await _walk(LocalFileReader(walk_workers=4), tmp_path)
+
+    assert parallel == sequential
+    relative_paths = {entry.relative_path for entry in sequential}
+    assert Path("beta/keep.log") in relative_paths
+    assert Path("alpha/one/noise.log") not in relative_paths
+    assert Path("alpha/build") not in relative_paths
+    assert Path("gamma/two/data.txt") in relative_paths
+
+
+@pytest.mark.asyncio
+async def test_local_file_reader_parallel_walk_reports_same_metrics(
+    tmp_path: Path,
+) -> None:
+    _build_nested_tree(tmp_path)
+    sequential = LocalFileReader(collect_walk_metrics=True)
+    parallel = LocalFileReader(collect_walk_metrics=True, walk_workers=3)
+
+    await _walk(sequential, tmp_path)
+    await _walk(parallel, tmp_path)
+
+    assert parallel.get_last_walk_metrics() == sequential.get_last_walk_metrics()
+
+
+@pytest.mark.asyncio
+async def test_local_file_reader_entries_carry_stat_size_and_mtime(
+    tmp_path: Path,
+) -> None:
+    target = tmp_path / "file.txt"
+    target.write_bytes(b"12345")
+
+    [entry] = await _walk(LocalFileReader(), tmp_path)
+
+    assert entry.size == 5
+    assert entry.mtime == target.stat().st_mtime
+
+
+@pytest.mark.asyncio
+async def test_local_file_reader_does_not_follow_symlinked_directories(
+    tmp_path: Path,
+) -> None:
+    (tmp_path / "real").mkdir()
+    (tmp_path / "real" / "inner.txt").write_text("x", encoding="utf-8")
+    (tmp_path / "link").symlink_to(tmp_path / "real", target_is_directory=True)
+
+    entries = await _walk(LocalFileReader(walk_workers=2), tmp_path)
+
+    relative_paths = [entry.relative_path for entry in entries]
+    assert Path("link") in relative_paths
+    assert Path("real/inner.txt") in relative_paths
+    assert Path("link/inner.txt") not in relative_paths
+
+
+def test_local_file_reader_rejects_invalid_walk_workers() -> None:
+    with pytest.raises(ValueError, match="walk_workers"):
+        LocalFileReader(walk_workers=0)
+
+
+def _age_directories(root: Path) -> None:
+    """Backdate directory mtimes past the snapshot's racy-modification window."""
+    old_ns = time.time_ns() - 3600 * 1_000_000_000
+    for directory in [root, *(p for p in root.rglob("*") if p.is_dir())]:
+        os.utime(directory, ns=(old_ns, old_ns))
+
+
+class _CountingListings:
+    def __init__(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        self.listed: list[Path] = []
+        original = file_reader_module._list_directory
+
+        def counting(directory: Path):
+            self.listed.append(directory)
+            return original(directory)
+
+        monkeypatch.setattr(file_reader_module, "_list_directory", counting)
+
+
+@pytest.mark.asyncio
+async def test_local_file_reader_snapshot_skips_listing_unchanged_directories(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    source = tmp_path / "src"
+    source.mkdir()
+    _build_nested_tree(source)
+    _age_directories(source)
+    store = DirectorySnapshotStore(tmp_path / "walk_snapshot.sqlite3")
+    first = await _walk(LocalFileReader(snapshot_store=store), source)
+    listings = _CountingListings(monkeypatch)
+
+    (source / "alpha" / "one" / "data.txt").write_text("changed!", encoding="utf-8")
+    second = await _walk(LocalFileReader(snapshot_store=store), source)
+
+    assert listings.listed == []
+    assert [entry.relative_path for entry in second] == [
+        entry.relative_path for entry in first
+    ]
+    changed = next(
+        entry for entry in second if entry.relative_path == Path("alpha/one/data.txt")
+    )
+    assert changed.size == len("changed!")
+
+
+@pytest.mark.asyncio
+async def test_local_file_reader_snapshot_relists_changed_directories(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    source = tmp_path / "src"
+    source.mkdir()
+    _build_nested_tree(source)
+    _age_directories(source)
+    store = DirectorySnapshotStore(tmp_path / "walk_snapshot.sqlite3")
+    await _walk(LocalFileReader(snapshot_store=store, walk_workers=2), source)
+    listings = _CountingListings(monkeypatch)
+
+    (source / "gamma" / "two" / "added.txt").write_text("new", encoding="utf-8")
+    entries = await _walk(LocalFileReader(snapshot_store=store, walk_workers=2), source)
+
+    assert listings.listed == [source / "gamma" / "two"]
+    assert Path("gamma/two/added.txt") in {entry.relative_path for entry in entries}
+
+
+@pytest.mark.asyncio
+async def test_local_file_reader_snapshot_skips_recently_modified_directories(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (tmp_path / "fresh.txt").write_text("x", encoding="utf-8")
+    store = DirectorySnapshotStore(tmp_path.parent / f"{tmp_path.name}.sqlite3")
+    await _walk(LocalFileReader(snapshot_store=store), tmp_path)
+
+    assert store.load(tmp_path.absolute()) == {}
+
+
+@pytest.mark.asyncio
+async def test_local_file_reader_records_walk_stats(tmp_path: Path) -> None:
+    _build_nested_tree(tmp_path)
+    stats = BackupStats()
+
+    entries = await _walk(LocalFileReader(stats=stats), tmp_path)
+
+    counters = stats.counters()
+    files = [entry for entry in entries if not entry.is_directory]
+    assert counters["source_files"] == len(files)
+    assert counters["source_bytes"] == sum(entry.size for entry in files)
+    assert counters["source_directories"] == len(entries) - len(files)
+    assert "walk_snapshot_hits" not in counters
+    seconds = stats.phase_seconds()
+    assert seconds["walk"] >= 0.0
+    assert seconds["ignore"] > 0.0
+
+
+@pytest.mark.asyncio
+async def test_local_file_reader_parallel_walk_bounds_prefetched_listings(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for index in range(50):
+        child = tmp_path / f"dir{index:02d}"
+        child.mkdir()
+        (child / "file.txt").write_text("x", encoding="utf-8")
+    listings = _CountingListings(monkeypatch)
+    walk = LocalFileReader(walk_workers=2).read_directory(tmp_path)
+
+    async for entry in walk:
+        if not entry.is_directory:
+            break
+    await walk.aclose()
+
+    # The root listing plus at most walk_workers * 2 prefetched children.
+    assert len(listings.listed) <= 1 + 2 * 2
@@ -1,8 +1,18 @@
+import hashlib
+import os
 from pathlib import Path
-from zipfile import ZipFile
+from typing import Any
+from zipfile import ZIP_DEFLATED, ZipFile
 
+import pytest
 from backuper.components.filestore import LocalFileStore
-from backuper.config import FilestoreConfig
+from backuper.components.sqlite_db import SqliteBackupDatabase, SqliteDb
+from backuper.config import (
+    COMPRESSION_LEARN_MIN_SAMPLES,
+    FilestoreConfig,
+    SqliteDbConfig,
+)
+from backuper.models import CompressionRatio, PutRequest
 from backuper.utils.hashing import compute_hash
 from backuper.utils.paths import hash_to_stored_location
 
@@ -30,6 +40,7 @@ def test_local_filestore_put_and_dedup_exists_branch(tmp_path: Path) -> None:
     stored_file = backup_root / "data" / first.stored_location
     assert stored_file.exists()
     assert stored_file.read_bytes() == b"hello world"
+    assert sum(store.copy_strategy_counts().values()) == 1
 
 
 def test_local_filestore_put_compressed_content(tmp_path: Path) -> None:
@@ -75,6 +86,8 @@ def test_local_filestore_read_blob_part001_after_put(tmp_path: Path) -> None:
     stored = store.put(source, Path("doc.txt"))
     assert stored.is_compressed is True
     assert store.read_blob(stored.hash, True) == b"read via part001"
+    with store.open_blob(stored.hash, True) as blob:
+        assert blob.read() == b"read via part001"
 
 
 def test_local_filestore_read_blob_legacy_hash_named_zip(tmp_path: Path) -> None:
@@ -98,6 +111,8 @@ def test_local_filestore_read_blob_legacy_hash_named_zip(tmp_path: Path) -> None
     )
 
     assert store.read_blob(file_hash, True) == payload
+    with store.open_blob(file_hash, True) as blob:
+        assert blob.read() == payload
 
 
 def test_publish_staged_blob_discards_duplicate_staged_file(tmp_path: Path) -> None:
@@ -120,3 +135,590 @@ def test_publish_staged_blob_discards_duplicate_staged_file(tmp_path: Path) -> N
 
     assert not staged_blob_path.exists()
     assert content_address_path.read_bytes() == b"already present"
+
+
+@pytest.mark.asyncio
+async def test_local_filestore_put_many_preserves_order_and_dedups(
+    tmp_path: Path,
+) -> None:
+    sources = []
+    for i in range(12):
+        source = tmp_path / f"src{i}.txt"
+        # Pairs of files share content so concurrent puts race on the same hash.
+        source.write_bytes(f"content-{i // 2}".encode())
+        sources.append(source)
+
+    backup_root = tmp_path / "backup"
+    store = LocalFileStore(
+        FilestoreConfig(
+            backup_dir=str(backup_root),
+            zip_enabled=False,
+            put_concurrency=3,
+        )
+    )
+
+    results = await store.put_many(
+        [PutRequest(origin_file=src, restore_path=Path(src.name)) for src in sources]
+    )
+
+    assert [r.restore_path for r in results] == [src.name for src in sources]
+    assert [r.hash for r in results] == [compute_hash(src) for src in sources]
+    data_dir = backup_root / "data"
+    for source, result in zip(sources, results):
+        assert (data_dir / result.stored_location).read_bytes() == source.read_bytes()
+    assert not [p for p in data_dir.iterdir() if p.is_file()]
+
+
+def test_local_filestore_rejects_non_positive_put_concurrency(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="put_concurrency"):
+        LocalFileStore(FilestoreConfig(backup_dir=str(tmp_path), put_concurrency=0))
+
+
+def test_local_filestore_open_blob_streams_uncompressed_blob(tmp_path: Path) -> None:
+    source = tmp_path / "plain.bin"
+    source.write_bytes(b"plain payload")
+    store = LocalFileStore(
+        FilestoreConfig(backup_dir=str(tmp_path / "backup"), zip_enabled=False)
+    )
+
+    stored = store.put(source, Path("plain.bin"))
+
+    with store.open_blob(stored.hash, False) as blob:
+        assert blob.read(5) == b"plain"
+        assert blob.read() == b" payload"
+
+
+def test_local_filestore_put_uses_configured_hash_algorithm(tmp_path: Path) -> None:
+    source = tmp_path / "doc.txt"
+    source.write_bytes(b"hash me")
+    store = LocalFileStore(
+        FilestoreConfig(
+            backup_dir=str(tmp_path / "backup"),
+            zip_enabled=False,
+            hash_algorithm="blake2b",
+        )
+    )
+
+    stored = store.put(source, Path("doc.txt"))
+    legacy = store.put(source, Path("doc.txt"), hash_algorithm="sha1")
+
+    assert stored.hash == hashlib.blake2b(b"hash me", digest_size=32).hexdigest()
+    assert stored.hash_algorithm == "blake2b"
+    assert legacy.hash == hashlib.sha1(b"hash me").hexdigest()
+    assert legacy.hash_algorithm == "sha1"
+    with store.open_blob(stored.hash, False) as blob:
+        assert blob.read() == b"hash me"
+
+
+@pytest.mark.parametrize(
+    ("codec", "extension"),
+    [("zip", ".zip"), ("zlib", ".zz"), ("lzma", ".xz"), ("bz2", ".bz2")],
+)
+def test_local_filestore_compression_codecs_round_trip(
+    tmp_path: Path, codec: str, extension: str
+) -> None:
+    payload = b"backuper compresses repetitive text. " * 4000
+    source = tmp_path / "doc.txt"
+    source.write_bytes(payload)
+    backup_root = tmp_path / "backup"
+    store = LocalFileStore(
+        FilestoreConfig(
+            backup_dir=str(backup_root),
+            zip_min_filesize_in_bytes=1,
+            zip_skip_extensions=set(),
+            compression_codec=codec,
+            compression_level=9,
+        )
+    )
+
+    stored = store.put(source, Path("doc.txt"))
+
+    assert stored.is_compressed is True
+    assert stored.compression == codec
+    assert stored.stored_location.endswith(extension)
+    assert store.blob_exists(stored.hash, True, codec)
+    blob_path = backup_root / "data" / stored.stored_location
+    assert blob_path.stat().st_size < len(payload) // 10
+    assert store.read_blob(stored.hash, True, codec) == payload
+    with store.open_blob(stored.hash, True, codec) as blob:
+        assert blob.read(7) == payload[:7]
+        assert blob.read() == payload[7:]
+
+
+def test_local_filestore_zip_blobs_are_deflated(tmp_path: Path) -> None:
+    source = tmp_path / "doc.txt"
+    source.write_bytes(b"a" * 10_000)
+    backup_root = tmp_path / "backup"
+    store = LocalFileStore(
+        FilestoreConfig(
+            backup_dir=str(backup_root),
+            zip_min_filesize_in_bytes=1,
+            zip_skip_extensions=set(),
+        )
+    )
+
+    stored = store.put(source, Path("doc.txt"))
+
+    with ZipFile(backup_root / "data" / stored.stored_location) as zip_archive:
+        (info,) = zip_archive.infolist()
+    assert info.compress_type == ZIP_DEFLATED
+    assert info.compress_size < info.file_size
+
+
+@pytest.mark.parametrize(
+    ("codec", "level", "match"),
+    [("zstd", None, "codec"), ("zlib", 0, "level"), ("bz2", 10, "level")],
+)
+def test_local_filestore_rejects_invalid_compression(
+    tmp_path: Path, codec: str, level: int | None, match: str
+) -> None:
+    with pytest.raises(ValueError, match=match):
+        LocalFileStore(
+            FilestoreConfig(
+                backup_dir=str(tmp_path),
+                compression_codec=codec,
+                compression_level=level,
+            )
+        )
+
+
+def test_local_filestore_probe_decides_by_content_and_learns_extension(
+    tmp_path: Path,
+) -> None:
+    store = LocalFileStore(
+        FilestoreConfig(
+            backup_dir=str(tmp_path / "backup"),
+            zip_min_filesize_in_bytes=1,
+            compression_probe=True,
+        )
+    )
+    # Compressible despite an extension on the static skip list.
+    document = tmp_path / "report.docx"
+    document.write_bytes(b"<w:p>plain paragraph</w:p>" * 1000)
+    assert store.put(document, Path("report.docx")).is_compressed is True
+
+    for index in range(COMPRESSION_LEARN_MIN_SAMPLES):
+        noise = tmp_path / f"blob{index}.Parquet"
+        noise.write_bytes(os.urandom(4096))
+        assert store.put(noise, Path(noise.name)).is_compressed is False
+
+    learned = store.learned_compression_ratios()
+    assert learned[".parquet"].samples == COMPRESSION_LEARN_MIN_SAMPLES
+    assert learned[".docx"].ratio < 0.5
+
+    # Known-incompressible extensions are no longer probed, whatever the content.
+    compressible = tmp_path / "late.parquet"
+    compressible.write_bytes(b"a" * 4096)
+    assert store.is_compression_eligible(compressible) is False
+    assert store.learned_compression_ratios()[".parquet"].samples == (
+        COMPRESSION_LEARN_MIN_SAMPLES
+    )
+
+
+def test_local_filestore_seeded_ratios_skip_probe(tmp_path: Path) -> None:
+    store = LocalFileStore(
+        FilestoreConfig(
+            backup_dir=str(tmp_path / "backup"),
+            zip_min_filesize_in_bytes=1,
+            compression_probe=True,
+        )
+    )
+    store.seed_compression_ratios(
+        {".log": CompressionRatio(samples=COMPRESSION_LEARN_MIN_SAMPLES, ratio=0.99)}
+    )
+    source = tmp_path / "app.log"
+    source.write_bytes(b"repeated line\n" * 1000)
+
+    assert store.is_compression_eligible(source) is False
+    assert store.learned_compression_ratios() == {}
+
+
+@pytest.mark.parametrize("zip_enabled", [False, True])
+def test_local_filestore_put_without_hash_reads_source_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, zip_enabled: bool
+) -> None:
+    source = tmp_path / "doc.txt"
+    source.write_bytes(b"single pass " * 500)
+    store = LocalFileStore(
+        FilestoreConfig(
+            backup_dir=str(tmp_path / "backup"),
+            zip_enabled=zip_enabled,
+            zip_min_filesize_in_bytes=1,
+        )
+    )
+    opened: list[Path] = []
+    real_open = open
+
+    def recording_open(file, *args, **kwargs):  # type: ignore[no-untyped-def]
+        if Path(file) == source:
+            opened.append(source)
+        return real_open(file, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", recording_open)
+
+    stored = store.put(source, Path("doc.txt"))
+
+    monkeypatch.undo()
+    assert len(opened) == 1
+    assert stored.hash == compute_hash(source)
+    assert stored.is_compressed is zip_enabled
+    assert store.read_blob(stored.hash, stored.is_compressed) == source.read_bytes()
+    data_dir = tmp_path / "backup" / "data"
+    assert not [p for p in data_dir.iterdir() if p.is_file()]
+
+
+@pytest.mark.parametrize(
+    ("zip_enabled", "writer"), [(False, "copy_file"), (True, "compress_file")]
+)
+def test_local_filestore_put_removes_staged_blob_when_write_fails(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, zip_enabled: bool, writer: str
+) -> None:
+    source = tmp_path / "doc.txt"
+    source.write_bytes(b"never published " * 500)
+    backup_root = tmp_path / "backup"
+    store = LocalFileStore(
+        FilestoreConfig(
+            backup_dir=str(backup_root),
+            zip_enabled=zip_enabled,
+            zip_min_filesize_in_bytes=1,
+        )
+    )
+
+    def failing_write(origin_file: Any, staged_blob_path: Path, **kwargs: Any) -> str:
+        staged_blob_path.write_bytes(b"partial")
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(f"backuper.components.filestore.{writer}", failing_write)
+
+    with pytest.raises(OSError, match="No space left"):
+        store.put(source, Path("doc.txt"), precomputed_hash="a" * 40)
+
+    assert not list(backup_root.rglob("*.tmp"))
+
+
+def test_local_filestore_put_without_hash_reuses_blob_in_another_layout(
+    tmp_path: Path,
+) -> None:
+    source = tmp_path / "doc.txt"
+    source.write_bytes(b"stored once " * 500)
+    backup_dir = str(tmp_path / "backup")
+    raw_store = LocalFileStore(
+        FilestoreConfig(backup_dir=backup_dir, zip_enabled=False)
+    )
+    zip_store = LocalFileStore(
+        FilestoreConfig(
+            backup_dir=backup_dir, zip_min_filesize_in_bytes=1, compression_codec="lzma"
+        )
+    )
+
+    first = raw_store.put(source, Path("doc.txt"))
+    second = zip_store.put(source, Path("copy/doc.txt"))
+
+    assert second.hash == first.hash
+    assert second.stored_location == first.stored_location
+    assert (second.is_compressed, second.compression) == (False, "none")
+    assert second.restore_path == "copy/doc.txt"
+    assert len([p for p in (tmp_path / "backup").rglob("*") if p.is_file()]) == 1
+
+
+def _packing_store(
+    backup_root: Path, *, pack_target_size: int = 1 << 20, **config: Any
+) -> LocalFileStore:
+    sqlite_db = SqliteDb(SqliteDbConfig(backup_dir=str(backup_root)))
+    return LocalFileStore(
+        FilestoreConfig(
+            backup_dir=str(backup_root),
+            pack_threshold=4096,
+            pack_target_size=pack_target_size,
+            **config,
+        ),
+        pack_index=SqliteBackupDatabase(sqlite_db).pack_index(),
+    )
+
+
+def test_local_filestore_packs_small_files_into_one_pack(tmp_path: Path) -> None:
+    backup_root = tmp_path / "backup"
+    store = _packing_store(backup_root, zip_enabled=False)
+    contents = [b"first", b"second small file", b"first"]
+    sources = []
+    for index, content in enumerate(contents):
+        source = tmp_path / f"f{index}.txt"
+        source.write_bytes(content)
+        sources.append(source)
+    large = tmp_path / "large.bin"
+    large.write_bytes(os.urandom(5000))
+
+    results = [store.put(source, Path(source.name)) for source in sources]
+    large_result = store.put(large, Path("large.bin"))
+
+    packs = list((backup_root / "data" / "packs").iterdir())
+    assert len(packs) == 1
+    assert packs[0].read_bytes() == b"firstsecond small file"
+    assert {result.stored_location for result in results} == {f"packs/{packs[0].name}"}
+    assert results[2].hash == results[0].hash == compute_hash(sources[0])
+    assert large_result.stored_location == hash_to_stored_location(
+        large_result.hash, False
+    )
+    for source, result in zip(sources, results):
+        assert store.read_blob(result.hash, False) == source.read_bytes()
+        with store.open_blob(result.hash, False) as blob:
+            assert blob.read() == source.read_bytes()
+        assert store.blob_exists(result.hash, False)
+
+
+@pytest.mark.parametrize("codec", ["zip", "zlib"])
+def test_local_filestore_compresses_packed_blobs(tmp_path: Path, codec: str) -> None:
+    backup_root = tmp_path / "backup"
+    store = _packing_store(
+        backup_root, zip_min_filesize_in_bytes=16, compression_codec=codec
+    )
+    source = tmp_path / "settings.ini"
+    source.write_bytes(b"key = value\n" * 300)
+
+    result = store.put(source, Path("settings.ini"), precomputed_hash="a" * 40)
+
+    (pack,) = (backup_root / "data" / "packs").iterdir()
+    assert (result.is_compressed, result.compression) == (True, codec)
+    assert pack.stat().st_size < source.stat().st_size
+    assert store.read_blob("a" * 40, True, codec) == source.read_bytes()
+    assert store.blob_exists("a" * 40, True, codec)
+    assert not store.blob_exists("a" * 40, False)
+
+
+@pytest.mark.asyncio
+async def test_local_filestore_put_many_commits_pack_index_once_per_batch(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    backup_root = tmp_path / "backup"
+    store = _packing_store(backup_root, zip_enabled=False)
+    pack_index = store._pack_index
+    assert pack_index is not None
+    commits: list[int] = []
+    real_add_many = pack_index.add_many
+
+    def recording_add_many(blobs: Any) -> None:
+        commits.append(len(blobs))
+        real_add_many(blobs)
+
+    monkeypatch.setattr(pack_index, "add_many", recording_add_many)
+    requests = []
+    for index in range(5):
+        source = tmp_path / f"f{index}.txt"
+        source.write_bytes(f"small file {index}".encode())
+        requests.append(PutRequest(origin_file=source, restore_path=Path(source.name)))
+
+    results = await store.put_many(requests)
+
+    assert commits == [5]
+    for request, result in zip(requests, results):
+        assert pack_index.find(result.hash) is not None
+        assert (
+            store.read_blob(result.hash, False, stored_location=result.stored_location)
+            == request.origin_file.read_bytes()
+        )
+
+
+def test_local_filestore_seals_full_packs_and_resumes_open_one(
+    tmp_path: Path,
+) -> None:
+    backup_root = tmp_path / "backup"
+    first_store = _packing_store(backup_root, zip_enabled=False, pack_target_size=10)
+    for index, content in enumerate([b"0123456789ab", b"xyz"]):
+        source = tmp_path / f"f{index}.txt"
+        source.write_bytes(content)
+        first_store.put(source, Path(source.name))
+
+    later = tmp_path / "later.txt"
+    later.write_bytes(b"later")
+    result = _packing_store(backup_root, zip_enabled=False, pack_target_size=10).put(
+        later, Path("later.txt")
+    )
+
+    packs = sorted(
+        (backup_root / "data" / "packs").iterdir(), key=lambda p: p.stat().st_size
+    )
+    assert [pack.read_bytes() for pack in packs] == [b"xyzlater", b"0123456789ab"]
+    assert result.stored_location == f"packs/{packs[0].name}"
+
+
+def test_local_filestore_single_pass_small_file_reuses_unpacked_blob(
+    tmp_path: Path,
+) -> None:
+    backup_root = tmp_path / "backup"
+    source = tmp_path / "doc.txt"
+    source.write_bytes(b"stored before packing")
+    loose = LocalFileStore(
+        FilestoreConfig(backup_dir=str(backup_root), zip_enabled=False)
+    ).put(source, Path("doc.txt"))
+
+    packed = _packing_store(backup_root, zip_enabled=False).put(source, Path("b.txt"))
+
+    assert packed.stored_location == loose.stored_location
+    assert not (backup_root / "data" / "packs").exists()
+
+
+def test_local_filestore_single_pass_reuses_packed_and_inline_blobs(
+    tmp_path: Path,
+) -> None:
+    backup_root = tmp_path / "backup"
+    db = SqliteBackupDatabase(SqliteDb(SqliteDbConfig(backup_dir=str(backup_root))))
+    packed_source = tmp_path / "small.txt"
+    packed_source.write_bytes(b"packed earlier")
+    inline_source = tmp_path / ".rc"
+    inline_source.write_bytes(b"x")
+    earlier = LocalFileStore(
+        FilestoreConfig(
+            backup_dir=str(backup_root),
+            zip_enabled=False,
+            inline_threshold=2,
+            pack_threshold=4096,
+        ),
+        pack_index=db.pack_index(),
+        inline_store=db.inline_blob_store(),
+    )
+    packed = earlier.put(packed_source, Path("small.txt"))
+    inlined = earlier.put(inline_source, Path(".rc"))
+    store = LocalFileStore(
+        FilestoreConfig(backup_dir=str(backup_root), zip_enabled=False),
+        pack_index=db.pack_index(),
+        inline_store=db.inline_blob_store(),
+    )
+
+    results = [
+        store.put(packed_source, Path("copy/small.txt")),
+        store.put(inline_source, Path("copy/.rc")),
+    ]
+
+    assert [result.stored_location for result in results] == [
+        packed.stored_location,
+        inlined.stored_location,
+    ]
+    data_dir = backup_root / "data"
+    assert [p for p in data_dir.rglob("*") if p.is_file()] == list(
+        (data_dir / "packs").iterdir()
+    )
+    db.close()
+
+
+def test_local_filestore_rejects_pack_threshold_without_index(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="pack_index"):
+        LocalFileStore(FilestoreConfig(backup_dir=str(tmp_path), pack_threshold=1))
+
+
+def test_local_filestore_inlines_tiny_files(tmp_path: Path) -> None:
+    backup_root = tmp_path / "backup"
+    db = SqliteBackupDatabase(SqliteDb(SqliteDbConfig(backup_dir=str(backup_root))))
+    store = LocalFileStore(
+        FilestoreConfig(
+            backup_dir=str(backup_root), inline_threshold=64, pack_threshold=4096
+        ),
+        pack_index=db.pack_index(),
+        inline_store=db.inline_blob_store(),
+    )
+    tiny = tmp_path / ".npmrc"
+    tiny.write_bytes(b"save-exact=true\n")
+
+    first = store.put(tiny, Path(".npmrc"))
+    second = store.put(tiny, Path("copy/.npmrc"), precomputed_hash=first.hash)
+
+    assert first.hash == compute_hash(tiny)
+    assert first.stored_location == second.stored_location == f"inline:{first.hash}"
+    assert (first.is_compressed, first.compression) == (False, "none")
+    assert not [p for p in (backup_root / "data").rglob("*") if p.is_file()]
+    assert store.exists(first.stored_location)
+    assert not store.exists(f"inline:{'0' * 40}")
+    assert store.blob_exists(first.hash, False)
+    assert store.read_blob(first.hash, False) == tiny.read_bytes()
+    with store.open_blob(first.hash, False) as blob:
+        assert blob.read() == tiny.read_bytes()
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_local_filestore_put_many_stores_inline_blobs_once_per_batch(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    backup_root = tmp_path / "backup"
+    db = SqliteBackupDatabase(SqliteDb(SqliteDbConfig(backup_dir=str(backup_root))))
+    inline_store = db.inline_blob_store()
+    store = LocalFileStore(
+        FilestoreConfig(backup_dir=str(backup_root), inline_threshold=64),
+        inline_store=inline_store,
+    )
+    commits: list[int] = []
+    real_put_many = inline_store.put_many
+
+    def recording_put_many(blobs: Any) -> None:
+        commits.append(len(blobs))
+        real_put_many(blobs)
+
+    monkeypatch.setattr(inline_store, "put_many", recording_put_many)
+    requests = []
+    for index in range(4):
+        source = tmp_path / f".rc{index}"
+        source.write_bytes(b"shared\n" if index % 2 else f"rc {index}\n".encode())
+        requests.append(PutRequest(origin_file=source, restore_path=Path(source.name)))
+
+    results = await store.put_many(requests)
+
+    assert commits == [3]
+    for request, result in zip(requests, results):
+        assert inline_store.get(result.hash) == request.origin_file.read_bytes()
+    db.close()
+
+
+def test_local_filestore_reads_only_the_storage_named_by_location(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    backup_root = tmp_path / "backup"
+    db = SqliteBackupDatabase(SqliteDb(SqliteDbConfig(backup_dir=str(backup_root))))
+    pack_index = db.pack_index()
+    inline_store = db.inline_blob_store()
+    assert pack_index is not None and inline_store is not None
+    store = LocalFileStore(
+        FilestoreConfig(
+            backup_dir=str(backup_root),
+            zip_enabled=False,
+            inline_threshold=16,
+            pack_threshold=4096,
+        ),
+        pack_index=pack_index,
+        inline_store=inline_store,
+    )
+    sources = {
+        "tiny": b"x = 1\n",
+        "small": b"small packed file",
+        "large": os.urandom(5000),
+    }
+    results = {}
+    for name, content in sources.items():
+        (tmp_path / name).write_bytes(content)
+        results[name] = store.put(tmp_path / name, Path(name))
+    lookups: list[str] = []
+    real_find, real_get = pack_index.find, inline_store.get
+    monkeypatch.setattr(
+        pack_index, "find", lambda h: lookups.append("pack") or real_find(h)
+    )
+    monkeypatch.setattr(
+        inline_store, "get", lambda h: lookups.append("inline") or real_get(h)
+    )
+
+    read = {
+        name: store.read_blob(
+            result.hash, False, stored_location=result.stored_location
+        )
+        for name, result in results.items()
+    }
+
+    assert read == sources
+    assert lookups == ["inline", "pack"]
+    with pytest.raises(FileNotFoundError):
+        store.read_blob(results["large"].hash, False, stored_location="packs/other")
+    db.close()
+
+
+def test_local_filestore_rejects_inline_threshold_without_store(
+    tmp_path: Path,
+) -> None:
+    with pytest.raises(ValueError, match="inline_store"):
+        LocalFileStore(FilestoreConfig(backup_dir=str(tmp_path), inline_threshold=1))
@@ -2,6 +2,7 @@ from pathlib import Path
 
 from backuper.components.path_ignore import GitIgnorePathFilter, IgnoreMatchResolution
 from backuper.models import FileEntry
+from pathspec.patterns.gitwildmatch import GitIgnoreSpecPattern
 
 
 def _entry(
@@ -234,3 +235,79 @@ def test_exclusion_reason_ignore_file_label(tmp_path: Path) -> None:
     assert path_filter.exclusion_reason(entry, source_root=source_root) == (
         "excluded by nested/.gitignore"
     )
+
+
+def _reference_resolution(
+    layers: list[tuple[str, list[str]]], relative_path: str, *, is_directory: bool
+) -> IgnoreMatchResolution:
+    """Per-pattern last-match evaluation straight from pathspec."""
+    resolution = IgnoreMatchResolution(is_ignored=False, source_label=None)
+    for label, lines in layers:
+        for line in lines:
+            pattern = GitIgnoreSpecPattern(line)
+            if pattern.include is None:
+                continue
+            if pattern.match_file(relative_path) or (
+                is_directory and pattern.match_file(f"{relative_path}/")
+            ):
+                resolution = IgnoreMatchResolution(
+                    is_ignored=bool(pattern.include), source_label=label
+                )
+    return resolution
+
+
+def test_compiled_rules_match_per_pattern_last_match(tmp_path: Path) -> None:
+    user_lines = ["*.tmp", "cache/", "!keep.tmp"]
+    root_lines = ["*.pyc", "node_modules/", "/build", "docs/**/*.md", "!docs/README.md"]
+    nested_lines = ["*.log", "!important.log", "keep.tmp", "out?/", "**/deep"]
+    source_root = tmp_path / "source"
+    nested = source_root / "pkg"
+    nested.mkdir(parents=True)
+    (source_root / ".gitignore").write_text("\n".join(root_lines), encoding="utf-8")
+    (nested / ".backupignore").write_text("\n".join(nested_lines), encoding="utf-8")
+    path_filter = GitIgnorePathFilter(user_patterns=user_lines)
+    path_filter.prepare_walk_directory(nested, source_root=source_root)
+    layers = [
+        ("user", user_lines),
+        (".gitignore", root_lines),
+        ("pkg/.backupignore", nested_lines),
+    ]
+
+    candidates = [
+        ("pkg/a.pyc", False),
+        ("pkg/keep.tmp", False),
+        ("pkg/other.tmp", False),
+        ("pkg/cache", True),
+        ("pkg/cache", False),
+        ("pkg/node_modules", True),
+        ("pkg/build", True),
+        ("pkg/app.log", False),
+        ("pkg/important.log", False),
+        ("pkg/out1", True),
+        ("pkg/out1", False),
+        ("pkg/deep", True),
+        ("pkg/main.py", False),
+    ]
+    for relative_path, is_directory in candidates:
+        entry = _entry(source_root, relative_path, is_directory=is_directory)
+        assert path_filter.ignore_match_resolution(
+            entry, source_root=source_root
+        ) == _reference_resolution(layers, relative_path, is_directory=is_directory), (
+            relative_path
+        )
+
+
+def test_compiled_rules_accept_absolute_relative_paths(tmp_path: Path) -> None:
+    source_root = tmp_path / "source"
+    source_root.mkdir()
+    (source_root / ".gitignore").write_text("*.pyc\n", encoding="utf-8")
+    path_filter = GitIgnorePathFilter()
+    entry = FileEntry(
+        path=source_root / "mod.pyc",
+        relative_path=source_root / "mod.pyc",
+        size=0,
+        mtime=0.0,
+    )
+    assert path_filter.exclusion_reason(entry, source_root=source_root) == (
+        "excluded by .gitignore"
+    )
@@ -103,3 +103,21 @@ def test_stdout_analysis_reporter_skips_progress_when_no_files(capsys) -> None:
     reporter = StdoutAnalysisReporter()
     reporter.report_file_progress(0, 0)
     assert capsys.readouterr().out == ""
+
+
+def test_stdout_analysis_reporter_prints_running_summary(capsys) -> None:
+    reporter = StdoutAnalysisReporter()
+    summary = BackupAnalysisSummary(
+        version_name="v1",
+        num_directories=1,
+        num_files=40,
+        total_file_size=1234,
+        files_to_backup=7,
+    )
+
+    reporter.report_running_summary(summary, 12)
+
+    assert (
+        capsys.readouterr().out
+        == "Processed 12 of 40 files analyzed so far (7 to backup)...\n"
+    )
@@ -1,4 +1,5 @@
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import closing
 from pathlib import Path
 from uuid import UUID
@@ -15,7 +16,13 @@ from backuper.config import (
     SqliteDbConfig,
     sqlite_db_config,
 )
-from backuper.models import BackedUpFileEntry, FileEntry, VersionNotFoundError
+from backuper.models import (
+    BackedUpFileEntry,
+    CompressionRatio,
+    FileEntry,
+    PackedBlob,
+    VersionNotFoundError,
+)
 
 
 def _table_names(db_path: Path) -> set[str]:
@@ -34,7 +41,7 @@ def _index_names(db_path: Path) -> set[str]:
     return {row[0] for row in rows}
 
 
-def test_bootstrap_creates_schema_v1_and_sets_user_version(tmp_path: Path) -> None:
+def test_bootstrap_creates_schema_v4_and_sets_user_version(tmp_path: Path) -> None:
     db = SqliteDb(SqliteDbConfig(backup_dir=str(tmp_path)))
 
     assert db.db_path.exists()
@@ -52,14 +59,20 @@ def test_bootstrap_creates_schema_v1_and_sets_user_version(tmp_path: Path) -> No
     assert journal_mode is not None
     assert synchronous is not None
     assert busy_timeout is not None
-    assert user_version[0] == 1
+    assert user_version[0] == 4
     assert foreign_keys[0] == 1
     assert journal_mode[0] == "wal"
     assert synchronous[0] == 1
     assert busy_timeout[0] == SQLITE_BUSY_TIMEOUT_MS
-    assert {"versions", "version_files", "version_directories"} <= _table_names(
-        db.db_path
-    )
+    assert {
+        "versions",
+        "version_files",
+        "version_directories",
+        "compression_ratios",
+        "packs",
+        "packed_blobs",
+        "inline_blobs",
+    } <= _table_names(db.db_path)
     assert {
         "idx_versions_state_created_name",
         "idx_version_files_hash",
@@ -137,10 +150,40 @@ def test_bootstrap_reopen_is_idempotent_and_preserves_data(tmp_path: Path) -> No
         ).fetchall()
 
     assert user_version is not None
-    assert user_version[0] == 1
+    assert user_version[0] == 4
     assert [tuple(row) for row in rows] == [("v1", "pending", 1700000000.0)]
 
 
+def test_bootstrap_upgrades_v1_manifest_to_v4(tmp_path: Path) -> None:
+    first = SqliteDb(SqliteDbConfig(backup_dir=str(tmp_path)))
+    with first.connect() as conn:
+        conn.execute("DROP TABLE compression_ratios")
+        conn.execute("DROP TABLE inline_blobs")
+        conn.execute("DROP TABLE packed_blobs")
+        conn.execute("DROP TABLE packs")
+        conn.execute("PRAGMA user_version=1")
+        conn.execute(
+            "INSERT INTO versions(name, state, created_at) VALUES (?, ?, ?)",
+            ("v1", "completed", 1700000000.0),
+        )
+        conn.commit()
+    first.close()
+
+    second = SqliteDb(SqliteDbConfig(backup_dir=str(tmp_path)))
+    with second.connect() as conn:
+        user_version = conn.execute("PRAGMA user_version").fetchone()
+        names = conn.execute("SELECT name FROM versions").fetchall()
+
+    assert user_version[0] == 4
+    assert [row[0] for row in names] == ["v1"]
+    assert {
+        "compression_ratios",
+        "packs",
+        "packed_blobs",
+        "inline_blobs",
+    } <= _table_names(second.db_path)
+
+
 @pytest.mark.asyncio
 async def test_sqlite_backup_database_pending_hidden_until_complete(
     tmp_path: Path,
@@ -364,3 +407,384 @@ async def test_sqlite_backup_database_cannot_add_file_to_completed_version(
                 hash="h2",
             ),
         )
+
+
+def _backed_up_entry(
+    relative_path: str, *, is_directory: bool = False, hash_value: str = "h"
+) -> BackedUpFileEntry:
+    return BackedUpFileEntry(
+        source_file=FileEntry(
+            path=Path("/src") / relative_path,
+            relative_path=Path(relative_path),
+            size=0 if is_directory else 1,
+            mtime=0.0 if is_directory else 1.0,
+            is_directory=is_directory,
+        ),
+        backup_id=UUID("88888888-8888-8888-8888-888888888888"),
+        stored_location="" if is_directory else f"data/{hash_value}",
+        is_compressed=False,
+        hash="" if is_directory else hash_value,
+    )
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backup_database_add_files_preserves_order_per_table(
+    tmp_path: Path,
+) -> None:
+    db = SqliteBackupDatabase(SqliteDb(SqliteDbConfig(backup_dir=str(tmp_path))))
+    version = "v-batch"
+    await db.create_version(version)
+    await db.add_files(
+        version,
+        [
+            _backed_up_entry("b.txt", hash_value="hb"),
+            _backed_up_entry("d2", is_directory=True),
+            _backed_up_entry("a.txt", hash_value="ha"),
+            _backed_up_entry("d1", is_directory=True),
+        ],
+    )
+    await db.add_files(version, [])
+    await db.complete_version(version)
+
+    items = [item async for item in db.list_files(version)]
+
+    assert [item.relative_path for item in items] == [
+        Path("b.txt"),
+        Path("a.txt"),
+        Path("d2"),
+        Path("d1"),
+    ]
+    assert [item.hash for item in items[:2]] == ["hb", "ha"]
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backup_database_add_files_rejects_completed_version_atomically(
+    tmp_path: Path,
+) -> None:
+    sqlite_db = SqliteDb(SqliteDbConfig(backup_dir=str(tmp_path)))
+    db = SqliteBackupDatabase(sqlite_db)
+    version = "v-done"
+    await db.create_version(version)
+    await db.complete_version(version)
+
+    with pytest.raises(ValueError, match="completed"):
+        await db.add_files(
+            version,
+            [_backed_up_entry("a.txt"), _backed_up_entry("d", is_directory=True)],
+        )
+
+    with sqlite_db.connect() as conn:
+        file_count = conn.execute("SELECT COUNT(*) FROM version_files").fetchone()
+        dir_count = conn.execute("SELECT COUNT(*) FROM version_directories").fetchone()
+    assert file_count[0] == 0
+    assert dir_count[0] == 0
+
+
+def test_sqlite_db_connection_is_shared_until_closed(tmp_path: Path) -> None:
+    db = SqliteDb(SqliteDbConfig(backup_dir=str(tmp_path)))
+
+    first = db.connection()
+    assert db.connection() is first
+    assert first.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    db.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        first.execute("SELECT 1")
+
+    reopened = db.connection()
+    assert reopened is not first
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backup_database_context_manager_closes_connection(
+    tmp_path: Path,
+) -> None:
+    sqlite_db = SqliteDb(SqliteDbConfig(backup_dir=str(tmp_path)))
+    with SqliteBackupDatabase(sqlite_db) as db:
+        await db.create_version("v1")
+        await db.complete_version("v1")
+        conn = sqlite_db.connection()
+        assert await db.list_versions() == ["v1"]
+        assert sqlite_db.connection() is conn
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backup_database_hash_lookup_is_per_algorithm(
+    tmp_path: Path,
+) -> None:
+    db = SqliteBackupDatabase(SqliteDb(SqliteDbConfig(backup_dir=str(tmp_path))))
+    await db.create_version("v1")
+    await db.add_file(
+        "v1",
+        BackedUpFileEntry(
+            source_file=FileEntry(
+                path=Path("/src/doc.txt"),
+                relative_path=Path("doc.txt"),
+                size=10,
+                mtime=10.0,
+                is_directory=False,
+            ),
+            backup_id=UUID("55555555-5555-5555-5555-555555555555"),
+            stored_location="data/blake",
+            is_compressed=False,
+            hash="h1",
+            hash_algorithm="blake2b",
+        ),
+    )
+    await db.complete_version("v1")
+
+    assert await db.get_files_by_hash("h1") == []
+    by_hash = await db.get_files_by_hash("h1", "blake2b")
+    by_metadata = await db.get_files_by_metadata(Path("doc.txt"), 10.0, 10)
+    listed = [item async for item in db.list_files("v1")]
+
+    assert [entry.hash_algorithm for entry in by_hash] == ["blake2b"]
+    assert [entry.hash_algorithm for entry in by_metadata] == ["blake2b"]
+    assert [entry.hash_algorithm for entry in listed] == ["blake2b"]
+
+
+def _file_entry_for(relative_path: str, *, size: int, mtime: float, hash: str):
+    return BackedUpFileEntry(
+        source_file=FileEntry(
+            path=Path("/src") / relative_path,
+            relative_path=Path(relative_path),
+            size=size,
+            mtime=mtime,
+            is_directory=False,
+        ),
+        backup_id=UUID("66666666-6666-6666-6666-666666666666"),
+        stored_location=f"data/{hash}",
+        is_compressed=True,
+        hash=hash,
+    )
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backup_database_preloaded_metadata_index_answers_from_memory(
+    tmp_path: Path,
+) -> None:
+    sqlite_db = SqliteDb(SqliteDbConfig(backup_dir=str(tmp_path)))
+    db = SqliteBackupDatabase(sqlite_db)
+    await db.create_version("v1")
+    await db.add_files(
+        "v1",
+        [
+            _file_entry_for("old-only.txt", size=1, mtime=1.0, hash="h-old"),
+            _file_entry_for("doc.txt", size=10, mtime=10.0, hash="h-v1"),
+        ],
+    )
+    await db.complete_version("v1")
+    await db.create_version("v2")
+    await db.add_files(
+        "v2", [_file_entry_for("doc.txt", size=10, mtime=10.0, hash="h-v2")]
+    )
+    await db.complete_version("v2")
+
+    await db.preload_metadata_index()
+    # Hits must come from the index: drop the rows it was built from.
+    with sqlite_db.connection() as conn:
+        conn.execute("DELETE FROM version_files WHERE version_name = 'v2'")
+        conn.commit()
+
+    hit = await db.get_files_by_metadata(Path("doc.txt"), 10.0005, 10)
+    assert [entry.hash for entry in hit] == ["h-v2"]
+    assert hit[0].stored_location == "data/h-v2"
+    assert hit[0].is_compressed is True
+    assert hit[0].source_file.relative_path == Path("doc.txt")
+
+    size_miss = await db.get_files_by_metadata(Path("doc.txt"), 10.0, 11)
+    assert size_miss == []
+    older_version = await db.get_files_by_metadata(Path("old-only.txt"), 1.0, 1)
+    assert [entry.hash for entry in older_version] == ["h-old"]
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backup_database_preload_without_versions_is_empty(
+    tmp_path: Path,
+) -> None:
+    with SqliteBackupDatabase(SqliteDb(SqliteDbConfig(backup_dir=str(tmp_path)))) as db:
+        await db.preload_metadata_index()
+        assert await db.get_files_by_metadata(Path("doc.txt"), 1.0, 1) == []
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backup_database_preloaded_hash_index_answers_from_memory(
+    tmp_path: Path,
+) -> None:
+    sqlite_db = SqliteDb(SqliteDbConfig(backup_dir=str(tmp_path)))
+    db = SqliteBackupDatabase(sqlite_db)
+    await db.create_version("v1")
+    await db.add_files(
+        "v1",
+        [
+            _file_entry_for("first.txt", size=1, mtime=1.0, hash="h-shared"),
+            _file_entry_for("second.txt", size=1, mtime=1.0, hash="h-shared"),
+        ],
+    )
+    await db.complete_version("v1")
+
+    await db.preload_hash_index()
+    with sqlite_db.connection() as conn:
+        conn.execute("DELETE FROM version_files")
+        conn.commit()
+
+    known = await db.get_files_by_hash("h-shared")
+    assert [entry.source_file.relative_path for entry in known] == [Path("first.txt")]
+    assert known[0].stored_location == "data/h-shared"
+    assert await db.get_files_by_hash("h-shared", "blake2b") == []
+    assert await db.get_files_by_hash("h-unknown") == []
+
+    await db.create_version("v2")
+    await db.add_files(
+        "v2", [_file_entry_for("new.txt", size=2, mtime=2.0, hash="h-new")]
+    )
+    assert await db.get_files_by_hash("h-new") == []
+    await db.complete_version("v2")
+
+    added = await db.get_files_by_hash("h-new")
+    assert [entry.source_file.relative_path for entry in added] == [Path("new.txt")]
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backup_database_list_files_pages_with_interleaved_writes(
+    tmp_path: Path,
+) -> None:
+    db = SqliteBackupDatabase(
+        SqliteDb(SqliteDbConfig(backup_dir=str(tmp_path))), list_page_size=2
+    )
+    await db.create_version("v1")
+    await db.add_files(
+        "v1",
+        [
+            _backed_up_entry(f"f{index}.txt", hash_value=f"h{index}")
+            for index in range(5)
+        ]
+        + [_backed_up_entry(f"d{index}", is_directory=True) for index in range(3)],
+    )
+    await db.complete_version("v1")
+    await db.create_version("v2")
+
+    listed = []
+    async for item in db.list_files("v1"):
+        listed.append(item.relative_path)
+        # The shared connection stays usable between pages.
+        await db.add_file("v2", _backed_up_entry(f"v2-{len(listed)}.txt"))
+
+    assert listed == [Path(f"f{index}.txt") for index in range(5)] + [
+        Path(f"d{index}") for index in range(3)
+    ]
+
+
+def test_sqlite_backup_database_rejects_non_positive_list_page_size(
+    tmp_path: Path,
+) -> None:
+    with pytest.raises(ValueError, match="list_page_size"):
+        SqliteBackupDatabase(
+            SqliteDb(SqliteDbConfig(backup_dir=str(tmp_path))), list_page_size=0
+        )
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backup_database_records_compression_codec(
+    tmp_path: Path,
+) -> None:
+    db = SqliteBackupDatabase(SqliteDb(SqliteDbConfig(backup_dir=str(tmp_path))))
+    await db.create_version("v1")
+    legacy = _backed_up_entry("legacy.txt", hash_value="h1")
+    await db.add_files(
+        "v1",
+        [
+            BackedUpFileEntry(
+                source_file=legacy.source_file,
+                backup_id=legacy.backup_id,
+                stored_location="data/h1.zip",
+                is_compressed=True,
+                hash="h1",
+            ),
+            BackedUpFileEntry(
+                source_file=_backed_up_entry("new.txt").source_file,
+                backup_id=legacy.backup_id,
+                stored_location="data/h2.bz2",
+                is_compressed=True,
+                hash="h2",
+                compression="bz2",
+            ),
+        ],
+    )
+    await db.complete_version("v1")
+
+    listed = [item async for item in db.list_files("v1")]
+    (by_hash,) = await db.get_files_by_hash("h2")
+
+    assert [(item.is_compressed, item.compression) for item in listed] == [
+        (True, "zip"),
+        (True, "bz2"),
+    ]
+    assert (by_hash.is_compressed, by_hash.compression) == (True, "bz2")
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backup_database_saves_and_loads_compression_ratios(
+    tmp_path: Path,
+) -> None:
+    db = SqliteBackupDatabase(SqliteDb(SqliteDbConfig(backup_dir=str(tmp_path))))
+    assert await db.load_compression_ratios() == {}
+
+    await db.save_compression_ratios(
+        {
+            ".txt": CompressionRatio(samples=3, ratio=0.25),
+            ".jpg": CompressionRatio(1, 1.0),
+        }
+    )
+    await db.save_compression_ratios({".jpg": CompressionRatio(samples=9, ratio=0.99)})
+
+    assert await db.load_compression_ratios() == {
+        ".jpg": CompressionRatio(samples=9, ratio=0.99),
+        ".txt": CompressionRatio(samples=3, ratio=0.25),
+    }
+
+
+def test_sqlite_pack_index_records_blobs_and_seals_packs(tmp_path: Path) -> None:
+    db = SqliteBackupDatabase(SqliteDb(SqliteDbConfig(backup_dir=str(tmp_path))))
+    index = db.pack_index()
+    blob = PackedBlob(
+        hash="a" * 40, compression="none", pack="pack-1.pack", offset=0, length=5
+    )
+
+    assert index.find(blob.hash) is None
+    assert index.unsealed_pack() is None
+    # File stores call the index from worker threads.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(index.add_many, [blob]).result()
+    index.add_many([blob])
+
+    assert index.find(blob.hash) == blob
+    assert index.unsealed_pack() == "pack-1.pack"
+    index.seal("pack-1.pack")
+    assert index.unsealed_pack() is None
+    assert db.pack_index() is index
+
+    db.close()
+    reopened = SqliteBackupDatabase(SqliteDb(SqliteDbConfig(backup_dir=str(tmp_path))))
+    assert reopened.pack_index().find(blob.hash) == blob
+    reopened.close()
+
+
+def test_sqlite_inline_blob_store_keeps_first_content_per_hash(tmp_path: Path) -> None:
+    db = SqliteBackupDatabase(SqliteDb(SqliteDbConfig(backup_dir=str(tmp_path))))
+    store = db.inline_blob_store()
+
+    assert store.get("a" * 40) is None
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(store.put_many, {"a" * 40: b"tiny\x00file"}).result()
+    store.put_many({"a" * 40: b"ignored duplicate"})
+
+    assert store.get("a" * 40) == b"tiny\x00file"
+    assert db.inline_blob_store() is store
+    db.close()
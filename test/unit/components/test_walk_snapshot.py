@@ -0,0 +1,84 @@
+from pathlib import Path
+
+import pytest
+from backuper.components.walk_snapshot import (
+    DirectorySnapshotStore,
+    SnapshotChild,
+    SnapshotDirectory,
+)
+
+
+def _snapshot() -> dict[str, SnapshotDirectory]:
+    return {
+        ".": SnapshotDirectory(
+            inode=10,
+            mtime_ns=1_000,
+            children=(
+                SnapshotChild(name="a.txt", is_directory=False),
+                SnapshotChild(name="sub", is_directory=True),
+                SnapshotChild(name="link", is_directory=True, is_symlink=True),
+            ),
+        ),
+        "sub": SnapshotDirectory(inode=11, mtime_ns=2_000, children=()),
+    }
+
+
+def test_snapshot_store_round_trips_directories(tmp_path: Path) -> None:
+    store = DirectorySnapshotStore(tmp_path / "db" / "walk_snapshot.sqlite3")
+    source_root = tmp_path / "src"
+
+    store.save(source_root, _snapshot())
+
+    assert store.load(source_root) == _snapshot()
+    assert not store.path.with_name(f"{store.path.name}.tmp").exists()
+
+
+def test_snapshot_store_round_trips_undecodable_names(tmp_path: Path) -> None:
+    store = DirectorySnapshotStore(tmp_path / "walk_snapshot.sqlite3")
+    name = "caf\udce9"
+    directories = {
+        name: SnapshotDirectory(
+            inode=1,
+            mtime_ns=1,
+            children=(SnapshotChild(name=name, is_directory=False),),
+        )
+    }
+
+    store.save(tmp_path, directories)
+
+    assert store.load(tmp_path) == directories
+
+
+def test_snapshot_store_ignores_other_source_root(tmp_path: Path) -> None:
+    store = DirectorySnapshotStore(tmp_path / "walk_snapshot.sqlite3")
+    store.save(tmp_path / "one", _snapshot())
+
+    assert store.load(tmp_path / "two") == {}
+
+
+def test_snapshot_store_missing_file_loads_empty(tmp_path: Path) -> None:
+    assert DirectorySnapshotStore(tmp_path / "absent.sqlite3").load(tmp_path) == {}
+
+
+def test_snapshot_store_unreadable_file_loads_empty(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    path = tmp_path / "walk_snapshot.sqlite3"
+    path.write_bytes(b"not a database")
+
+    assert DirectorySnapshotStore(path).load(tmp_path) == {}
+    assert "Ignoring unreadable walk snapshot" in caplog.text
+
+
+def test_snapshot_matches_inode_and_mtime(tmp_path: Path) -> None:
+    directory_stat = tmp_path.stat()
+    snapshot = SnapshotDirectory(
+        inode=directory_stat.st_ino, mtime_ns=directory_stat.st_mtime_ns, children=()
+    )
+
+    assert snapshot.matches(directory_stat)
+    assert not SnapshotDirectory(
+        inode=directory_stat.st_ino,
+        mtime_ns=directory_stat.st_mtime_ns + 1,
+        children=(),
+    ).matches(directory_stat)
@@ -1,3 +1,4 @@
+import os
 from collections.abc import AsyncIterator
 from pathlib import Path
 from uuid import UUID
@@ -9,7 +10,11 @@ from backuper.components.filestore import LocalFileStore
 from backuper.components.path_ignore import NullPathFilter
 from backuper.components.reporter import NoOpAnalysisReporter
 from backuper.components.sqlite_db import SqliteBackupDatabase, SqliteDb
-from backuper.config import FilestoreConfig, SqliteDbConfig
+from backuper.config import (
+    COMPRESSION_LEARN_MIN_SAMPLES,
+    FilestoreConfig,
+    SqliteDbConfig,
+)
 from backuper.controllers.backup import (
     _iterate_analyzed_entries,
     add_version,
@@ -17,6 +22,7 @@ from backuper.controllers.backup import (
 )
 from backuper.models import (
     AnalyzedFileEntry,
+    BackedUpFileEntry,
     BackupAnalysisSummary,
     FileEntry,
     VersionAlreadyExistsError,
@@ -149,6 +155,9 @@ class _DbStub(BackupDatabase):
     def __init__(self, *, fail_on_add_file: bool = False) -> None:
         self.fail_on_add_file = fail_on_add_file
         self.completed_versions: list[str] = []
+        self.added_batches: list[list[str]] = []
+        self.preloaded = False
+        self.preloaded_hashes = False
 
     async def list_versions(self):
         return []
@@ -174,9 +183,21 @@ class _DbStub(BackupDatabase):
     async def complete_version(self, version: str) -> None:
         self.completed_versions.append(version)
 
-    async def get_files_by_hash(self, hash: str):
+    async def add_files(self, version: str, entries) -> None:
+        self.added_batches.append(
+            [str(entry.source_file.relative_path) for entry in entries]
+        )
+        await super().add_files(version, entries)
+
+    async def get_files_by_hash(self, hash: str, hash_algorithm: str = "sha1"):
         return []
 
+    async def preload_metadata_index(self) -> None:
+        self.preloaded = True
+
+    async def preload_hash_index(self) -> None:
+        self.preloaded_hashes = True
+
     async def get_files_by_metadata(self, relative_path: Path, mtime: float, size: int):
         return []
 
@@ -204,6 +225,7 @@ class _RecordingBackupReporter(AnalysisReporter):
         self.started = False
         self.summaries: list[BackupAnalysisSummary] = []
         self.progress: list[tuple[int, int]] = []
+        self.running: list[tuple[int, int]] = []
 
     def report_analysis_start(self) -> None:
         self.started = True
@@ -217,6 +239,11 @@ class _RecordingBackupReporter(AnalysisReporter):
     def report_file_progress(self, file_index: int, total_files: int) -> None:
         self.progress.append((file_index, total_files))
 
+    def report_running_summary(
+        self, summary: BackupAnalysisSummary, files_processed: int
+    ) -> None:
+        self.running.append((files_processed, summary.num_files))
+
 
 @pytest.mark.asyncio
 async def test_iterate_analyzed_entries_yields_analyzed_entries(tmp_path: Path) -> None:
@@ -366,3 +393,303 @@ async def test_add_version_does_not_mark_version_completed_on_failure(
         )
 
     assert db.completed_versions == []
+
+
+class _ManyFilesReaderStub(FileReader):
+    def __init__(self, count: int) -> None:
+        self.count = count
+
+    async def read_directory(self, path: Path) -> AsyncIterator[FileEntry]:
+        for i in range(self.count):
+            yield FileEntry(
+                path=path / f"f{i}.txt",
+                relative_path=Path(f"f{i}.txt"),
+                size=1,
+                mtime=100.0,
+                is_directory=False,
+            )
+
+
+@pytest.mark.asyncio
+async def test_backup_writes_manifest_rows_in_walk_order_batches(
+    tmp_path: Path,
+) -> None:
+    source = tmp_path / "source"
+    source.mkdir()
+    for i in range(5):
+        (source / f"f{i}.txt").write_bytes(b"x")
+    db = _DbStub()
+
+    await add_version(
+        source,
+        "v-batches",
+        file_reader=_ManyFilesReaderStub(5),
+        analyzer=_AnalyzerStub(),
+        db=db,
+        filestore=LocalFileStore(
+            FilestoreConfig(backup_dir=str(tmp_path / "backup"), zip_enabled=False)
+        ),
+        reporter=_CollectingReporter(),
+        manifest_batch_size=2,
+    )
+
+    assert db.added_batches == [
+        ["f0.txt", "f1.txt"],
+        ["f2.txt", "f3.txt"],
+        ["f4.txt"],
+    ]
+    assert db.completed_versions == ["v-batches"]
+
+
+@pytest.mark.asyncio
+async def test_backup_rejects_non_positive_manifest_batch_size(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="manifest_batch_size"):
+        await add_version(
+            tmp_path,
+            "v-bad",
+            file_reader=_ReaderStub(),
+            analyzer=_AnalyzerStub(),
+            db=_DbStub(),
+            filestore=LocalFileStore(
+                FilestoreConfig(backup_dir=str(tmp_path / "backup"), zip_enabled=False)
+            ),
+            reporter=_CollectingReporter(),
+            manifest_batch_size=0,
+        )
+
+
+@pytest.mark.asyncio
+async def test_streaming_backup_matches_buffered_manifest(tmp_path: Path) -> None:
+    source = tmp_path / "source"
+    (source / "sub").mkdir(parents=True)
+    (source / "a.txt").write_bytes(b"alpha")
+    (source / "sub" / "b.txt").write_bytes(b"alpha")
+    (source / "sub" / "c.txt").write_bytes(b"gamma")
+
+    manifests = []
+    for streaming in (False, True):
+        backup_root = tmp_path / f"backup-{streaming}"
+        db = SqliteBackupDatabase(SqliteDb(SqliteDbConfig(backup_dir=str(backup_root))))
+        recording = _RecordingBackupReporter()
+        await new_backup(
+            source,
+            "v1",
+            file_reader=LocalFileReader(path_filter=NullPathFilter()),
+            analyzer=BackupAnalyzerImpl(),
+            db=db,
+            filestore=LocalFileStore(
+                FilestoreConfig(backup_dir=str(backup_root), zip_enabled=False)
+            ),
+            reporter=recording,
+            manifest_batch_size=2,
+            streaming=streaming,
+        )
+        manifests.append(
+            [
+                (item.relative_path, item.hash, item.is_directory)
+                async for item in db.list_files("v1")
+            ]
+        )
+        assert recording.started is True
+        assert len(recording.summaries) == 1
+        assert recording.summaries[0].num_files == 3
+        if streaming:
+            assert recording.progress == []
+            assert recording.running[0][0] == 0
+        else:
+            assert recording.running == []
+
+    assert manifests[0] == manifests[1]
+
+
+class _FailingAnalyzerStub(BackupAnalyzer):
+    async def analyze_stream(
+        self, entries: AsyncIterator[FileEntry], backup_database: BackupDatabase
+    ) -> AsyncIterator[AnalyzedFileEntry]:
+        async for entry in entries:
+            yield AnalyzedFileEntry(source_file=entry, hash="hash123")
+        raise RuntimeError("simulated analysis failure")
+
+
+@pytest.mark.asyncio
+async def test_streaming_backup_propagates_analysis_failure(tmp_path: Path) -> None:
+    source = tmp_path / "source"
+    source.mkdir()
+    (source / "file.txt").write_text("payload", encoding="utf-8")
+    db = _DbStub()
+
+    with pytest.raises(RuntimeError, match="simulated analysis failure"):
+        await add_version(
+            source,
+            "v-fail",
+            file_reader=_ReaderStub(),
+            analyzer=_FailingAnalyzerStub(),
+            db=db,
+            filestore=LocalFileStore(
+                FilestoreConfig(backup_dir=str(tmp_path / "backup"), zip_enabled=False)
+            ),
+            reporter=_CollectingReporter(),
+            streaming=True,
+        )
+
+    assert db.added_batches == [["file.txt"]]
+    assert db.completed_versions == []
+
+
+@pytest.mark.asyncio
+async def test_streaming_backup_stops_analysis_when_storage_fails(
+    tmp_path: Path,
+) -> None:
+    source = tmp_path / "source"
+    source.mkdir()
+    for i in range(5):
+        (source / f"f{i}.txt").write_bytes(b"x")
+    db = _DbStub(fail_on_add_file=True)
+
+    with pytest.raises(RuntimeError, match="simulated write failure"):
+        await add_version(
+            source,
+            "v-fail",
+            file_reader=_ManyFilesReaderStub(5),
+            analyzer=_AnalyzerStub(),
+            db=db,
+            filestore=LocalFileStore(
+                FilestoreConfig(backup_dir=str(tmp_path / "backup"), zip_enabled=False)
+            ),
+            reporter=_CollectingReporter(),
+            manifest_batch_size=1,
+            streaming=True,
+        )
+
+    assert db.completed_versions == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("preload", [False, True])
+async def test_add_version_preloads_indexes_only_when_requested(
+    tmp_path: Path, preload: bool
+) -> None:
+    source = tmp_path / "source"
+    source.mkdir()
+    (source / "file.txt").write_text("payload", encoding="utf-8")
+    db = _DbStub()
+
+    await add_version(
+        source,
+        "v-preload",
+        file_reader=_ReaderStub(),
+        analyzer=_AnalyzerStub(),
+        db=db,
+        filestore=LocalFileStore(
+            FilestoreConfig(backup_dir=str(tmp_path / "backup"), zip_enabled=False)
+        ),
+        reporter=_CollectingReporter(),
+        preload_metadata=preload,
+        preload_hashes=preload,
+    )
+
+    assert db.preloaded is preload
+    assert db.preloaded_hashes is preload
+
+
+class _CarryingAnalyzerStub(BackupAnalyzer):
+    async def analyze_stream(
+        self, entries: AsyncIterator[FileEntry], backup_database: BackupDatabase
+    ) -> AsyncIterator[AnalyzedFileEntry]:
+        async for entry in entries:
+            yield AnalyzedFileEntry(
+                source_file=entry,
+                hash="hash123",
+                already_backed_up=True,
+                backup_id=UUID("12345678-1234-5678-1234-567812345678"),
+                stored_location="h/a/s/h/hash123.zip",
+                is_compressed=True,
+            )
+
+
+class _NoHashLookupDbStub(_DbStub):
+    def __init__(self) -> None:
+        super().__init__()
+        self.written: list[BackedUpFileEntry] = []
+
+    async def add_files(self, version: str, entries) -> None:
+        self.written.extend(entries)
+
+    async def get_files_by_hash(self, hash: str, hash_algorithm: str = "sha1"):
+        raise AssertionError("matched blob should come from the analyzed entry")
+
+
+@pytest.mark.asyncio
+async def test_backup_reuses_matched_blob_from_analysis_without_hash_lookup(
+    tmp_path: Path,
+) -> None:
+    source = tmp_path / "source"
+    source.mkdir()
+    db = _NoHashLookupDbStub()
+
+    await add_version(
+        source,
+        "v-carry",
+        file_reader=_ReaderStub(),
+        analyzer=_CarryingAnalyzerStub(),
+        db=db,
+        filestore=LocalFileStore(
+            FilestoreConfig(backup_dir=str(tmp_path / "backup"), zip_enabled=False)
+        ),
+        reporter=_CollectingReporter(),
+    )
+
+    assert [entry.stored_location for entry in db.written] == ["h/a/s/h/hash123.zip"]
+    assert db.written[0].is_compressed is True
+    assert db.written[0].backup_id == UUID("12345678-1234-5678-1234-567812345678")
+    assert db.completed_versions == ["v-carry"]
+
+
+@pytest.mark.asyncio
+async def test_backup_persists_learned_compression_ratios_between_runs(
+    tmp_path: Path,
+) -> None:
+    source = tmp_path / "source"
+    source.mkdir()
+    for index in range(COMPRESSION_LEARN_MIN_SAMPLES):
+        (source / f"random{index}.dat").write_bytes(os.urandom(4096))
+    backup_root = tmp_path / "backup"
+    db = SqliteBackupDatabase(SqliteDb(SqliteDbConfig(backup_dir=str(backup_root))))
+
+    def probing_filestore() -> LocalFileStore:
+        return LocalFileStore(
+            FilestoreConfig(
+                backup_dir=str(backup_root),
+                zip_min_filesize_in_bytes=1,
+                compression_probe=True,
+            )
+        )
+
+    await new_backup(
+        source,
+        "v1",
+        file_reader=LocalFileReader(path_filter=NullPathFilter()),
+        analyzer=BackupAnalyzerImpl(),
+        db=db,
+        filestore=probing_filestore(),
+        reporter=NoOpAnalysisReporter(),
+    )
+    learned = await db.load_compression_ratios()
+    assert learned[".dat"].samples == COMPRESSION_LEARN_MIN_SAMPLES
+
+    (source / "text.dat").write_bytes(b"compressible but a known-random type " * 200)
+    filestore = probing_filestore()
+    await add_version(
+        source,
+        "v2",
+        file_reader=LocalFileReader(path_filter=NullPathFilter()),
+        analyzer=BackupAnalyzerImpl(),
+        db=db,
+        filestore=filestore,
+        reporter=NoOpAnalysisReporter(),
+    )
+
+    assert filestore.learned_compression_ratios() == {}
+    assert await db.load_compression_ratios() == learned
+    stored = [entry async for entry in db.list_files("v2")]
+    assert not any(entry.is_compressed for entry in stored)
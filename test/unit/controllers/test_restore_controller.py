@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import io
 import logging
 from collections.abc import AsyncIterator
 from pathlib import Path
+from typing import IO
 
 import pytest
 from backuper.commands import RestoreCommand
@@ -17,13 +19,30 @@ from backuper.models import (
 )
 
 
+class _BytesBlobStore:
+    """Fake file stores define ``read_blob``; restore streams via ``open_blob``."""
+
+    def read_blob(self, file_hash: str, is_compressed: bool) -> bytes:
+        raise NotImplementedError
+
+    def open_blob(
+        self,
+        file_hash: str,
+        is_compressed: bool,
+        compression: str | None = None,
+        *,
+        stored_location: str | None = None,
+    ) -> IO[bytes]:
+        return io.BytesIO(self.read_blob(file_hash, is_compressed))
+
+
 @pytest.mark.asyncio
 async def test_run_restore_flow_raises_when_version_missing(tmp_path: Path) -> None:
     class FakeDb:
         async def get_version_by_name(self, name: str) -> str:
             raise VersionNotFoundError(name)
 
-    class FakeFileStore:
+    class FakeFileStore(_BytesBlobStore):
         def read_blob(self, file_hash: str, is_compressed: bool) -> bytes:
             raise AssertionError("unreachable")
 
@@ -61,7 +80,7 @@ async def test_run_restore_flow_skips_when_file_hash_missing(
                 is_compressed=False,
             )
 
-    class FakeFileStore:
+    class FakeFileStore(_BytesBlobStore):
         def read_blob(self, file_hash: str, is_compressed: bool) -> bytes:
             raise AssertionError("unreachable")
 
@@ -109,7 +128,7 @@ async def test_run_restore_flow_mixed_good_and_missing_hash(
                 is_compressed=False,
             )
 
-    class FakeFileStore:
+    class FakeFileStore(_BytesBlobStore):
         def read_blob(self, file_hash: str, is_compressed: bool) -> bytes:
             assert file_hash == "deadbeef"
             return b"ok"
@@ -151,7 +170,7 @@ async def test_run_restore_flow_writes_file_and_makes_dirs(tmp_path: Path) -> No
                 is_compressed=False,
             )
 
-    class FakeFileStore:
+    class FakeFileStore(_BytesBlobStore):
         def read_blob(self, file_hash: str, is_compressed: bool) -> bytes:
             assert file_hash == "deadbeef"
             assert is_compressed is False
@@ -187,7 +206,7 @@ async def test_run_restore_flow_invokes_on_restore_file(tmp_path: Path) -> None:
                 is_compressed=False,
             )
 
-    class FakeFileStore:
+    class FakeFileStore(_BytesBlobStore):
         def read_blob(self, file_hash: str, is_compressed: bool) -> bytes:
             return b"x"
 
@@ -226,7 +245,7 @@ async def test_run_restore_flow_rejects_path_outside_destination(
                 is_compressed=False,
             )
 
-    class FakeFileStore:
+    class FakeFileStore(_BytesBlobStore):
         def read_blob(self, file_hash: str, is_compressed: bool) -> bytes:
             return b"x"
 
@@ -242,3 +261,163 @@ async def test_run_restore_flow_rejects_path_outside_destination(
             db=FakeDb(),
             filestore=FakeFileStore(),
         )
+
+
+class _ManyFilesDb:
+    def __init__(self, count: int) -> None:
+        self._count = count
+
+    async def get_version_by_name(self, name: str) -> str:
+        return "v1"
+
+    async def list_files(self, version: str) -> AsyncIterator[FileEntry]:
+        for index in range(self._count):
+            relative_path = Path(f"d{index % 3}") / f"f{index}.txt"
+            yield FileEntry(
+                path=relative_path,
+                relative_path=relative_path,
+                size=1,
+                mtime=0.0,
+                is_directory=False,
+                hash=f"h{index}",
+                is_compressed=False,
+            )
+        yield FileEntry(
+            path=Path("empty"),
+            relative_path=Path("empty"),
+            size=0,
+            mtime=0.0,
+            is_directory=True,
+        )
+
+
+class _HashEchoFileStore(_BytesBlobStore):
+    def read_blob(self, file_hash: str, is_compressed: bool) -> bytes:
+        return file_hash.encode()
+
+
+@pytest.mark.asyncio
+async def test_run_restore_flow_with_jobs_restores_every_file(tmp_path: Path) -> None:
+    dest = tmp_path / "out"
+    seen: list[Path] = []
+
+    await run_restore_flow(
+        RestoreCommand(
+            location=str(tmp_path),
+            destination=str(dest),
+            version_name="v1",
+            jobs=4,
+        ),
+        db=_ManyFilesDb(20),
+        filestore=_HashEchoFileStore(),
+        on_restore_file=seen.append,
+    )
+
+    assert seen == [Path(f"d{i % 3}") / f"f{i}.txt" for i in range(20)]
+    for index in range(20):
+        restored = dest / f"d{index % 3}" / f"f{index}.txt"
+        assert restored.read_bytes() == f"h{index}".encode()
+    assert (dest / "empty").is_dir()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("jobs", [1, 2])
+async def test_run_restore_flow_streams_manifest_rows(
+    tmp_path: Path, jobs: int
+) -> None:
+    dest = tmp_path / "out"
+    restored = [dest / f"d{i % 3}" / f"f{i}.txt" for i in range(12)]
+
+    class StreamCheckingDb(_ManyFilesDb):
+        async def list_files(self, version: str) -> AsyncIterator[FileEntry]:
+            index = 0
+            async for entry in super().list_files(version):
+                # Rows are pulled only as earlier files are written.
+                assert sum(path.exists() for path in restored[:index]) >= index - jobs
+                index += 1
+                yield entry
+
+    await run_restore_flow(
+        RestoreCommand(
+            location=str(tmp_path),
+            destination=str(dest),
+            version_name="v1",
+            jobs=jobs,
+        ),
+        db=StreamCheckingDb(len(restored)),
+        filestore=_HashEchoFileStore(),
+    )
+
+    assert all(path.exists() for path in restored)
+    assert (dest / "empty").is_dir()
+
+
+@pytest.mark.asyncio
+async def test_run_restore_flow_with_jobs_propagates_read_errors(
+    tmp_path: Path,
+) -> None:
+    class FailingFileStore(_BytesBlobStore):
+        def read_blob(self, file_hash: str, is_compressed: bool) -> bytes:
+            if file_hash == "h5":
+                raise OSError("blob unreadable")
+            return b"x"
+
+    with pytest.raises(OSError, match="blob unreadable"):
+        await run_restore_flow(
+            RestoreCommand(
+                location=str(tmp_path),
+                destination=str(tmp_path / "out"),
+                version_name="v1",
+                jobs=3,
+            ),
+            db=_ManyFilesDb(10),
+            filestore=FailingFileStore(),
+        )
+
+
+@pytest.mark.asyncio
+async def test_run_restore_flow_rejects_non_positive_jobs(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="jobs must be at least 1"):
+        await run_restore_flow(
+            RestoreCommand(
+                location=str(tmp_path),
+                destination=str(tmp_path / "out"),
+                version_name="v1",
+                jobs=0,
+            ),
+            db=_ManyFilesDb(1),
+            filestore=_HashEchoFileStore(),
+        )
+
+
+@pytest.mark.asyncio
+async def test_run_restore_flow_streams_blob_and_closes_it(tmp_path: Path) -> None:
+    opened: list[io.BytesIO] = []
+
+    class StreamingFileStore:
+        def open_blob(
+            self,
+            file_hash: str,
+            is_compressed: bool,
+            compression: str | None = None,
+            *,
+            stored_location: str | None = None,
+        ) -> IO[bytes]:
+            stream = io.BytesIO(b"chunk" * 1000)
+            opened.append(stream)
+            return stream
+
+    dest = tmp_path / "out"
+    await run_restore_flow(
+        RestoreCommand(
+            location=str(tmp_path),
+            destination=str(dest),
+            version_name="v1",
+        ),
+        db=_ManyFilesDb(1),
+        filestore=StreamingFileStore(),
+    )
+
+    assert (dest / "d0" / "f0.txt").read_bytes() == b"chunk" * 1000
+    assert len(opened) == 1
+    assert opened[0].closed
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import pytest
+from backuper import config
 from backuper.commands import (
     NewCommand,
     RestoreCommand,
@@ -23,6 +24,7 @@ def test_parse_new_command() -> None:
     assert cmd.version == "my-version"
     assert cmd.ignore_patterns == ()
     assert cmd.ignore_files == ()
+    assert cmd.hash_workers == 1
 
 
 def test_parse_update_command() -> None:
@@ -91,6 +93,81 @@ def test_parse_new_ignore_pattern_and_file_together() -> None:
     assert cmd.ignore_files == ("extra.ignore",)
 
 
+def test_parse_new_and_update_hash_workers() -> None:
+    new_cmd, _ = argparser.parse(["new", "/src", "/dst", "--hash-workers", "8"])
+    update_cmd, _ = argparser.parse(["update", "/src", "/dst", "--hash-workers", "3"])
+    assert isinstance(new_cmd, NewCommand)
+    assert isinstance(update_cmd, UpdateCommand)
+    assert new_cmd.hash_workers == 8
+    assert update_cmd.hash_workers == 3
+
+
+def test_parse_new_and_update_put_workers() -> None:
+    default_cmd, _ = argparser.parse(["new", "/src", "/dst"])
+    new_cmd, _ = argparser.parse(["new", "/src", "/dst", "--put-workers", "16"])
+    update_cmd, _ = argparser.parse(["update", "/src", "/dst", "--put-workers", "2"])
+    assert isinstance(default_cmd, NewCommand)
+    assert isinstance(new_cmd, NewCommand)
+    assert isinstance(update_cmd, UpdateCommand)
+    assert default_cmd.put_workers == config.PUT_CONCURRENCY
+    assert new_cmd.put_workers == 16
+    assert update_cmd.put_workers == 2
+
+
+def test_parse_new_and_update_streaming_flag() -> None:
+    default_cmd, _ = argparser.parse(["new", "/src", "/dst"])
+    new_cmd, _ = argparser.parse(["new", "/src", "/dst", "--streaming"])
+    update_cmd, _ = argparser.parse(["update", "/src", "/dst", "--streaming"])
+    assert isinstance(default_cmd, NewCommand)
+    assert isinstance(new_cmd, NewCommand)
+    assert isinstance(update_cmd, UpdateCommand)
+    assert default_cmd.streaming is False
+    assert new_cmd.streaming is True
+    assert update_cmd.streaming is True
+
+
+def test_parse_new_and_update_walk_workers() -> None:
+    default_cmd, _ = argparser.parse(["new", "/src", "/dst"])
+    new_cmd, _ = argparser.parse(["new", "/src", "/dst", "--walk-workers", "4"])
+    update_cmd, _ = argparser.parse(["update", "/src", "/dst", "--walk-workers", "2"])
+    assert isinstance(default_cmd, NewCommand)
+    assert isinstance(new_cmd, NewCommand)
+    assert isinstance(update_cmd, UpdateCommand)
+    assert default_cmd.walk_workers == 1
+    assert new_cmd.walk_workers == 4
+    assert update_cmd.walk_workers == 2
+
+
+def test_parse_new_and_update_walk_snapshot_flag() -> None:
+    default_cmd, _ = argparser.parse(["new", "/src", "/dst"])
+    new_cmd, _ = argparser.parse(["new", "/src", "/dst", "--walk-snapshot"])
+    update_cmd, _ = argparser.parse(["update", "/src", "/dst", "--walk-snapshot"])
+    assert isinstance(default_cmd, NewCommand)
+    assert isinstance(new_cmd, NewCommand)
+    assert isinstance(update_cmd, UpdateCommand)
+    assert default_cmd.walk_snapshot is False
+    assert new_cmd.walk_snapshot is True
+    assert update_cmd.walk_snapshot is True
+
+
+def test_parse_new_and_update_stats_flags() -> None:
+    default_cmd, _ = argparser.parse(["new", "/src", "/dst"])
+    new_cmd, _ = argparser.parse(["new", "/src", "/dst", "--stats"])
+    update_cmd, _ = argparser.parse(["update", "/src", "/dst", "--stats-json"])
+    assert isinstance(default_cmd, NewCommand)
+    assert isinstance(new_cmd, NewCommand)
+    assert isinstance(update_cmd, UpdateCommand)
+    assert (default_cmd.stats, default_cmd.stats_json) == (False, False)
+    assert (new_cmd.stats, new_cmd.stats_json) == (True, False)
+    assert (update_cmd.stats, update_cmd.stats_json) == (False, True)
+
+
+@pytest.mark.parametrize("value", ["0", "-2", "many"])
+def test_parse_rejects_invalid_hash_workers(value: str) -> None:
+    with pytest.raises(SystemExit):
+        argparser.parse(["new", "/src", "/dst", "--hash-workers", value])
+
+
 def test_parse_verify_integrity_all_versions() -> None:
     cmd, quiet = argparser.parse(["verify-integrity", "/backup/root"])
     assert isinstance(cmd, VerifyIntegrityCommand)
@@ -142,3 +219,97 @@ def test_parse_restore_command() -> None:
     assert cmd.location == "/backup/root"
     assert cmd.destination == "/restore/here"
     assert cmd.version_name == "release-1"
+    assert cmd.jobs == 1
+
+
+def test_parse_restore_jobs() -> None:
+    cmd, _ = argparser.parse(
+        ["restore", "/backup/root", "/restore/here", "-v", "release-1", "--jobs", "8"]
+    )
+    assert isinstance(cmd, RestoreCommand)
+    assert cmd.jobs == 8
+
+    with pytest.raises(SystemExit):
+        argparser.parse(
+            ["restore", "/backup/root", "/restore/here", "-v", "r", "--jobs", "0"]
+        )
+
+
+def test_parse_new_and_update_hash_algorithm() -> None:
+    default_cmd, _ = argparser.parse(["new", "/src", "/dst"])
+    new_cmd, _ = argparser.parse(["new", "/src", "/dst", "--hash-algorithm", "blake2b"])
+    update_cmd, _ = argparser.parse(
+        ["update", "/src", "/dst", "--hash-algorithm", "sha1"]
+    )
+    assert default_cmd.hash_algorithm == config.DEFAULT_HASH_ALGORITHM
+    assert new_cmd.hash_algorithm == "blake2b"
+    assert update_cmd.hash_algorithm == "sha1"
+
+    with pytest.raises(SystemExit):
+        argparser.parse(["new", "/src", "/dst", "--hash-algorithm", "md5"])
+
+
+def test_parse_new_and_update_compression() -> None:
+    default_cmd, _ = argparser.parse(["new", "/src", "/dst"])
+    new_cmd, _ = argparser.parse(
+        ["new", "/src", "/dst", "--compression", "lzma", "--compression-level", "9"]
+    )
+    update_cmd, _ = argparser.parse(["update", "/src", "/dst", "--compression", "zlib"])
+    assert default_cmd.compression == config.DEFAULT_COMPRESSION_CODEC
+    assert default_cmd.compression_level is None
+    assert (new_cmd.compression, new_cmd.compression_level) == ("lzma", 9)
+    assert (update_cmd.compression, update_cmd.compression_level) == ("zlib", None)
+    assert default_cmd.compression_probe is False
+    probe_cmd, _ = argparser.parse(["update", "/src", "/dst", "--compression-probe"])
+    assert probe_cmd.compression_probe is True
+
+    with pytest.raises(SystemExit):
+        argparser.parse(["new", "/src", "/dst", "--compression", "zstd"])
+    with pytest.raises(SystemExit):
+        argparser.parse(["new", "/src", "/dst", "--compression-level", "10"])
+
+
+def test_parse_update_preload_flags() -> None:
+    default_cmd, _ = argparser.parse(["update", "/src", "/dst"])
+    preload_cmd, _ = argparser.parse(
+        ["update", "/src", "/dst", "--preload-metadata", "--preload-hashes"]
+    )
+    assert default_cmd.preload_metadata is False
+    assert default_cmd.preload_hashes is False
+    assert preload_cmd.preload_metadata is True
+    assert preload_cmd.preload_hashes is True
+
+    with pytest.raises(SystemExit):
+        argparser.parse(["new", "/src", "/dst", "--preload-metadata"])
+    with pytest.raises(SystemExit):
+        argparser.parse(["new", "/src", "/dst", "--preload-hashes"])
+
+
+def test_parse_single_pass_flag() -> None:
+    default_cmd, _ = argparser.parse(["new", "/src", "/dst"])
+    new_cmd, _ = argparser.parse(["new", "/src", "/dst", "--single-pass"])
+    update_cmd, _ = argparser.parse(["update", "/src", "/dst", "--single-pass"])
+    assert default_cmd.single_pass is False
+    assert new_cmd.single_pass is True
+    assert update_cmd.single_pass is True
+
+
+def test_parse_pack_threshold_flag() -> None:
+    default_cmd, _ = argparser.parse(["new", "/src", "/dst"])
+    new_cmd, _ = argparser.parse(["new", "/src", "/dst", "--pack-threshold", "4096"])
+    update_cmd, _ = argparser.parse(
+        ["update", "/src", "/dst", "--pack-threshold", "512"]
+    )
+    assert default_cmd.pack_threshold == 0
+    assert new_cmd.pack_threshold == 4096
+    assert update_cmd.pack_threshold == 512
+
+    with pytest.raises(SystemExit):
+        argparser.parse(["new", "/src", "/dst", "--pack-threshold", "0"])
+
+
+def test_parse_inline_threshold_flag() -> None:
+    default_cmd, _ = argparser.parse(["update", "/src", "/dst"])
+    new_cmd, _ = argparser.parse(["new", "/src", "/dst", "--inline-threshold", "512"])
+    assert default_cmd.inline_threshold == 0
+    assert new_cmd.inline_threshold == 512
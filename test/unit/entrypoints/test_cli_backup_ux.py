@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 from pathlib import Path
 
 from backuper.commands import NewCommand, UpdateCommand
@@ -51,3 +52,63 @@ def test_run_update_prints_opening_and_analysis(tmp_path: Path, capsys) -> None:
     assert f"Updating backup at {dest} with new version v2" in out
     assert "Running analysis... This may take a while." in out
     assert "+++++ BACKUP ANALYSIS RESULT FOR VERSION v2 +++++" in out
+
+
+def test_run_new_prints_stats_report(tmp_path: Path, capsys) -> None:
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "a.txt").write_text("hello", encoding="utf-8")
+
+    run_new(
+        NewCommand(
+            version="v1",
+            source=str(source),
+            location=str(tmp_path / "backup"),
+            stats=True,
+        ),
+    )
+    out = capsys.readouterr().out
+
+    assert "+++++ BACKUP STATS +++++" in out
+    assert "blob_put" in out
+    assert "Cache hit rates:" in out
+
+
+def test_run_update_prints_stats_json(tmp_path: Path, capsys) -> None:
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "a.txt").write_text("x", encoding="utf-8")
+    dest = tmp_path / "backup"
+    run_new(NewCommand(version="v1", source=str(source), location=str(dest)))
+    (source / "b.txt").write_text("y", encoding="utf-8")
+    capsys.readouterr()
+
+    run_update(
+        UpdateCommand(
+            version="v2",
+            source=str(source),
+            location=str(dest),
+            stats=True,
+            stats_json=True,
+        ),
+    )
+    captured = capsys.readouterr()
+    report = json.loads(captured.out)
+
+    assert "Updating backup" in captured.err
+    assert "New file: b.txt" in captured.err
+    assert "+++++ BACKUP STATS +++++" in captured.err
+
+    assert set(report["phase_seconds"]) == {
+        "walk",
+        "ignore",
+        "hash",
+        "db_lookup",
+        "blob_put",
+        "manifest_insert",
+    }
+    assert report["counts"]["source_files"] == 2
+    assert report["counts"]["metadata_hits"] == 1
+    assert report["counts"]["blobs_put"] == 1
+    assert report["cache_hit_rates"]["metadata"] == 0.5
+    assert report["walk"]["visited_files"] == 2
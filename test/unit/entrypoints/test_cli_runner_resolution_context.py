@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from collections.abc import Iterator
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
 
 import pytest
@@ -70,7 +70,7 @@ def test_run_new_resolves_database_with_write_operation(
 
     def _fake_create_backup_database(*args, **kwargs):  # type: ignore[no-untyped-def]
         calls.append(kwargs["operation"])
-        return object()
+        return nullcontext()
 
     monkeypatch.setattr(runner, "create_backup_database", _fake_create_backup_database)
 
@@ -93,7 +93,7 @@ def test_run_update_resolves_database_with_write_operation(
 
     def _fake_create_backup_database(*args, **kwargs):  # type: ignore[no-untyped-def]
         calls.append(kwargs["operation"])
-        return object()
+        return nullcontext()
 
     monkeypatch.setattr(runner, "create_backup_database", _fake_create_backup_database)
 
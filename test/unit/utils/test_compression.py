@@ -0,0 +1,77 @@
+import os
+import zlib
+from pathlib import Path
+
+import pytest
+from backuper.utils.compression import (
+    CompressedBlobError,
+    compress_bytes,
+    compress_file,
+    decompress_bytes,
+    estimate_compression_ratio,
+    open_decompressed,
+    read_decompressed,
+    resolve_compression,
+)
+
+
+def test_resolve_compression_defaults_compressed_rows_to_zip() -> None:
+    assert resolve_compression(False, "lzma") == "none"
+    assert resolve_compression(True, None) == "zip"
+    assert resolve_compression(True, "bz2") == "bz2"
+
+
+def test_zlib_blob_is_a_bare_zlib_stream(tmp_path: Path) -> None:
+    payload = bytes(range(256)) * 5000
+    source = tmp_path / "source.bin"
+    source.write_bytes(payload)
+    blob = tmp_path / "blob.zz"
+
+    compress_file(source, blob, codec="zlib", level=1)
+
+    assert zlib.decompress(blob.read_bytes()) == payload
+    assert read_decompressed(blob, codec="zlib", file_hash="unused") == payload
+
+
+def test_zlib_reader_rejects_truncated_stream(tmp_path: Path) -> None:
+    blob = tmp_path / "blob.zz"
+    blob.write_bytes(zlib.compress(b"truncated payload " * 100)[:-8])
+
+    with open_decompressed(blob, codec="zlib", file_hash="unused") as payload:
+        with pytest.raises(CompressedBlobError, match="truncated"):
+            payload.read()
+
+
+def test_compress_file_does_not_overwrite_existing_blob(tmp_path: Path) -> None:
+    source = tmp_path / "source.bin"
+    source.write_bytes(b"payload")
+    blob = tmp_path / "blob.xz"
+    blob.write_bytes(b"existing")
+
+    with pytest.raises(FileExistsError):
+        compress_file(source, blob, codec="lzma", level=None)
+    assert blob.read_bytes() == b"existing"
+
+
+def test_estimate_compression_ratio_separates_text_from_random(tmp_path: Path) -> None:
+    text = tmp_path / "notes.bin"
+    text.write_bytes(b"the same sentence again and again. " * 10_000)
+    noise = tmp_path / "noise.txt"
+    noise.write_bytes(os.urandom(200_000))
+    empty = tmp_path / "empty"
+    empty.touch()
+
+    assert estimate_compression_ratio(text, sample_size=4096) < 0.2
+    assert estimate_compression_ratio(noise, sample_size=4096) > 0.95
+    assert estimate_compression_ratio(empty) == 1.0
+
+
+@pytest.mark.parametrize("codec", ["zip", "zlib", "lzma", "bz2"])
+def test_compress_bytes_round_trips_every_codec(codec: str) -> None:
+    payload = b"small config line\n" * 200
+
+    compressed = compress_bytes(payload, codec=codec, level=None)
+
+    assert len(compressed) < len(payload)
+    assert decompress_bytes(compressed, codec=codec, file_hash="f" * 40) == payload
+    assert decompress_bytes(payload, codec="none", file_hash="f" * 40) == payload
@@ -0,0 +1,74 @@
+import io
+from pathlib import Path
+
+import pytest
+from backuper.utils import file_copy
+from backuper.utils.file_copy import (
+    COPY_STRATEGY_COPY_FILE_RANGE,
+    COPY_STRATEGY_REFLINK,
+    COPY_STRATEGY_SENDFILE,
+    COPY_STRATEGY_USERSPACE,
+    copy_file,
+    copy_stream,
+)
+
+
+def test_copy_file_copies_contents_and_reports_strategy(tmp_path: Path) -> None:
+    src = tmp_path / "src.bin"
+    payload = bytes(range(256)) * 4096
+    src.write_bytes(payload)
+    dst = tmp_path / "dst.bin"
+
+    strategy = copy_file(src, dst)
+
+    assert dst.read_bytes() == payload
+    assert strategy in {
+        COPY_STRATEGY_REFLINK,
+        COPY_STRATEGY_COPY_FILE_RANGE,
+        COPY_STRATEGY_SENDFILE,
+        COPY_STRATEGY_USERSPACE,
+    }
+
+
+def test_copy_file_empty_source(tmp_path: Path) -> None:
+    src = tmp_path / "empty"
+    src.write_bytes(b"")
+    dst = tmp_path / "copy"
+
+    copy_file(src, dst)
+
+    assert dst.read_bytes() == b""
+
+
+def test_copy_file_falls_back_to_userspace_when_kernel_paths_unsupported(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(file_copy, "_reflink", lambda src_fd, dst_fd: False)
+    monkeypatch.setattr(
+        file_copy, "_kernel_copy", lambda src_fd, dst_fd, size, use_sendfile: False
+    )
+    src = tmp_path / "src.txt"
+    src.write_bytes(b"fallback payload")
+    dst = tmp_path / "dst.txt"
+
+    assert copy_file(src, dst) == COPY_STRATEGY_USERSPACE
+    assert dst.read_bytes() == b"fallback payload"
+
+
+def test_copy_file_refuses_to_overwrite_destination(tmp_path: Path) -> None:
+    src = tmp_path / "src.txt"
+    src.write_bytes(b"new")
+    dst = tmp_path / "dst.txt"
+    dst.write_bytes(b"old")
+
+    with pytest.raises(FileExistsError):
+        copy_file(src, dst)
+    assert dst.read_bytes() == b"old"
+
+
+def test_copy_stream_copies_in_chunks() -> None:
+    src = io.BytesIO(b"0123456789" * 10)
+    dst = io.BytesIO()
+
+    assert copy_stream(src, dst, buffer_size=7) == 100
+    assert dst.getvalue() == b"0123456789" * 10
@@ -1,7 +1,9 @@
 import hashlib
 from pathlib import Path
 
-from backuper.utils.hashing import compute_hash
+import pytest
+from backuper import config
+from backuper.utils.hashing import HashingReader, compute_hash
 
 
 def test_compute_hash_small_file_hashes_entire_content(tmp_path: Path) -> None:
@@ -20,3 +22,59 @@ def test_compute_hash_large_file_matches_legacy_first_chunk_only(
     path.write_bytes(content)
     expected = hashlib.sha1(content[:buffer_size]).hexdigest()
     assert compute_hash(path, buffer_size=buffer_size) == expected
+
+
+def test_compute_hash_blake2b_hashes_whole_file_in_chunks(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(config, "HASHING_CHUNK_SIZE", 16)
+    content = bytes(range(256)) * 3
+    path = tmp_path / "blob"
+    path.write_bytes(content)
+
+    digest = compute_hash(path, algorithm=config.HASH_ALGORITHM_BLAKE2B)
+
+    assert digest == hashlib.blake2b(content, digest_size=32).hexdigest()
+
+
+def test_compute_hash_blake2b_distinguishes_files_with_same_prefix(
+    tmp_path: Path,
+) -> None:
+    buffer_size = 64
+    first = tmp_path / "first"
+    second = tmp_path / "second"
+    first.write_bytes(b"x" * buffer_size + b"tail-1")
+    second.write_bytes(b"x" * buffer_size + b"tail-2")
+
+    assert compute_hash(first, buffer_size=buffer_size) == compute_hash(
+        second, buffer_size=buffer_size
+    )
+    assert compute_hash(
+        first, buffer_size=buffer_size, algorithm=config.HASH_ALGORITHM_BLAKE2B
+    ) != compute_hash(
+        second, buffer_size=buffer_size, algorithm=config.HASH_ALGORITHM_BLAKE2B
+    )
+
+
+def test_compute_hash_rejects_unknown_algorithm(tmp_path: Path) -> None:
+    path = tmp_path / "blob"
+    path.write_bytes(b"x")
+    with pytest.raises(ValueError, match="Unsupported hash algorithm"):
+        compute_hash(path, algorithm="md5")
+
+
+@pytest.mark.parametrize("algorithm", config.HASH_ALGORITHMS)
+def test_hashing_reader_matches_compute_hash(tmp_path: Path, algorithm: str) -> None:
+    path = tmp_path / "data.bin"
+    path.write_bytes(bytes(range(256)) * 64)
+
+    with path.open("rb") as source:
+        reader = HashingReader(source, algorithm=algorithm, buffer_size=1000)
+        copied = b""
+        while chunk := reader.read(300):
+            copied += chunk
+
+    assert copied == path.read_bytes()
+    assert reader.hexdigest() == compute_hash(
+        path, buffer_size=1000, algorithm=algorithm
+    )
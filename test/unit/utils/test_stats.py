@@ -0,0 +1,82 @@
+import json
+import threading
+
+from backuper.utils.stats import (
+    COUNTER_HASH_HITS,
+    COUNTER_HASH_LOOKUPS,
+    COUNTER_HASHED_BYTES,
+    COUNTER_SOURCE_FILES,
+    PHASE_HASH,
+    PHASES,
+    BackupStats,
+    build_stats_report,
+    format_stats_report,
+    increment,
+    measure,
+)
+
+
+def test_backup_stats_accumulates_across_threads() -> None:
+    stats = BackupStats()
+
+    def work() -> None:
+        for _ in range(1000):
+            stats.increment(COUNTER_SOURCE_FILES)
+            stats.add_time(PHASE_HASH, 0.001)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert stats.counters() == {COUNTER_SOURCE_FILES: 4000}
+    assert abs(stats.phase_seconds()[PHASE_HASH] - 4.0) < 1e-6
+
+
+def test_measure_and_increment_are_noops_without_stats() -> None:
+    with measure(None, PHASE_HASH):
+        pass
+    increment(None, COUNTER_SOURCE_FILES)
+
+
+def test_measure_records_elapsed_time() -> None:
+    stats = BackupStats()
+    with measure(stats, PHASE_HASH):
+        pass
+    assert stats.phase_seconds()[PHASE_HASH] >= 0.0
+    assert set(stats.phase_seconds()) == set(PHASES)
+
+
+def test_build_stats_report_derives_throughput_and_hit_rates() -> None:
+    stats = BackupStats()
+    stats.add_time(PHASE_HASH, 2.0)
+    stats.increment(COUNTER_HASHED_BYTES, 10_000_000)
+    stats.increment(COUNTER_SOURCE_FILES, 50)
+    stats.increment(COUNTER_HASH_LOOKUPS, 4)
+    stats.increment(COUNTER_HASH_HITS, 1)
+
+    report = build_stats_report(
+        stats,
+        elapsed_seconds=5.0,
+        walk_metrics={"visited_files": 50},
+        copy_strategies={"reflink": 3},
+    )
+
+    assert report["throughput"]["files_per_second"] == 10.0
+    assert report["throughput"]["hash_mb_per_second"] == 5.0
+    assert report["throughput"]["put_mb_per_second"] is None
+    assert report["cache_hit_rates"]["content_hash"] == 0.25
+    assert report["cache_hit_rates"]["metadata"] is None
+    assert report["walk"] == {"visited_files": 50}
+    assert json.loads(json.dumps(report)) == report
+
+
+def test_format_stats_report_renders_sections() -> None:
+    stats = BackupStats()
+    stats.increment(COUNTER_SOURCE_FILES, 3)
+    text = format_stats_report(build_stats_report(stats, elapsed_seconds=1.0))
+
+    assert text.startswith("+++++ BACKUP STATS +++++")
+    assert "source_files" in text
+    assert any(line.split() == ["metadata", "n/a"] for line in text.splitlines())
@@ -5,6 +5,7 @@ from zipfile import ZipFile
 import pytest
 from backuper.utils.zip_payload import (
     ZipPayloadError,
+    open_zip_payload,
     read_zip_payload_bytes,
     resolve_zip_payload_member_name,
 )
@@ -149,3 +150,21 @@ def test_part001_in_subdirectory_resolved_by_basename(tmp_path: Path) -> None:
     with ZipFile(path, "r") as zf:
         assert resolve_zip_payload_member_name(zf, h, zip_path=path) == "nested/part001"
     assert read_zip_payload_bytes(path, h) == payload
+
+
+def test_open_zip_payload_streams_resolved_member(tmp_path: Path) -> None:
+    payload = b"streamed" * 1000
+    path = tmp_path / "stream.zip"
+    _write_zip(path, {"part001": payload})
+
+    with open_zip_payload(path, _sha1_hex(payload)) as stream:
+        assert stream.read(8) == b"streamed"
+        assert stream.read() == payload[8:]
+
+
+def test_open_zip_payload_unresolvable_member_fails(tmp_path: Path) -> None:
+    path = tmp_path / "bad.zip"
+    _write_zip(path, {"other": b"x"})
+
+    with pytest.raises(ZipPayloadError):
+        open_zip_payload(path, _sha1_hex(b"y"))